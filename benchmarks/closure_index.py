@@ -0,0 +1,58 @@
+"""Compare FamplexGraph.relation with and without the closure index.
+
+Run from the top level of the repo with the famplex package installed and
+resource files in place (see update_resources.py)::
+
+    $ python benchmarks/closure_index.py
+"""
+import random
+import time
+
+from famplex.graph import FamplexGraph
+
+
+def time_queries(graph, pairs, relation_types):
+    start = time.perf_counter()
+    for (ns1, id1), (ns2, id2) in pairs:
+        graph.relation(ns1, id1, ns2, id2, relation_types)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    start = time.perf_counter()
+    bfs_graph = FamplexGraph()
+    bfs_build = time.perf_counter() - start
+    start = time.perf_counter()
+    closure_graph = FamplexGraph(closure_index=True)
+    closure_build = time.perf_counter() - start
+    print('Build time without closure index: %.3fs' % bfs_build)
+    print('Build time with closure index: %.3fs' % closure_build)
+    print('Closure index size: %.1f KiB' %
+          (closure_graph.closure_index_size() / 1024))
+
+    random.seed(0)
+    nodes = sorted(closure_graph._root_class_mapping)
+    # Random pairs are almost always negative and mostly pruned by the
+    # root class check. Pairs of terms sharing a root class exercise the
+    # BFS, as do pairs of terms and their ancestors.
+    random_pairs = [(random.choice(nodes), random.choice(nodes))
+                    for _ in range(50000)]
+    same_root_pairs = []
+    for node in random.choices(nodes, k=20000):
+        root = closure_graph.root_terms(*node)[0]
+        below = list(closure_graph.traverse(root, ['isa', 'partof'], 'down'))
+        same_root_pairs.append((node, random.choice(below)))
+    ancestor_pairs = [
+        (node, ancestor) for node in random.choices(nodes, k=5000)
+        for ancestor in closure_graph.traverse(node, ['isa', 'partof'], 'up')
+    ]
+    for name, pairs in (('random', random_pairs),
+                        ('same root', same_root_pairs),
+                        ('ancestor', ancestor_pairs)):
+        for relation_types in (['isa'], ['partof'], ['isa', 'partof']):
+            bfs = time_queries(bfs_graph, pairs, relation_types)
+            closure = time_queries(closure_graph, pairs, relation_types)
+            print('%s pairs, %s: %d queries, BFS %.3fs, '
+                  'closure index %.3fs (%.1fx)' %
+                  (name, '/'.join(relation_types), len(pairs), bfs, closure,
+                   bfs / closure))
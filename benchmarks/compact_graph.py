@@ -0,0 +1,44 @@
+"""Compare memory use and traversal speed of the FamplexGraph backends.
+
+Run from the top level of the repo with the famplex package installed and
+resource files in place (see update_resources.py)::
+
+    $ python benchmarks/compact_graph.py
+"""
+import gc
+import time
+import tracemalloc
+
+from famplex.compact import CompactFamplexGraph
+from famplex.graph import FamplexGraph
+
+
+def retained_memory(cls):
+    gc.collect()
+    tracemalloc.start()
+    graph = cls()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return graph, size
+
+
+def time_traversals(graph, nodes):
+    start = time.perf_counter()
+    for node in nodes:
+        for direction in ('up', 'down'):
+            for _ in graph.traverse(node, ['isa', 'partof'], direction):
+                pass
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    graph, size = retained_memory(FamplexGraph)
+    compact, compact_size = retained_memory(CompactFamplexGraph)
+    print('FamplexGraph: %.1f KiB' % (size / 1024))
+    print('CompactFamplexGraph: %.1f KiB' % (compact_size / 1024))
+    nodes = list(compact._nodes)
+    print('Traversing up and down from %d terms: FamplexGraph %.3fs, '
+          'CompactFamplexGraph %.3fs' % (len(nodes),
+                                         time_traversals(graph, nodes),
+                                         time_traversals(compact, nodes)))
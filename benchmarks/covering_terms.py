@@ -0,0 +1,60 @@
+"""Compare covering_terms with comparing individual_members of every term.
+
+Gene sets are random samples of the individual members of random FamPlex
+families and complexes, with a few unrelated genes added. The baseline
+calls individual_members for every FamPlex entity and computes Jaccard
+indexes with Python sets. Run from the top level of the repo with the
+famplex package installed and resource files in place (see
+update_resources.py)::
+
+    $ python benchmarks/covering_terms.py
+"""
+import random
+import time
+
+from famplex import covering_terms, individual_members, preload
+from famplex.load import load_entities
+
+
+def baseline(genes, entities, min_jaccard=0.5):
+    genes = set(genes)
+    results = []
+    for entity in entities:
+        members = set(individual_members('FPLX', entity))
+        overlap = len(genes & members)
+        if overlap:
+            jaccard = overlap / len(genes | members)
+            if jaccard >= min_jaccard:
+                results.append((('FPLX', entity), jaccard, len(members)))
+    results.sort(key=lambda x: (-x[1], x[2], x[0][1].lower()))
+    return [(term, jaccard) for term, jaccard, _ in results]
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    preload()
+    entities = load_entities()
+    families = [entity for entity in entities
+                if individual_members('FPLX', entity)]
+    gene_sets = []
+    for _ in range(200):
+        members = individual_members('FPLX', random.choice(families))
+        genes = random.sample(members, random.randint(1, len(members)))
+        genes.extend(('HGNC', 'GENE%d' % i)
+                     for i in range(random.randint(0, 2)))
+        gene_sets.append(genes)
+    start = time.perf_counter()
+    expected = [baseline(genes, entities) for genes in gene_sets]
+    baseline_time = time.perf_counter() - start
+    start = time.perf_counter()
+    covering_terms(gene_sets[0])
+    index_time = time.perf_counter() - start
+    start = time.perf_counter()
+    results = [covering_terms(genes) for genes in gene_sets]
+    query_time = time.perf_counter() - start
+    assert results == expected
+    print('%d gene sets: individual_members %.3fs (%.0f us per set), '
+          'covering_terms %.4fs (%.0f us per set) after building the index '
+          'in %.3fs' %
+          (len(gene_sets), baseline_time, baseline_time / len(gene_sets) * 1e6,
+           query_time, query_time / len(gene_sets) * 1e6, index_time))
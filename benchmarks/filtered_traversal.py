@@ -0,0 +1,91 @@
+"""Time traversals and parent lookups restricted to one relation type.
+
+Traversals from every term over the adjacency partitioned by relation type
+are compared with the same traversals over the combined adjacency lists,
+testing the relation type of every edge as FamplexGraph did before, on
+FamPlex itself and on a synthetic hierarchy in which genes are members of
+few families but parts of many complexes. Run from the top level of the
+repo with the famplex package installed and resource files in place (see
+update_resources.py)::
+
+    $ python benchmarks/filtered_traversal.py
+"""
+import random
+import time
+from collections import deque
+
+import famplex.graph
+from famplex.bundle import ResourceBundle
+from famplex.graph import FamplexGraph
+from famplex.load import Relation
+
+
+def filtered_traverse(graph, source, relation_types, direction):
+    edges = graph._graph if direction == 'up' else graph._reverse_graph
+    visited = {source}
+    queue = deque([source])
+    while queue:
+        node = queue.pop()
+        for ns, id_, rel in edges.get(node, []):
+            if (ns, id_) not in visited and rel in relation_types:
+                queue.appendleft((ns, id_))
+                visited.add((ns, id_))
+        yield node
+
+
+def filtered_parent_terms(graph, node, relation_types):
+    return [(ns, id_) for ns, id_, rel in graph.parent_edges(*node)
+            if rel in relation_types]
+
+
+def mixed_bundle(num_families=200, num_members=20, num_complexes=500,
+                 complexes_per_gene=30):
+    random.seed(0)
+    relations = []
+    for i in range(num_families):
+        for j in range(num_members):
+            gene = 'GENE%d_%d' % (i, j)
+            relations.append(Relation('HGNC', gene, 'isa', 'FPLX',
+                                      'FAMILY%d' % i))
+            for k in random.sample(range(num_complexes), complexes_per_gene):
+                relations.append(Relation('HGNC', gene, 'partof', 'FPLX',
+                                          'COMPLEX%d' % k))
+    bundle = ResourceBundle()
+    bundle.__dict__.update(relations=tuple(relations), entities=(),
+                           equivalences=())
+    return bundle
+
+
+def timed(func, nodes, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for node in nodes:
+            func(node)
+    return time.perf_counter() - start
+
+
+def run(graph, repeat):
+    nodes = list(graph._root_class_mapping)
+    for relation_types in (['isa'], ['partof'], ['isa', 'partof']):
+        for direction in ('up', 'down'):
+            before = timed(lambda node: sum(1 for _ in filtered_traverse(
+                graph, node, relation_types, direction)), nodes, repeat)
+            after = timed(lambda node: sum(1 for _ in graph.traverse(
+                node, relation_types, direction)), nodes, repeat)
+            print('traverse %-5s %-14s filtered %.3fs, partitioned %.3fs' %
+                  (direction, '+'.join(relation_types), before, after))
+        before = timed(lambda node: filtered_parent_terms(
+            graph, node, relation_types), nodes, repeat * 4)
+        after = timed(lambda node: graph.parent_terms(*node, relation_types),
+                      nodes, repeat * 4)
+        print('parent_terms   %-14s filtered %.3fs, partitioned %.3fs' %
+              ('+'.join(relation_types), before, after))
+
+
+if __name__ == '__main__':
+    print('FamPlex')
+    run(FamplexGraph(), repeat=20)
+    print('Genes in few families and many complexes')
+    bundle = mixed_bundle()
+    famplex.graph.get_bundle = lambda: bundle
+    run(FamplexGraph(), repeat=5)
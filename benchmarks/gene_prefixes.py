@@ -0,0 +1,62 @@
+"""Compare GenePrefixMatcher with trying each pattern in turn.
+
+Mentions are HGNC style symbols with random prefixes and suffixes from
+gene_prefixes.csv attached. Run from the top level of the repo with the
+famplex package installed and resource files in place (see
+update_resources.py)::
+
+    $ python benchmarks/gene_prefixes.py
+"""
+import random
+import time
+
+from famplex.gene_prefixes import GenePrefixMatcher
+from famplex.load import load_gene_prefixes
+
+
+def strip_naive(text, patterns):
+    """Strip affixes by testing every pattern against the mention."""
+    changed = True
+    while changed:
+        changed = False
+        for prefix, suffix in patterns:
+            if len(text) > len(prefix) + len(suffix) and \
+                    text.startswith(prefix) and text.endswith(suffix):
+                text = text[len(prefix):len(text) - len(suffix)]
+                changed = True
+                break
+    return text
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    patterns = []
+    for row in load_gene_prefixes()[1:]:
+        pattern = row[0].strip()
+        if pattern.count('{') == 1:
+            prefix, _, suffix = pattern.partition('{')
+            suffix = suffix.partition('}')[2]
+            patterns.append((prefix, suffix))
+    patterns.sort(key=lambda x: -len(x[0]) - len(x[1]))
+    mentions = []
+    for _ in range(200000):
+        text = 'GENE%d' % random.randrange(10000)
+        if random.random() < 0.5:
+            prefix, suffix = random.choice(patterns)
+            text = prefix + text + suffix
+        mentions.append(text)
+
+    start = time.perf_counter()
+    matcher = GenePrefixMatcher()
+    print('Compiled matcher in %.3fs' % (time.perf_counter() - start))
+    start = time.perf_counter()
+    naive = [strip_naive(text, patterns) for text in mentions]
+    naive_time = time.perf_counter() - start
+    start = time.perf_counter()
+    matched = matcher.match_many(mentions)
+    matcher_time = time.perf_counter() - start
+    assert naive == [mention.gene for mention in matched]
+    print('%d mentions' % len(mentions))
+    print('Pattern loop: %.3fs' % naive_time)
+    print('GenePrefixMatcher.match_many: %.3fs (%.1fx)' %
+          (matcher_time, naive_time / matcher_time))
@@ -0,0 +1,87 @@
+"""Time FamplexGraph construction on hierarchies larger than FamPlex.
+
+Larger hierarchies are made of copies of relations.csv with every FamPlex
+ID suffixed with the number of the copy, so that the number of terms, edges
+and root classes grows with the number of copies. A second kind of
+hierarchy has many root classes above one large shared family. Root classes
+are computed both by traversing down from every root, as FamplexGraph did
+before, and with the single topological pass now used. Run from the top level of the
+repo with the famplex package installed and resource files in place (see
+update_resources.py)::
+
+    $ python benchmarks/graph_build.py
+"""
+import time
+
+import famplex.graph
+from famplex.bundle import ResourceBundle, get_bundle
+from famplex.graph import FamplexGraph
+from famplex.load import Relation
+
+
+def scaled_bundle(copies):
+    bundle = ResourceBundle()
+    relations = []
+    entities = []
+    for copy in range(copies):
+        suffix = '_%d' % copy if copy else ''
+        for row in get_bundle().relations:
+            relations.append(Relation(
+                row.namespace1,
+                row.id1 + suffix if row.namespace1 == 'FPLX' else row.id1,
+                row.relation, row.namespace2,
+                row.id2 + suffix if row.namespace2 == 'FPLX' else row.id2))
+        entities.extend(entity + suffix for entity in get_bundle().entities)
+    bundle.__dict__.update(relations=tuple(relations),
+                           entities=tuple(entities), equivalences=())
+    return bundle
+
+
+def shared_bundle(num_roots, num_members):
+    """Many complexes sharing a family with many members"""
+    bundle = ResourceBundle()
+    relations = [Relation('FPLX', 'FAMILY', 'partof', 'FPLX', 'COMPLEX%d' % i)
+                 for i in range(num_roots)]
+    relations.extend(Relation('HGNC', 'GENE%d' % i, 'isa', 'FPLX', 'FAMILY')
+                     for i in range(num_members))
+    bundle.__dict__.update(relations=tuple(relations), entities=(),
+                           equivalences=())
+    return bundle
+
+
+def traversal_root_classes(graph):
+    mapping = {}
+    for root in graph.root_classes:
+        for node in graph.traverse(root, ['isa', 'partof'], direction='down'):
+            mapping.setdefault(node, []).append(root)
+    for node, roots in mapping.items():
+        mapping[node] = sorted(roots, key=lambda x: (x[0].lower(),
+                                                     x[1].lower()))
+    return mapping
+
+
+def run(bundle):
+    famplex.graph.get_bundle = lambda: bundle
+    start = time.perf_counter()
+    graph = FamplexGraph()
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    traversal_root_classes(graph)
+    traversal_time = time.perf_counter() - start
+    start = time.perf_counter()
+    graph._compute_root_classes(graph.root_classes,
+                                set(graph._graph) | set(graph._reverse_graph))
+    pass_time = time.perf_counter() - start
+    print('%d edges, %d roots: build %.3fs, root classes by traversal '
+          '%.3fs, by topological pass %.3fs' %
+          (len(bundle.relations), len(graph.root_classes), build_time,
+           traversal_time, pass_time))
+
+
+if __name__ == '__main__':
+    print('Copies of FamPlex')
+    for copies in (1, 10, 100):
+        run(scaled_bundle(copies))
+    print('Complexes sharing one family')
+    for size in (100, 1000):
+        run(shared_bundle(size, size * 10))
@@ -0,0 +1,56 @@
+"""Time a full build of the term pages of the static site against a rebuild
+after editing a single term.
+
+Names of cross-referenced terms are left out so that no web service is
+queried. Run from the top level of the repo with the famplex package
+installed with the html extra and resource files in place (see
+update_resources.py)::
+
+    $ python benchmarks/html_build.py
+"""
+import tempfile
+import time
+
+from famplex.bundle import get_bundle
+from famplex.html.api import TermRow, write_term_pages
+
+
+def make_contexts():
+    bundle = get_bundle()
+    contexts = {}
+    for fplx_id in bundle.entities:
+        description = bundle.descriptions_by_fplx_id.get(fplx_id)
+        incoming = [(row.namespace1, row.id1, None, row.relation) for row in
+                    bundle.relations_by_object.get(('FPLX', fplx_id), [])]
+        outgoing = [(row.relation, row.namespace2, row.id2, None) for row in
+                    bundle.relations_by_subject.get(('FPLX', fplx_id), [])]
+        xrefs = [(row.namespace, row.id, None) for row in
+                 bundle.equivalences_by_fplx_id.get(fplx_id, [])]
+        synonyms = list(bundle.synonyms_by_fplx_id.get(fplx_id, []))
+        row = TermRow(fplx_id,
+                      description.source if description else None,
+                      description.text if description else None,
+                      len(xrefs), len(synonyms), len(incoming), len(outgoing))
+        contexts[fplx_id] = dict(row=row, synonyms=synonyms, xrefs=xrefs,
+                                 incoming_relations=incoming,
+                                 outgoing_relations=outgoing,
+                                 debug_links=False)
+    return contexts
+
+
+def timed_build(contexts, directory, **kwargs):
+    start = time.perf_counter()
+    rendered, skipped = write_term_pages(contexts, directory, **kwargs)
+    return rendered, skipped, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    contexts = make_contexts()
+    with tempfile.TemporaryDirectory() as directory:
+        print('serial full build: %d rendered, %d skipped in %.2fs' %
+              timed_build(contexts, directory, workers=1, force=True))
+        print('parallel full build: %d rendered, %d skipped in %.2fs' %
+              timed_build(contexts, directory, force=True))
+        contexts['AMPK']['synonyms'].append('AMP-activated kinase')
+        print('rebuild after editing one term: %d rendered, %d skipped in '
+              '%.2fs' % timed_build(contexts, directory))
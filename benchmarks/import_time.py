@@ -0,0 +1,29 @@
+"""Measure the time taken to import famplex in a fresh interpreter.
+
+Run from the top level of the repo with the famplex package installed and
+resource files in place (see update_resources.py)::
+
+    $ python benchmarks/import_time.py
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+
+def time_command(code, repeats=10):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+if __name__ == '__main__':
+    baseline = time_command('pass')
+    print('Interpreter startup: %.3fs' % baseline)
+    print('import famplex: %.3fs' %
+          (time_command('import famplex') - baseline))
+    print('import famplex; famplex.api.preload(): %.3fs' %
+          (time_command('import famplex; famplex.api.preload()') - baseline))
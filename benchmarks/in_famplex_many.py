@@ -0,0 +1,36 @@
+"""Compare in_famplex in a loop with in_famplex_many.
+
+Run from the top level of the repo with the famplex package installed and
+resource files in place (see update_resources.py)::
+
+    $ python benchmarks/in_famplex_many.py
+"""
+import random
+import time
+
+from famplex import in_famplex, in_famplex_many, load_relations
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    terms = {(row[0], row[1]) for row in load_relations()}
+    terms = sorted(terms)
+    # Half of the mentions are grounded to terms outside of FamPlex
+    mentions = [random.choice(terms) if random.random() < 0.5
+                else ('HGNC', 'GENE%d' % random.randrange(10000))
+                for _ in range(1000000)]
+    namespaces = [ns for ns, _ in mentions]
+    ids = [id_ for _, id_ in mentions]
+    in_famplex('FPLX', 'AMPK')
+
+    start = time.perf_counter()
+    loop = [in_famplex(ns, id_) for ns, id_ in zip(namespaces, ids)]
+    loop_time = time.perf_counter() - start
+    start = time.perf_counter()
+    mask = in_famplex_many(namespaces, ids)
+    many_time = time.perf_counter() - start
+    assert loop == mask
+    print('%d mentions' % len(mentions))
+    print('in_famplex in a loop: %.3fs' % loop_time)
+    print('in_famplex_many: %.3fs (%.1fx)' % (many_time,
+                                              loop_time / many_time))
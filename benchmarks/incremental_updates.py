@@ -0,0 +1,33 @@
+"""Compare incremental edits of FamplexGraph with rebuilding the graph.
+
+Each edit removes a random relation and adds it back. Run from the top level
+of the repo with the famplex package installed and resource files in place
+(see update_resources.py)::
+
+    $ python benchmarks/incremental_updates.py
+"""
+import random
+import time
+
+from famplex.graph import FamplexGraph
+from famplex.load import load_relations
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    relations = random.choices(load_relations(), k=500)
+    for closure_index in (False, True):
+        start = time.perf_counter()
+        graph = FamplexGraph(closure_index=closure_index)
+        build_time = time.perf_counter() - start
+        times = []
+        for relation in relations:
+            start = time.perf_counter()
+            graph.remove_relation(*relation)
+            graph.add_relation(*relation)
+            times.append((time.perf_counter() - start) / 2)
+        times.sort()
+        print('closure_index=%s: rebuild %.1f ms, edit median %.3f ms, '
+              '99th percentile %.3f ms, max %.3f ms' %
+              (closure_index, build_time * 1e3, times[len(times) // 2] * 1e3,
+               times[int(len(times) * 0.99)] * 1e3, times[-1] * 1e3))
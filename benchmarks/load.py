@@ -0,0 +1,62 @@
+"""Compare load time and memory of famplex.load with a plain csv loader.
+
+The plain loader reads each file into lists of lists of strings, as
+famplex.load did before rows became interned, typed tuples. Memory is the
+size of the loaded rows as measured by tracemalloc. Run from the top level
+of the repo with the famplex package installed and resource files in place
+(see update_resources.py)::
+
+    $ python benchmarks/load.py
+"""
+import csv
+import time
+import tracemalloc
+
+from famplex import load
+from famplex.locations import DESCRIPTIONS_PATH, EQUIVALENCES_PATH, \
+    GROUNDING_MAP_PATH, RELATIONS_PATH
+
+
+def plain_csv(filename):
+    with open(filename) as f:
+        return [row for row in csv.reader(f)]
+
+
+def plain_grounding_map():
+    gmap = {}
+    for row in plain_csv(GROUNDING_MAP_PATH):
+        db_refs = {'TEXT': row[0]}
+        db_refs.update({ns: id_ for ns, id_ in zip(row[1::2], row[2::2])
+                        if ns})
+        gmap[row[0]] = db_refs if len(db_refs) > 1 else None
+    return gmap
+
+
+def measure(func, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    result = func()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, size
+
+
+if __name__ == '__main__':
+    cases = [('relations', lambda: plain_csv(RELATIONS_PATH),
+              load.load_relations),
+             ('equivalences', lambda: plain_csv(EQUIVALENCES_PATH),
+              load.load_equivalences),
+             ('descriptions', lambda: plain_csv(DESCRIPTIONS_PATH),
+              load.load_descriptions),
+             ('grounding map', plain_grounding_map, load.load_grounding_map)]
+    print('%-14s %22s %22s' % ('', 'plain csv', 'famplex.load'))
+    for name, plain, typed in cases:
+        plain_time, plain_size = measure(plain)
+        typed_time, typed_size = measure(typed)
+        print('%-14s %7.2f ms %8.1f KiB %7.2f ms %8.1f KiB' %
+              (name, plain_time * 1e3, plain_size / 1024,
+               typed_time * 1e3, typed_size / 1024))
@@ -0,0 +1,53 @@
+"""Compare lowest_common_ancestors with intersecting ancestral_terms lists.
+
+Sets of two to four agents are drawn from below random FamPlex root
+classes, as when merging statements. The baseline intersects the lists
+returned by ancestral_terms and drops common ancestors that are above
+other common ancestors. Run from the top level of the repo with the
+famplex package installed and resource files in place (see
+update_resources.py)::
+
+    $ python benchmarks/lowest_common_ancestors.py
+"""
+import random
+import time
+
+from famplex import all_root_terms, ancestral_terms, descendant_terms, \
+    lowest_common_ancestors, lowest_common_ancestors_many, preload
+
+
+def intersect_ancestral_terms(terms):
+    common = None
+    for term in terms:
+        ancestors = set(ancestral_terms(*term)) | {term}
+        common = ancestors if common is None else common & ancestors
+    return sorted(node for node in common
+                  if not any(node in ancestral_terms(*other)
+                             for other in common if other != node))
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    roots = [root for root in all_root_terms() if descendant_terms(*root)]
+    term_sets = []
+    for _ in range(20000):
+        below = descendant_terms(*random.choice(roots))
+        term_sets.append(random.sample(below, min(random.randint(2, 4),
+                                                  len(below))))
+    for closure_index in (False, True):
+        preload(closure_index=closure_index)
+        start = time.perf_counter()
+        expected = [intersect_ancestral_terms(terms) for terms in term_sets]
+        baseline_time = time.perf_counter() - start
+        start = time.perf_counter()
+        results = [lowest_common_ancestors(terms) for terms in term_sets]
+        single_time = time.perf_counter() - start
+        start = time.perf_counter()
+        batch = lowest_common_ancestors_many(term_sets)
+        batch_time = time.perf_counter() - start
+        assert [sorted(result) for result in results] == expected
+        assert batch == results
+        print('%d sets, closure_index=%s: ancestral_terms %.3fs, '
+              'lowest_common_ancestors %.3fs, batch %.3fs' %
+              (len(term_sets), closure_index, baseline_time, single_time,
+               batch_time))
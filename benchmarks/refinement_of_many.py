@@ -0,0 +1,34 @@
+"""Compare pairwise refinement_of calls with refinement_of_many.
+
+Computes a full refinement matrix over a random sample of FamPlex terms.
+Run from the top level of the repo with the famplex package installed and
+resource files in place (see update_resources.py)::
+
+    $ python benchmarks/refinement_of_many.py
+"""
+import random
+import time
+
+from famplex import all_root_terms, descendant_terms, refinement_of, \
+    refinement_of_many
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    terms = list(all_root_terms())
+    for root in all_root_terms():
+        terms.extend(descendant_terms(*root))
+    sample = random.sample(sorted(set(terms)), 1000)
+    pairs = [term1 + term2 for term1 in sample for term2 in sample]
+
+    start = time.perf_counter()
+    loop = [refinement_of(*pair) for pair in pairs]
+    loop_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = refinement_of_many(pairs)
+    batch_time = time.perf_counter() - start
+    assert loop == batch
+    print('%d pairs, %d related' % (len(pairs), sum(batch)))
+    print('refinement_of in a loop: %.3fs' % loop_time)
+    print('refinement_of_many: %.3fs (%.1fx)' % (batch_time,
+                                                 loop_time / batch_time))
@@ -0,0 +1,46 @@
+"""Time FamplexGraph.relation on random pairs of terms, mostly unrelated.
+
+Pairs of random FamPlex terms rarely share a root class, so most calls are
+answered by the root class check without a traversal. The check is timed
+with the root bitmasks used by FamplexGraph and with the sets of root
+classes it built on every call before. Run from the top level of the repo
+with the famplex package installed and resource files in place (see
+update_resources.py)::
+
+    $ python benchmarks/root_pruning.py
+"""
+import random
+import time
+
+from famplex.graph import FamplexGraph
+
+
+def set_relation(graph, namespace1, id1, namespace2, id2, relation_types):
+    roots1 = graph._root_class_mapping.get((namespace1, id1))
+    roots2 = graph._root_class_mapping.get((namespace2, id2))
+    if roots1 is None or roots2 is None:
+        return False
+    if set(roots1) & set(roots2):
+        node1, node2 = (namespace1, id1), (namespace2, id2)
+        for node in graph.traverse(node1, relation_types, direction='up'):
+            if node2 == node:
+                return True
+    return False
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    graph = FamplexGraph()
+    terms = list(graph._root_class_mapping)
+    pairs = [random.choice(terms) + random.choice(terms)
+             for _ in range(500000)]
+    relation_types = ['isa', 'partof']
+    start = time.perf_counter()
+    expected = [set_relation(graph, *pair, relation_types) for pair in pairs]
+    set_time = time.perf_counter() - start
+    start = time.perf_counter()
+    results = [graph.relation(*pair, relation_types) for pair in pairs]
+    bits_time = time.perf_counter() - start
+    assert results == expected
+    print('%d pairs, %d related: root sets %.3fs, root bitmasks %.3fs' %
+          (len(pairs), sum(results), set_time, bits_time))
@@ -0,0 +1,45 @@
+"""Measure MentionScanner throughput over a synthetic corpus.
+
+Documents are sentences of filler words with grounding map texts inserted
+at random. Run from the top level of the repo with the famplex package
+installed and resource files in place (see update_resources.py)::
+
+    $ python benchmarks/scanner.py
+"""
+import random
+import time
+
+from famplex.load import load_grounding_map
+from famplex.scanner import MentionScanner
+
+FILLER = ('the of and in to was were with by that protein expression cells '
+          'binding activity levels increased decreased phosphorylation '
+          'signaling pathway inhibition complex observed treatment').split()
+
+
+def make_document(texts, num_words=200, mention_rate=0.05):
+    words = []
+    for _ in range(num_words):
+        if random.random() < mention_rate:
+            words.append(random.choice(texts))
+        else:
+            words.append(random.choice(FILLER))
+    return ' '.join(words) + '.'
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    start = time.perf_counter()
+    scanner = MentionScanner()
+    print('Compiled %d patterns in %.3fs' % (len(scanner),
+                                             time.perf_counter() - start))
+    texts = sorted(load_grounding_map())
+    documents = [make_document(texts) for _ in range(2000)]
+    num_chars = sum(len(document) for document in documents)
+    start = time.perf_counter()
+    mentions = scanner.scan_many(documents)
+    elapsed = time.perf_counter() - start
+    print('Scanned %d documents (%.1f MB) in %.3fs: %.0f documents/s, '
+          '%.2f MB/s, %d mentions' %
+          (len(documents), num_chars / 1e6, elapsed, len(documents) / elapsed,
+           num_chars / 1e6 / elapsed, sum(len(m) for m in mentions)))
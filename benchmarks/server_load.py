@@ -0,0 +1,82 @@
+"""Load test famplex.server on localhost.
+
+Starts a server in a background thread and sends GET requests for random
+terms from several client threads, each over one kept alive connection,
+then sends the same queries through the batch endpoint. Run from the top
+level of the repo with the famplex package installed and resource files in
+place (see update_resources.py)::
+
+    $ python benchmarks/server_load.py
+"""
+import asyncio
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import urlencode
+
+from famplex.load import load_relations
+from famplex.server import serve
+
+NUM_CLIENTS = 8
+REQUESTS_PER_CLIENT = 2000
+
+
+def start_server():
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(serve(port=0))
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return server.sockets[0].getsockname()[1]
+
+
+def client(port, queries, latencies):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    for params in queries:
+        start = time.perf_counter()
+        connection.request('GET', '/isa?' + urlencode(params))
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    relations = load_relations()
+    # Draw from a limited set of pairs so some responses come from the
+    # cache, as for a service with popular queries.
+    pairs = [{'namespace1': row.namespace1, 'id1': row.id1,
+              'namespace2': random.choice(relations).namespace2,
+              'id2': random.choice(relations).id2}
+             for row in random.sample(relations, 2000)]
+    port = start_server()
+
+    latencies = []
+    threads = [threading.Thread(
+        target=client,
+        args=(port, random.choices(pairs, k=REQUESTS_PER_CLIENT), latencies))
+        for _ in range(NUM_CLIENTS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print('%d GET requests from %d clients in %.2fs: %.0f requests/s, '
+          'median latency %.2f ms, 99th percentile %.2f ms' %
+          (len(latencies), NUM_CLIENTS, elapsed, len(latencies) / elapsed,
+           latencies[len(latencies) // 2] * 1e3,
+           latencies[int(len(latencies) * 0.99)] * 1e3))
+
+    queries = random.choices(pairs, k=NUM_CLIENTS * REQUESTS_PER_CLIENT)
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    start = time.perf_counter()
+    for i in range(0, len(queries), 1000):
+        connection.request('POST', '/batch/isa',
+                           json.dumps({'queries': queries[i:i + 1000]}))
+        json.loads(connection.getresponse().read().decode('utf-8'))
+    elapsed = time.perf_counter() - start
+    print('%d queries in batches of 1000 in %.2fs: %.0f queries/s' %
+          (len(queries), elapsed, len(queries) / elapsed))
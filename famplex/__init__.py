@@ -2,3 +2,6 @@ __version__ = '0.0.3'
 
 from famplex.api import *
 from famplex.load import *
+from famplex.grounding import *
+from famplex.scanner import *
+from famplex.gene_prefixes import *
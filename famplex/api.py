@@ -19,25 +19,263 @@ partof edges from X to Y. We also say that Y is an ancestor of X.
 X is then below Y in the FamPlex ontology and we also say X is a descendant
 of Y.
 """
+import threading
+import time
 import warnings
-from typing import Container, Dict, List, Optional, Tuple
+from collections import namedtuple
+from typing import Any, Callable, Container, Dict, Iterable, Iterator, \
+    List, Optional, Tuple, Union
+
+from famplex.bundle import get_bundle
+from famplex.compact import CompactFamplexGraph
+from famplex.graph import CacheInfo, FamplexGraph, RELATION_TYPES, \
+    resource_hash, resource_stat
+
+__all__ = ['in_famplex', 'in_famplex_many', 'parent_terms', 'child_terms',
+           'root_terms', 'ancestral_terms', 'descendant_terms',
+           'individual_members', 'iter_ancestral_terms',
+           'iter_descendant_terms', 'iter_individual_members', 'isa',
+           'partof', 'refinement_of', 'refinement_of_many',
+           'lowest_common_ancestors', 'lowest_common_ancestors_many',
+           'covering_terms',
+           'dict_representation', 'flat_dict_representation', 'equivalences',
+           'reverse_equivalences', 'all_root_terms', 'preload', 'cache_info',
+           'clear_cache', 'resources_changed', 'reload', 'watch_resources',
+           'ReloadInfo']
+
+
+# The graph is built on first use rather than at import time so that
+# processes which import famplex without querying it don't pay for loading
+# the resource files.
+_famplex_graph: Optional[FamplexGraph] = None
+_famplex_graph_lock = threading.Lock()
+# Options the current graph was built with, and the state of the resource
+# files at the time, used by reload to rebuild it when the files change.
+_graph_options: Dict[str, Any] = {}
+_graph_resources: Optional[Tuple[Tuple[Optional[Tuple[int, int]], ...],
+                                 str]] = None
+# Held for the whole of a reload so that concurrent reloads don't build
+# the graph more than once.
+_reload_lock = threading.Lock()
+
+ReloadInfo = namedtuple('ReloadInfo', ['reloaded', 'duration',
+                                       'resource_hash'])
+ReloadInfo.__doc__ = """Outcome of a call to :func:`reload`
+
+Attributes
+----------
+reloaded : bool
+    True if a new graph was built and swapped in.
+duration : float
+    Time in seconds spent checking the resource files and rebuilding.
+resource_hash : str
+    Hash of the resource files the current graph was built from. See
+    :func:`famplex.graph.resource_hash`.
+"""
+
+
+def _load_graph(compact: bool = False, **kwargs: Any) -> FamplexGraph:
+    """Build a graph and record the options and resources it was built from
+
+    Must be called with _famplex_graph_lock held if no graph has been
+    loaded yet and with _reload_lock held otherwise.
+    """
+    global _graph_options, _graph_resources
+    graph_class = CompactFamplexGraph if compact else FamplexGraph
+    try:
+        # The resource files are examined before they are read so that a
+        # change made while the graph is built is picked up by the next
+        # call to reload.
+        resources = (resource_stat(), resource_hash())
+        graph = graph_class.from_cache(**kwargs)
+        _graph_options = dict(kwargs, compact=compact)
+        _graph_resources = resources
+        return graph
+    except FileNotFoundError:
+        warnings.warn(
+            "Resource files are unavailable. If you've cloned this "
+            "repository, run the script \"update_resources.py\" at the top "
+            "level to move the resources into the package. See the README "
+            "for more info.",
+            Warning)
+        raise
+
+
+def _get_graph() -> FamplexGraph:
+    """Return the module level FamplexGraph, building it if necessary."""
+    global _famplex_graph
+    graph = _famplex_graph
+    if graph is None:
+        with _famplex_graph_lock:
+            if _famplex_graph is None:
+                _famplex_graph = _load_graph()
+            graph = _famplex_graph
+    return graph
+
+
+def preload(compact: bool = False, **kwargs: Any) -> None:
+    """Build the FamPlex graph now instead of on first use
+
+    By default the graph of FamPlex entities and relations is constructed
+    the first time a function from this module needs it. Long running
+    services can call this at startup to avoid paying that cost while
+    serving a request. If compact or any keyword arguments are given, the
+    graph is rebuilt with these options even if it has already been loaded.
+
+    Parameters
+    ----------
+    compact : Optional[bool]
+        If True, use the array backed
+        :class:`famplex.compact.CompactFamplexGraph`, which uses less memory
+        per process. Default: False
+    **kwargs
+        Keyword arguments passed to :class:`famplex.graph.FamplexGraph`,
+        for instance closure_index=True.
+    """
+    global _famplex_graph
+    with _reload_lock, _famplex_graph_lock:
+        if _famplex_graph is None or compact or kwargs:
+            old_graph = _famplex_graph
+            _famplex_graph = _load_graph(compact=compact, **kwargs)
+            if old_graph is not None:
+                old_graph.clear_cache()
+
+
+def cache_info() -> CacheInfo:
+    """Return statistics for the cache of ancestral and descendant terms
+
+    Results of :func:`ancestral_terms` and :func:`descendant_terms` are
+    cached, keyed on the input term and relation types. The size of the
+    cache can be set with ``preload(cache_size=...)``.
+
+    Returns
+    -------
+    CacheInfo
+        Named tuple with fields hits, misses, maxsize and currsize.
+    """
+    return _get_graph().cache_info()
+
+
+def clear_cache() -> None:
+    """Empty the cache of ancestral and descendant terms"""
+    graph = _famplex_graph
+    if graph is not None:
+        graph.clear_cache()
+
+
+def resources_changed() -> bool:
+    """Return True if the resource files differ from those of the graph
+
+    File modification times and sizes are checked first and the contents
+    are hashed only if these differ, so this is cheap enough to call
+    frequently.
+
+    Returns
+    -------
+    bool
+        True if the contents of entities.csv, relations.csv or
+        equivalences.csv have changed since the graph was built. False if
+        they have not or if the graph has not been built yet.
+    """
+    resources = _graph_resources
+    if resources is None:
+        return False
+    stat, hash_ = resources
+    if resource_stat() == stat:
+        return False
+    try:
+        return resource_hash() != hash_
+    except OSError:
+        return False
+
+
+def reload(force: bool = False) -> ReloadInfo:
+    """Rebuild the FamPlex graph if the resource files have changed
+
+    The new graph is built with the same options as the current one while
+    queries continue to be answered by the current graph. It then replaces
+    the current graph in a single assignment. Each function in this module
+    looks up the graph once per call, so calls in progress complete
+    against the graph they started with. Resources cached in
+    :func:`famplex.bundle.get_bundle` and the traversal cache of the old
+    graph are cleared.
+
+    Parameters
+    ----------
+    force : Optional[bool]
+        If True, rebuild the graph even if the resource files are
+        unchanged. Default: False
 
-from famplex.graph import FamplexGraph
+    Returns
+    -------
+    ReloadInfo
+        Whether the graph was rebuilt and how long this took.
+    """
+    global _famplex_graph
+    start = time.perf_counter()
+    with _reload_lock:
+        if _famplex_graph is None:
+            _get_graph()
+            reloaded = True
+        elif force or resources_changed():
+            old_graph = _famplex_graph
+            get_bundle().clear()
+            graph = _load_graph(**_graph_options)
+            with _famplex_graph_lock:
+                _famplex_graph = graph
+            old_graph.clear_cache()
+            reloaded = True
+        else:
+            reloaded = False
+        resources = _graph_resources
+    return ReloadInfo(reloaded, time.perf_counter() - start,
+                      resources[1] if resources is not None else None)
+
+
+def watch_resources(interval: float = 60.0,
+                    callback: Optional[Callable[[Union[ReloadInfo,
+                                                       Exception]],
+                                                 Any]] = None) \
+        -> threading.Event:
+    """Reload the FamPlex graph in the background when resources change
+
+    Starts a daemon thread which calls :func:`reload` every interval
+    seconds, so long running services pick up changes to the resource
+    files without restarting.
+
+    Parameters
+    ----------
+    interval : Optional[float]
+        Seconds between checks of the resource files. Default: 60.0
+    callback : Optional[callable]
+        Called with the :class:`ReloadInfo` of each reload that rebuilt the
+        graph, for instance to log the rebuild duration. Exceptions raised
+        while reloading, such as from a malformed resource file, are passed
+        to the callback instead. The current graph is kept in that case.
+        Default: None
 
-__all__ = ['in_famplex', 'parent_terms', 'child_terms', 'root_terms',
-           'ancestral_terms', 'descendant_terms', 'individual_members', 'isa',
-           'partof', 'refinement_of', 'dict_representation', 'equivalences',
-           'reverse_equivalences', 'all_root_terms']
+    Returns
+    -------
+    threading.Event
+        Set this event to stop watching.
+    """
+    stop = threading.Event()
 
+    def watch():
+        while not stop.wait(interval):
+            try:
+                info = reload()
+            except Exception as err:
+                if callback is not None:
+                    callback(err)
+                continue
+            if info.reloaded and callback is not None:
+                callback(info)
 
-try:
-    _famplex_graph = FamplexGraph()
-except FileNotFoundError:
-    warnings.warn(
-        "Resource files are unavailable. If you've cloned this repository, "
-        "run the script \"update_resources.py\" at the top level to move the "
-        "resources into the package. See the README for more info.",
-        Warning)
+    thread = threading.Thread(target=watch, name='famplex-reload',
+                              daemon=True)
+    thread.start()
+    return stop
 
 
 def in_famplex(namespace: str, id_: str) -> bool:
@@ -55,7 +293,36 @@ def in_famplex(namespace: str, id_: str) -> bool:
     -------
     bool
     """
-    return _famplex_graph.in_famplex(namespace, id_)
+    return _get_graph().in_famplex(namespace, id_)
+
+
+def in_famplex_many(namespaces: Iterable[str],
+                    ids: Iterable[str]) -> List[bool]:
+    """Return whether each of many terms is in the FamPlex ontology
+
+    This is much faster than calling :func:`in_famplex` in a loop and can
+    be used to filter large tables of grounded entities, for instance
+    ``df[in_famplex_many(df.namespace, df.id)]`` for a pandas DataFrame.
+
+    Parameters
+    ----------
+    namespaces : iterable
+        Namespaces of the terms. This can be a list, a NumPy array or a
+        pandas Series.
+    ids : iterable
+        Identifiers of the terms, in the same order as namespaces.
+
+    Returns
+    -------
+    list
+        List of booleans, True where the corresponding term is in FamPlex.
+
+    Raises
+    ------
+    ValueError
+        If namespaces and ids have different lengths.
+    """
+    return _get_graph().in_famplex_many(namespaces, ids)
 
 
 def parent_terms(namespace: str, id_: str,
@@ -90,9 +357,8 @@ def parent_terms(namespace: str, id_: str,
         If (namespace, id_) does not correspond to a term in FamPlex.
     """
     if relation_types is None:
-        relation_types = ['isa', 'partof']
-    edges = _famplex_graph.parent_edges(namespace, id_)
-    return [(ns2, id2) for ns2, id2, rel in edges if rel in relation_types]
+        relation_types = RELATION_TYPES
+    return list(_get_graph().parent_terms(namespace, id_, relation_types))
 
 
 def child_terms(namespace: str, id_: str,
@@ -127,9 +393,8 @@ def child_terms(namespace: str, id_: str,
         If (namespace, id_) does not correspond to a term in FamPlex.
     """
     if relation_types is None:
-        relation_types = ['isa', 'partof']
-    edges = _famplex_graph.child_edges(namespace, id_)
-    return [(ns2, id2) for ns2, id2, rel in edges if rel in relation_types]
+        relation_types = RELATION_TYPES
+    return list(_get_graph().child_terms(namespace, id_, relation_types))
 
 
 def root_terms(namespace: str, id_: str) -> List[Tuple[str, str]]:
@@ -156,7 +421,7 @@ def root_terms(namespace: str, id_: str) -> List[Tuple[str, str]]:
     ValueError
         If (namespace, id_) does not correspond to a term in FamPlex.
     """
-    return _famplex_graph.root_terms(namespace, id_)
+    return _get_graph().root_terms(namespace, id_)
 
 
 def ancestral_terms(namespace: str, id_: str,
@@ -194,14 +459,12 @@ def ancestral_terms(namespace: str, id_: str,
     ValueError
         If (namespace, id_) does not correspond to a term in FamPlex.
     """
-    _famplex_graph.raise_value_error_if_not_in_famplex(namespace, id_)
+    graph = _get_graph()
+    graph.raise_value_error_if_not_in_famplex(namespace, id_)
     if relation_types is None:
         relation_types = ['isa', 'partof']
-    output = []
-    for ns2, id2 in _famplex_graph.traverse((namespace, id_),
-                                            relation_types, 'up'):
-        output.append((ns2, id2))
-    return output[1:]
+    return list(graph.cached_traversal((namespace, id_), relation_types,
+                                       'up')[1:])
 
 
 def descendant_terms(namespace: str, id_: str,
@@ -239,14 +502,12 @@ def descendant_terms(namespace: str, id_: str,
     ValueError
         If (namespace, id_) does not correspond to a term in FamPlex.
     """
-    _famplex_graph.raise_value_error_if_not_in_famplex(namespace, id_)
+    graph = _get_graph()
+    graph.raise_value_error_if_not_in_famplex(namespace, id_)
     if relation_types is None:
         relation_types = ['isa', 'partof']
-    output = []
-    for ns2, id2 in _famplex_graph.traverse((namespace, id_),
-                                            relation_types, 'down'):
-        output.append((ns2, id2))
-    return output[1:]
+    return list(graph.cached_traversal((namespace, id_), relation_types,
+                                       'down')[1:])
 
 
 def individual_members(namespace: str, id_: str,
@@ -288,13 +549,145 @@ def individual_members(namespace: str, id_: str,
     ValueError
         If (namespace, id_) does not correspond to a term in FamPlex.    Raises
     """
+    return sorted(iter_individual_members(namespace, id_, relation_types),
+                  key=lambda x: (x[0].lower(), x[1].lower()))
+
+
+def iter_ancestral_terms(namespace: str, id_: str,
+                         relation_types:
+                         Optional[Container[str]] = None) -> \
+        Iterator[Tuple[str, str]]:
+    """Iterate over terms above a given term in the FamPlex ontology
+
+    Terms are generated in the same order as returned by
+    :func:`ancestral_terms`, but are produced by the traversal as it
+    proceeds rather than collected into a list first. This is useful for
+    searches which can stop early.
+
+    Parameters
+    ----------
+    namespace : str
+        Namespace for a term. This should be one of 'HGNC', 'FPLX' for
+        FamPlex, or 'UP' for Uniprot.
+    id_ : str
+        Identifier for a term within namespace. See the FamplexGraph
+        class Docstring for more info.
+    relation_types : Optional[list]
+        Restrict edges to relation types in this list. The valid relation
+        types are the strings 'isa' and 'partof'.
+        If argument is None then both isa and partof relations are
+        included. Default: None
+
+    Returns
+    -------
+    iterator
+        Iterator over tuples of the form (namespace, id).
+
+    Raises
+    ------
+    ValueError
+        If (namespace, id_) does not correspond to a term in FamPlex. This
+        is raised immediately rather than when iteration begins.
+    """
+    return _iter_traversal(namespace, id_, relation_types, 'up')
+
+
+def iter_descendant_terms(namespace: str, id_: str,
+                          relation_types:
+                          Optional[Container[str]] = None) -> \
+        Iterator[Tuple[str, str]]:
+    """Iterate over terms below a given term in the FamPlex ontology
+
+    Terms are generated in the same order as returned by
+    :func:`descendant_terms`, but are produced by the traversal as it
+    proceeds rather than collected into a list first.
+
+    Parameters
+    ----------
+    namespace : str
+        Namespace for a term. This should be one of 'HGNC', 'FPLX' for
+        FamPlex, or 'UP' for Uniprot.
+    id_ : str
+        Identifier for a term within namespace. See the FamplexGraph
+        class Docstring for more info.
+    relation_types : Optional[list]
+        Restrict edges to relation types in this list. The valid relation
+        types are the strings 'isa' and 'partof'.
+        If argument is None then both isa and partof relations are
+        included. Default: None
+
+    Returns
+    -------
+    iterator
+        Iterator over tuples of the form (namespace, id).
+
+    Raises
+    ------
+    ValueError
+        If (namespace, id_) does not correspond to a term in FamPlex. This
+        is raised immediately rather than when iteration begins.
+    """
+    return _iter_traversal(namespace, id_, relation_types, 'down')
+
+
+def iter_individual_members(namespace: str, id_: str,
+                            relation_types:
+                            Optional[Container[str]] = None) -> \
+        Iterator[Tuple[str, str]]:
+    """Iterate over terms beneath a given term that have no children
+
+    Generates the same terms as :func:`individual_members` but in the
+    breadth first order in which they are reached rather than sorted.
+
+    Parameters
+    ----------
+    namespace : str
+        Namespace for a term. This should be one of 'HGNC', 'FPLX' for
+        FamPlex, or 'UP' for Uniprot.
+    id_ : str
+        Identifier for a term within namespace. See the Famplexgraph class
+        Docstring for more info.
+    relation_types : list
+        Restrict edges to relation types in this list. The valid relation
+        types are the strings 'isa' and 'partof'.
+        If argument is None then both isa and partof relations are
+        included. Default: None
+
+    Returns
+    -------
+    iterator
+        Iterator over tuples of the form (namespace, id).
+
+    Raises
+    ------
+    ValueError
+        If (namespace, id_) does not correspond to a term in FamPlex. This
+        is raised immediately rather than when iteration begins.
+    """
+    if relation_types is None:
+        relation_types = ['isa', 'partof']
+    graph = _get_graph()
+    descendants = _iter_traversal(namespace, id_, relation_types, 'down',
+                                  graph)
+    return (node for node in descendants
+            if not any(rel in relation_types
+                       for _, _, rel in graph.child_edges(*node)))
+
+
+def _iter_traversal(namespace: str, id_: str,
+                    relation_types: Optional[Container[str]],
+                    direction: str,
+                    graph: Optional[FamplexGraph] = None) -> \
+        Iterator[Tuple[str, str]]:
+    if graph is None:
+        graph = _get_graph()
+    graph.raise_value_error_if_not_in_famplex(namespace, id_)
     if relation_types is None:
         relation_types = ['isa', 'partof']
-    output = []
-    for ns2, id2 in descendant_terms(namespace, id_, relation_types):
-        if not child_terms(ns2, id2, relation_types=relation_types):
-            output.append((ns2, id2))
-    return sorted(output, key=lambda x: (x[0].lower(), x[1].lower()))
+    traversal = graph.traverse((namespace, id_), relation_types, direction)
+    # The input term itself is always generated first.
+    next(traversal)
+    return traversal
 
 
 def isa(namespace1: str, id1: str, namespace2: str, id2: str) -> bool:
@@ -321,7 +714,7 @@ def isa(namespace1: str, id1: str, namespace2: str, id2: str) -> bool:
         either of (namespace1, id1) or (namespace2, id2) is not in the
         FamPlex ontology.
     """
-    return _famplex_graph.relation(namespace1, id1, namespace2, id2, ['isa'])
+    return _get_graph().relation(namespace1, id1, namespace2, id2, ['isa'])
 
 
 def partof(namespace1: str, id1: str, namespace2: str, id2: str) -> bool:
@@ -348,7 +741,7 @@ def partof(namespace1: str, id1: str, namespace2: str, id2: str) -> bool:
         False if either of (namespace1, id1) or (namespace2, id2) is not in
         the FamPlex ontology.
     """
-    return _famplex_graph.relation(namespace1, id1,
+    return _get_graph().relation(namespace1, id1,
                                    namespace2, id2, ['partof'])
 
 
@@ -376,10 +769,150 @@ def refinement_of(namespace: str, id1: str, namespace2: str, id2: str) -> bool:
         return False if either of (namespace1, id1) or (namespace2, id2) is
         not in the FamPlex ontology.
     """
-    return _famplex_graph.relation(namespace, id1,
+    return _get_graph().relation(namespace, id1,
                                    namespace2, id2, ['isa', 'partof'])
 
 
+def refinement_of_many(pairs: Iterable[Tuple[str, str, str, str]]) -> \
+        List[bool]:
+    """Return whether isa or partof holds for each of many pairs of terms
+
+    This gives the same results as calling :func:`refinement_of` on each
+    pair but avoids repeated work for pairs sharing the same first term,
+    making it suitable for computing refinement matrices over many terms.
+
+    Parameters
+    ----------
+    pairs : iterable
+        Iterable of sequences of the form (namespace1, id1, namespace2, id2).
+        This can also be a NumPy array with four columns, such as the one
+        returned by pandas.DataFrame.to_numpy.
+
+    Returns
+    -------
+    list
+        List of booleans, one for each input pair in the same order. Entry i
+        is True if the first term of pair i has either an isa or partof
+        relationship with its second term. Pass to numpy.array to get a
+        boolean array.
+    """
+    return _get_graph().relation_many(pairs, ['isa', 'partof'])
+
+
+def lowest_common_ancestors(terms: Iterable[Tuple[str, str]],
+                            relation_types:
+                            Optional[Container[str]] = None) -> \
+        List[Tuple[str, str]]:
+    """Return the most specific terms above all of the given terms
+
+    These are the common ancestors of the terms, counting each term as its
+    own ancestor, that have no other common ancestor below them. For
+    example, the lowest common ancestor of two members of the same family
+    is that family. There can be several since families and complexes
+    overlap.
+
+    Parameters
+    ----------
+    terms : iterable
+        Tuples of the form (namespace, id).
+    relation_types : Optional[list]
+        Restrict edges to relation types in this list. The valid relation
+        types are the strings 'isa' and 'partof'.
+        If argument is None then both isa and partof relations are
+        included. Default: None
+
+    Returns
+    -------
+    list
+        List of tuples of the form (namespace, id) of the lowest common
+        ancestors, sorted in case insensitive alphabetical order, first by
+        namespace and then by id. The list is empty if there are no terms or
+        they have no common ancestor.
+
+    Raises
+    ------
+    ValueError
+        If any of the terms is not in FamPlex.
+    """
+    if relation_types is None:
+        relation_types = RELATION_TYPES
+    return _get_graph().lowest_common_ancestors(terms, relation_types)
+
+
+def lowest_common_ancestors_many(term_sets: Iterable[
+                                     Iterable[Tuple[str, str]]],
+                                 relation_types:
+                                 Optional[Container[str]] = None) -> \
+        List[List[Tuple[str, str]]]:
+    """Return the lowest common ancestors of each of many sets of terms
+
+    This gives the same results as calling :func:`lowest_common_ancestors`
+    on each set but computes the ancestors of each distinct term only once,
+    making it suitable for the many small sets of agents compared when
+    merging statements.
+
+    Parameters
+    ----------
+    term_sets : iterable
+        Iterable of iterables of tuples of the form (namespace, id).
+    relation_types : Optional[list]
+        See :func:`lowest_common_ancestors`. Default: None
+
+    Returns
+    -------
+    list
+        List of lists of lowest common ancestors, one for each set of terms
+        in the same order.
+
+    Raises
+    ------
+    ValueError
+        If any of the terms is not in FamPlex.
+    """
+    if relation_types is None:
+        relation_types = RELATION_TYPES
+    return _get_graph().lowest_common_ancestors_many(term_sets,
+                                                     relation_types)
+
+
+def covering_terms(genes: Iterable[Tuple[str, str]],
+                   min_jaccard: float = 0.5,
+                   relation_types: Optional[Container[str]] = None) -> \
+        List[Tuple[Tuple[str, str], float]]:
+    """Return the families and complexes whose members best cover some genes
+
+    This is the inverse of :func:`individual_members`. Terms are scored by
+    the Jaccard index of their individual members and the genes, the size
+    of the intersection divided by the size of the union, so a term whose
+    individual members are exactly the genes scores 1.
+
+    Parameters
+    ----------
+    genes : iterable
+        Tuples of the form (namespace, id), typically HGNC or UP genes from
+        an experiment. Genes that are not in FamPlex are allowed. They are
+        never covered but count towards the size of the union.
+    min_jaccard : Optional[float]
+        Only return terms with at least this Jaccard index. Default: 0.5
+    relation_types : Optional[list]
+        Restrict edges to relation types in this list when finding the
+        individual members of terms. The valid relation types are the
+        strings 'isa' and 'partof'. If argument is None then both isa and
+        partof relations are included. Default: None
+
+    Returns
+    -------
+    list
+        List of pairs of a term of the form (namespace, id) and its Jaccard
+        index. Terms are sorted by decreasing Jaccard index, then by
+        increasing number of individual members so that the most specific
+        terms come first, then in case insensitive alphabetical order.
+    """
+    if relation_types is None:
+        relation_types = RELATION_TYPES
+    return _get_graph().covering_terms(genes, min_jaccard, relation_types)
+
+
 def dict_representation(namespace: str,
                         id_: str) -> Dict[Tuple[str, str],
                                           List[Tuple[dict, str]]]:
@@ -406,19 +939,84 @@ def dict_representation(namespace: str,
         {('FPLX', 'ESR'): [({('HGNC', 'ESR1'): []}, 'isa'),
                            ({('HGNC', 'ESR2'): []}, 'isa')]}
 
+        Terms reachable along several paths, such as the subunits shared
+        by the AMPK complexes, are represented by the same dictionary
+        object wherever they appear, so modifying a nested dictionary in
+        place affects every occurrence.
+
+    Raises
+    ------
+    ValueError
+        If (namespace, id_) does not correspond to a term in FamPlex.
+    """
+    graph = _get_graph()
+    root = (namespace, id_)
+    graph.raise_value_error_if_not_in_famplex(namespace, id_)
+    # Subtrees are built bottom up with an explicit stack so that each is
+    # built once and deep hierarchies can't exceed the recursion limit.
+    subtrees: Dict[Tuple[str, str],
+                   Dict[Tuple[str, str], List[Tuple[dict, str]]]] = {}
+    expanding = set()
+    stack = [root]
+    while stack:
+        node = stack[-1]
+        if node in subtrees:
+            stack.pop()
+            continue
+        edges = graph.child_edges(*node)
+        pending = [(ns, id2) for ns, id2, _ in edges
+                   if (ns, id2) not in subtrees]
+        if pending:
+            if node in expanding:
+                raise ValueError('FamPlex relations contain a cycle '
+                                 'through %s:%s.' % node)
+            expanding.add(node)
+            stack.extend(pending)
+            continue
+        subtrees[node] = {node: [(subtrees[(ns, id2)], relation)
+                                 for ns, id2, relation in edges]}
+        stack.pop()
+    return subtrees[root]
+
+
+def flat_dict_representation(namespace: str,
+                             id_: str) -> Dict[str, List[List[str]]]:
+    """Return a flat, JSON serializable representation of a FamPlex term
+
+    Parameters
+    ----------
+    namespace : str
+        Namespace for a term. This should be one of 'HGNC', 'FPLX' for
+        FamPlex, or 'UP' for Uniprot.
+    id_ : str
+        Identifier for a term within namespace.
+
+    Returns
+    -------
+    dict
+        Dictionary with an entry for the input term and every term below
+        it. Keys are strings of the form 'namespace:id'. Values are lists
+        of [child, relation] pairs with children given in the same form,
+        sorted as in :func:`dict_representation`. The structure of the
+        term can be recovered by following children from the input term.
+
+        {'FPLX:ESR': [['HGNC:ESR1', 'isa'], ['HGNC:ESR2', 'isa']],
+         'HGNC:ESR1': [],
+         'HGNC:ESR2': []}
+
     Raises
     ------
     ValueError
         If (namespace, id_) does not correspond to a term in FamPlex.
     """
-    out: Dict[Tuple[str, str], List[Tuple[dict, str]]] = \
-        {(namespace, id_): []}
-    edges = _famplex_graph.child_edges(namespace, id_)
-    if not edges:
-        return out
-    for namespace2, id2, relation in edges:
-        out[(namespace, id_)].\
-            append((dict_representation(namespace2, id2), relation))
+    graph = _get_graph()
+    graph.raise_value_error_if_not_in_famplex(namespace, id_)
+    out = {}
+    for node in graph.cached_traversal((namespace, id_), ['isa', 'partof'],
+                                       'down'):
+        out['%s:%s' % node] = [['%s:%s' % (ns, id2), relation]
+                               for ns, id2, relation
+                               in graph.child_edges(*node)]
     return out
 
 
@@ -448,7 +1046,7 @@ def equivalences(fplx_id: str,
     ValueError
         If fplx_id an ID in the FamPlex ontology.
     """
-    equivs = _famplex_graph.equivalences(fplx_id)
+    equivs = _get_graph().equivalences(fplx_id)
     if namespaces is not None:
         equivs = [(namespace, id_) for namespace, id_ in equivs
                   if namespace in namespaces]
@@ -471,7 +1069,7 @@ def reverse_equivalences(namespace: str, id_: str) -> List[str]:
         List of FamPlex IDs for families or complexes equivalent to the
         term given by (namespace, id_)
     """
-    return _famplex_graph.reverse_equivalences(namespace, id_)
+    return _get_graph().reverse_equivalences(namespace, id_)
 
 
 def all_root_terms() -> List[Tuple[str, str]]:
@@ -484,4 +1082,4 @@ def all_root_terms() -> List[Tuple[str, str]]:
         top level families and complexes in FamPlex. List is in alphabetical
         order by id.
     """
-    return _famplex_graph.root_classes
+    return _get_graph().root_classes
@@ -0,0 +1,232 @@
+"""Process wide cache of the FamPlex resource files and indexes over them."""
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+from famplex.load import Description, Equivalence, Relation, \
+    load_descriptions, load_entities, load_equivalences, load_gene_prefixes, \
+    load_grounding_map, load_relations
+from famplex.locations import DESCRIPTIONS_PATH, ENTITIES_PATH, \
+    EQUIVALENCES_PATH, GENE_PREFIXES_PATH, GROUNDING_MAP_PATH, RELATIONS_PATH
+
+__all__ = ['ResourceBundle', 'file_stat', 'get_bundle']
+
+
+class _lazy(object):
+    """Attribute computed on first access and then stored on the instance
+
+    As a non-data descriptor, the stored value shadows the descriptor so
+    later accesses are plain attribute lookups. Computation is serialized
+    by the lock of the instance so that each resource is loaded once even
+    when first accessed from several threads.
+    """
+    def __init__(self, func: Callable[[Any], Any]) -> None:
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance: Any, owner: Any) -> Any:
+        if instance is None:
+            return self
+        with instance._lock:
+            if self.name not in instance.__dict__:
+                instance.__dict__[self.name] = self.func(instance)
+        return instance.__dict__[self.name]
+
+
+class ResourceBundle(object):
+    """Lazily loaded FamPlex resources with indexed views
+
+    Each resource file is read at most once, the first time one of the
+    attributes derived from it is accessed. Use :func:`get_bundle` to share
+    a single bundle across a process rather than constructing new ones.
+
+    Rows, indexes and their values are shared by all users of the bundle
+    and must not be modified. Rows are the typed tuples returned by the
+    functions in :mod:`famplex.load`.
+
+    The modification time and size of each file are recorded just before
+    it is read, so that :meth:`changed` can tell whether the loaded
+    resources are out of date with the files.
+
+    Attributes
+    ----------
+    entities : tuple
+        FamPlex IDs from entities.csv in file order.
+    entity_set : frozenset
+        The same FamPlex IDs as a set.
+    relations : tuple
+        :class:`famplex.load.Relation` rows from relations.csv.
+    relations_by_subject : dict
+        Maps (namespace, id) tuples to the relations in which they are the
+        subject, in file order.
+    relations_by_object : dict
+        Maps (namespace, id) tuples to the relations in which they are the
+        object, in file order.
+    equivalences : tuple
+        :class:`famplex.load.Equivalence` rows from equivalences.csv.
+    equivalences_by_fplx_id : dict
+        Maps FamPlex IDs to their equivalences.
+    equivalences_by_xref : dict
+        Maps (namespace, id) tuples of cross references to the FamPlex IDs
+        equivalent to them.
+    descriptions : tuple
+        :class:`famplex.load.Description` rows from descriptions.csv.
+    descriptions_by_fplx_id : dict
+        Maps FamPlex IDs to their descriptions.
+    grounding_map : dict
+        Grounding map as returned by
+        :func:`famplex.load.load_grounding_map`.
+    synonyms_by_fplx_id : dict
+        Maps FamPlex IDs to sorted tuples of grounding map texts grounded to
+        them.
+    gene_prefixes : tuple
+        Rows of gene_prefixes.csv.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._stats: Dict[str, Optional[Tuple[int, int]]] = {}
+
+    def clear(self) -> None:
+        """Drop all loaded resources so they are read again on next access"""
+        with self._lock:
+            for name in list(self.__dict__):
+                if name != '_lock':
+                    del self.__dict__[name]
+            self._stats = {}
+
+    def changed(self) -> bool:
+        """Return True if a file has changed since it was loaded
+
+        Returns
+        -------
+        bool
+            True if the modification time or size of any resource file
+            read by this bundle differs from when it was read. Files that
+            have not been read yet are not checked.
+        """
+        with self._lock:
+            stats = list(self._stats.items())
+        return any(file_stat(path) != stat for path, stat in stats)
+
+    def _record(self, path: str) -> None:
+        self._stats[path] = file_stat(path)
+
+    @_lazy
+    def entities(self) -> Tuple[str, ...]:
+        self._record(ENTITIES_PATH)
+        return tuple(load_entities())
+
+    @_lazy
+    def entity_set(self) -> FrozenSet[str]:
+        return frozenset(self.entities)
+
+    @_lazy
+    def relations(self) -> Tuple[Relation, ...]:
+        self._record(RELATIONS_PATH)
+        return tuple(load_relations())
+
+    @_lazy
+    def relations_by_subject(self) -> Dict[Tuple[str, str],
+                                           Tuple[Relation, ...]]:
+        return _group(((row.namespace1, row.id1), row)
+                      for row in self.relations)
+
+    @_lazy
+    def relations_by_object(self) -> Dict[Tuple[str, str],
+                                          Tuple[Relation, ...]]:
+        return _group(((row.namespace2, row.id2), row)
+                      for row in self.relations)
+
+    @_lazy
+    def equivalences(self) -> Tuple[Equivalence, ...]:
+        self._record(EQUIVALENCES_PATH)
+        return tuple(load_equivalences())
+
+    @_lazy
+    def equivalences_by_fplx_id(self) -> Dict[str, Tuple[Equivalence, ...]]:
+        return _group((row.fplx_id, row) for row in self.equivalences)
+
+    @_lazy
+    def equivalences_by_xref(self) -> Dict[Tuple[str, str],
+                                           Tuple[str, ...]]:
+        return _group(((row.namespace, row.id), row.fplx_id)
+                      for row in self.equivalences)
+
+    @_lazy
+    def descriptions(self) -> Tuple[Description, ...]:
+        self._record(DESCRIPTIONS_PATH)
+        return tuple(load_descriptions())
+
+    @_lazy
+    def descriptions_by_fplx_id(self) -> Dict[str, Description]:
+        return {row.fplx_id: row for row in self.descriptions}
+
+    @_lazy
+    def grounding_map(self) -> Dict[str, Optional[Dict[str, str]]]:
+        self._record(GROUNDING_MAP_PATH)
+        return load_grounding_map()
+
+    @_lazy
+    def synonyms_by_fplx_id(self) -> Dict[str, Tuple[str, ...]]:
+        synonyms = defaultdict(set)
+        for text, db_refs in self.grounding_map.items():
+            if db_refs is not None and 'FPLX' in db_refs:
+                synonyms[db_refs['FPLX']].add(text)
+        return {fplx_id: tuple(sorted(texts))
+                for fplx_id, texts in synonyms.items()}
+
+    @_lazy
+    def gene_prefixes(self) -> Tuple[Tuple[str, str, str], ...]:
+        self._record(GENE_PREFIXES_PATH)
+        return tuple(load_gene_prefixes())
+
+
+def file_stat(path: str) -> Optional[Tuple[int, int]]:
+    """Return the modification time and size of a file
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    Optional[Tuple[int, int]]
+        Modification time in nanoseconds and size in bytes, or None if the
+        file cannot be accessed.
+    """
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+def _group(pairs):
+    """Group values by key into a dict of tuples, preserving order"""
+    groups = defaultdict(list)
+    for key, value in pairs:
+        groups[key].append(value)
+    return {key: tuple(values) for key, values in groups.items()}
+
+
+_bundle: Optional[ResourceBundle] = None
+_bundle_lock = threading.Lock()
+
+
+def get_bundle() -> ResourceBundle:
+    """Return the resource bundle shared by the whole process
+
+    Returns
+    -------
+    ResourceBundle
+        The same bundle on every call. Nothing is loaded until one of its
+        attributes is accessed.
+    """
+    global _bundle
+    if _bundle is None:
+        with _bundle_lock:
+            if _bundle is None:
+                _bundle = ResourceBundle()
+    return _bundle
@@ -0,0 +1,203 @@
+"""Compact, array backed storage for the graph of FamPlex relations."""
+from array import array
+from typing import Container, Dict, Generator, Iterable, List, Tuple
+
+from collections import deque
+
+from famplex.graph import FamplexGraph, RELATION_TYPES, _zip_terms
+
+
+class _Adjacency(object):
+    """Adjacency lists of integer nodes in compressed sparse row form
+
+    The neighbors of node i are targets[offsets[i]:offsets[i + 1]], connected
+    to it by the relation types RELATION_TYPES[codes[j]] for j in the same
+    range. Edges of other relation types are skipped, as they are when
+    FamplexGraph partitions its adjacency lists.
+    """
+    def __init__(self, graph: Dict[Tuple[str, str],
+                                   List[Tuple[str, str, str]]],
+                 nodes: List[Tuple[str, str]],
+                 node_index: Dict[Tuple[str, str], int]) -> None:
+        codes = {rel: code for code, rel in enumerate(RELATION_TYPES)}
+        self.offsets = array('l', [0])
+        self.targets = array('l')
+        self.codes = array('b')
+        for node in nodes:
+            for ns, id_, rel in graph.get(node, []):
+                if rel not in codes:
+                    continue
+                self.targets.append(node_index[(ns, id_)])
+                self.codes.append(codes[rel])
+            self.offsets.append(len(self.targets))
+
+
+class CompactFamplexGraph(FamplexGraph):
+    """FamplexGraph with nodes interned to integers and array backed edges
+
+    Terms are numbered densely and each (namespace, id) tuple is stored once.
+    Edges in both directions and the root classes above each term are held
+    in contiguous arrays of integers rather than in dictionaries of lists of
+    tuples, with relation types stored as small integer codes. This reduces
+    the memory used by each process holding a graph. The public interface is
+    the same as that of :class:`famplex.graph.FamplexGraph` except that the
+    graph cannot be modified after it is built.
+
+    Parameters
+    ----------
+    closure_index : Optional[bool]
+        See :class:`famplex.graph.FamplexGraph`. Default: False
+    cache_size : Optional[int]
+        See :class:`famplex.graph.FamplexGraph`. Default: 1024
+    """
+    def __init__(self, closure_index: bool = False, cache_size: int = 1024):
+        # The dictionary based graph is built first and then converted.
+        self.__dict__.update(
+            FamplexGraph(closure_index=closure_index,
+                         cache_size=cache_size).__dict__)
+        nodes = sorted(self._root_class_mapping,
+                       key=lambda x: (x[0].lower(), x[1].lower()))
+        node_index = {node: i for i, node in enumerate(nodes)}
+        self._nodes: List[Tuple[str, str]] = nodes
+        self._node_index: Dict[Tuple[str, str], int] = node_index
+        self._parents = _Adjacency(self._graph, nodes, node_index)
+        self._children = _Adjacency(self._reverse_graph, nodes,
+                                    node_index)
+        self._root_offsets = array('l', [0])
+        self._roots = array('l')
+        for node in nodes:
+            self._roots.extend(node_index[root] for root
+                               in self._root_class_mapping[node])
+            self._root_offsets.append(len(self._roots))
+        # The depth index cannot be computed without the dictionaries.
+        self._depth_index()
+        # Terms with the same root classes share one int object.
+        self._root_masks = [self._root_bits[node] for node in nodes]
+        del self._graph, self._reverse_graph, self._root_class_mapping
+        del self._parent_terms, self._child_terms, self._root_bits
+        del self._root_bit_index
+
+    def in_famplex(self, namespace: str, id_: str) -> bool:
+        return (namespace, id_) in self._node_index
+
+    def in_famplex_many(self, namespaces: Iterable[str],
+                        ids: Iterable[str]) -> List[bool]:
+        return list(map(self._node_index.__contains__,
+                        _zip_terms(namespaces, ids)))
+
+    def parent_edges(self, namespace: str,
+                     id_: str) -> List[Tuple[str, str, str]]:
+        return self._edges(self._parents, namespace, id_)
+
+    def child_edges(self, namespace: str,
+                    id_: str) -> List[Tuple[str, str, str]]:
+        return self._edges(self._children, namespace, id_)
+
+    def parent_terms(self, namespace: str, id_: str,
+                     relation_types: Container[str] = RELATION_TYPES) -> \
+            Tuple[Tuple[str, str], ...]:
+        return tuple((ns, id2) for ns, id2, rel
+                     in self.parent_edges(namespace, id_)
+                     if rel in relation_types)
+
+    def child_terms(self, namespace: str, id_: str,
+                    relation_types: Container[str] = RELATION_TYPES) -> \
+            Tuple[Tuple[str, str], ...]:
+        return tuple((ns, id2) for ns, id2, rel
+                     in self.child_edges(namespace, id_)
+                     if rel in relation_types)
+
+    def root_terms(self, namespace: str, id_: str) -> List[Tuple[str, str]]:
+        index = self._node_index.get((namespace, id_))
+        if index is None:
+            self.raise_value_error_if_not_in_famplex(namespace, id_)
+            return []
+        return [self._nodes[root] for root in
+                self._roots[self._root_offsets[index]:
+                            self._root_offsets[index + 1]]]
+
+    def relation(self, namespace1: str, id1: str,
+                 namespace2: str, id2: str,
+                 relation_types: Container[str]) -> bool:
+        if self._closure is not None:
+            closure = self._closure.get(self._relation_key(relation_types))
+            if closure is not None:
+                ancestors = closure.get((namespace1, id1))
+                return ancestors is not None and \
+                    (namespace2, id2) in ancestors
+        node1, node2 = (namespace1, id1), (namespace2, id2)
+        if not self._shares_root(node1, node2):
+            return False
+        index1, index2 = self._node_index[node1], self._node_index[node2]
+        for index in self._traverse(index1, relation_types, self._parents):
+            if index == index2:
+                return True
+        return False
+
+    def traverse(self, source: Tuple[str, str],
+                 relation_types: Container[str],
+                 direction: str) -> Generator[Tuple[str, str], None, None]:
+        if direction == 'down':
+            adjacency = self._children
+        elif direction == 'up':
+            adjacency = self._parents
+        else:
+            raise ValueError
+        index = self._node_index.get(source)
+        if index is None:
+            yield source
+            return
+        for index in self._traverse(index, relation_types, adjacency):
+            yield self._nodes[index]
+
+    def add_relation(self, namespace1: str, id1: str, relation: str,
+                     namespace2: str, id2: str) -> None:
+        raise NotImplementedError('CompactFamplexGraph cannot be modified.')
+
+    def remove_relation(self, namespace1: str, id1: str, relation: str,
+                        namespace2: str, id2: str) -> None:
+        raise NotImplementedError('CompactFamplexGraph cannot be modified.')
+
+    def add_equivalence(self, namespace: str, id_: str,
+                        fplx_id: str) -> None:
+        raise NotImplementedError('CompactFamplexGraph cannot be modified.')
+
+    def _shares_root(self, node1: Tuple[str, str],
+                     node2: Tuple[str, str]) -> bool:
+        return bool(self._root_mask(node1) & self._root_mask(node2))
+
+    def _root_mask(self, node: Tuple[str, str]) -> int:
+        index = self._node_index.get(node)
+        if index is None:
+            return 0
+        return self._root_masks[index]
+
+    def _edges(self, adjacency: _Adjacency, namespace: str,
+               id_: str) -> List[Tuple[str, str, str]]:
+        index = self._node_index.get((namespace, id_))
+        if index is None:
+            self.raise_value_error_if_not_in_famplex(namespace, id_)
+            return []
+        start, end = adjacency.offsets[index], adjacency.offsets[index + 1]
+        return [self._nodes[target] + (RELATION_TYPES[code],)
+                for target, code in zip(adjacency.targets[start:end],
+                                        adjacency.codes[start:end])]
+
+    @staticmethod
+    def _traverse(source: int, relation_types: Container[str],
+                  adjacency: _Adjacency) -> Generator[int, None, None]:
+        """Breadth first traversal over integer nodes"""
+        codes = {code for code, rel in enumerate(RELATION_TYPES)
+                 if rel in relation_types}
+        offsets, targets = adjacency.offsets, adjacency.targets
+        edge_codes = adjacency.codes
+        visited = {source}
+        queue = deque([source])
+        while queue:
+            node = queue.pop()
+            for j in range(offsets[node], offsets[node + 1]):
+                target = targets[j]
+                if target not in visited and edge_codes[j] in codes:
+                    queue.appendleft(target)
+                    visited.add(target)
+            yield node
@@ -0,0 +1,173 @@
+"""Strip the prefixes and suffixes listed in gene_prefixes.csv from mentions."""
+import re
+from collections import namedtuple
+from typing import Container, Dict, Iterable, List, Optional, Pattern, \
+    Sequence, Tuple
+
+from famplex.bundle import get_bundle
+
+__all__ = ['GeneMention', 'GenePrefixMatcher']
+
+
+GeneMention = namedtuple('GeneMention', ['text', 'gene', 'affixes'])
+GeneMention.__doc__ = """A mention with its gene name separated from affixes
+
+Attributes
+----------
+text : str
+    The original mention.
+gene : str
+    The mention with all recognized prefixes and suffixes removed.
+affixes : tuple
+    Tuple of (pattern, category) pairs for the patterns from
+    gene_prefixes.csv that were stripped, outermost first, for example
+    (('Myr-{Gene name}', 'protein state'),
+     ('Flag-{Gene name}', 'experimental context')) for 'Myr-Flag-Akt1'.
+"""
+
+# Regular expressions for placeholders other than the gene name itself.
+_MUTATION_PATTERN = r'[A-Z][0-9]+[A-Z]'
+_PLACEHOLDER = re.compile(r'\{[^}]*\}')
+_GENE_PLACEHOLDERS = {'{Gene name}', '{microRNA name}'}
+
+
+class GenePrefixMatcher(object):
+    """Matcher for the experimental context patterns in gene_prefixes.csv
+
+    The prefixes of all patterns are compiled into one regular expression
+    and the suffixes into another, each an alternation preferring longer
+    affixes, so all patterns are tried at once. Prefixes and suffixes can
+    be applied additively, as in 'Myr-Flag-Akt1' or 'GFP-KRAS-G12V', and
+    are stripped repeatedly until no pattern applies. Matching is case
+    sensitive since the patterns list each capitalization separately.
+
+    A prefix that runs straight into the gene name, such as 'p' in 'pERK',
+    is only stripped if the rest of the mention starts with a letter, so
+    that names such as 'p53' are left intact. Prefixes ending in a
+    separator, such as 'Flag-' in 'Flag-53BP1', are always stripped.
+
+    The '{mutation}' placeholder matches amino acid substitutions such as
+    G12V. Patterns with affixes on both sides of the gene name, such as
+    'mut{Gene name}{mutation}', are not supported and are skipped.
+
+    Parameters
+    ----------
+    rows : Optional[list]
+        Rows of the form [pattern, category, notes], as returned by
+        :func:`famplex.load.load_gene_prefixes`. A header row is ignored.
+        If None, the FamPlex gene prefixes are loaded. Default: None
+    """
+    def __init__(self, rows: Optional[Iterable[Sequence[str]]] = None):
+        if rows is None:
+            rows = get_bundle().gene_prefixes
+        prefixes: Dict[str, Tuple[str, str]] = {}
+        suffixes: Dict[str, Tuple[str, str]] = {}
+        self._mutation: Optional[Tuple[str, str]] = None
+        mutation_separator = ''
+        for row in rows:
+            pattern, category = row[0].strip(), row[1]
+            if pattern == 'Pattern':
+                continue
+            placeholders = _PLACEHOLDER.findall(pattern)
+            if len(placeholders) != 1:
+                if placeholders[:1] == ['{Gene name}'] and \
+                        placeholders[1:] == ['{mutation}']:
+                    mutation_separator = pattern[len('{Gene name}'):
+                                                 -len('{mutation}')]
+                    self._mutation = (pattern, category)
+                continue
+            if placeholders[0] not in _GENE_PLACEHOLDERS:
+                continue
+            prefix, suffix = pattern.split(placeholders[0])
+            if prefix and not suffix:
+                prefixes.setdefault(prefix, (pattern, category))
+            elif suffix and not prefix:
+                suffixes.setdefault(suffix, (pattern, category))
+        self._prefixes = prefixes
+        self._suffixes = suffixes
+        # An empty alternation would match everywhere, so there is no
+        # regular expression if there are no affixes of a kind.
+        self._prefix_re: Optional[Pattern[str]] = None
+        if prefixes:
+            self._prefix_re = re.compile(
+                '(?:%s)' % '|'.join(re.escape(prefix) for prefix in
+                                    sorted(prefixes, key=len, reverse=True)))
+        suffix_alternatives = [re.escape(suffix) for suffix in
+                               sorted(suffixes, key=len, reverse=True)]
+        if self._mutation is not None:
+            suffix_alternatives.append('(?P<mutation>%s%s)' %
+                                       (re.escape(mutation_separator),
+                                        _MUTATION_PATTERN))
+        self._suffix_re: Optional[Pattern[str]] = None
+        if suffix_alternatives:
+            self._suffix_re = re.compile('(?:%s)$' %
+                                         '|'.join(suffix_alternatives))
+
+    def match(self, text: str,
+              genes: Optional[Container[str]] = None) -> GeneMention:
+        """Separate a mention into a gene name and prefixes and suffixes
+
+        Parameters
+        ----------
+        text : str
+            A mention, for example 'Flag-AKT1'.
+        genes : Optional[container]
+            If given, only accept a decomposition whose gene name is in
+            this container, stripping as few affixes as needed. This avoids
+            stripping prefixes from gene names that happen to start with
+            them, such as 'Rh' in 'RhoA'. If no decomposition
+            gives a known gene, the mention is returned unchanged.
+            Default: None
+
+        Returns
+        -------
+        GeneMention
+            The gene name and the stripped affixes. If no pattern applies
+            the gene name is the full text and affixes is empty.
+        """
+        if genes is not None and text in genes:
+            return GeneMention(text, text, ())
+        gene = text
+        affixes = []
+        while True:
+            match = self._prefix_re.match(gene) \
+                if self._prefix_re is not None else None
+            if match and match.end() < len(gene) and \
+                    (not match.group()[-1].isalnum() or
+                     gene[match.end()].isalpha()):
+                affixes.append(self._prefixes[match.group()])
+                gene = gene[match.end():]
+            else:
+                match = self._suffix_re.search(gene) \
+                    if self._suffix_re is not None else None
+                if not match or match.start() == 0:
+                    break
+                if self._mutation is not None and match.group('mutation'):
+                    affixes.append(self._mutation)
+                else:
+                    affixes.append(self._suffixes[match.group()])
+                gene = gene[:match.start()]
+            if genes is not None and gene in genes:
+                return GeneMention(text, gene, tuple(affixes))
+        if genes is not None:
+            return GeneMention(text, text, ())
+        return GeneMention(text, gene, tuple(affixes))
+
+    def match_many(self, texts: Iterable[str],
+                   genes: Optional[Container[str]] = None) -> \
+            List[GeneMention]:
+        """Apply :meth:`match` to each of many mentions
+
+        Parameters
+        ----------
+        texts : iterable
+            Mentions to match.
+        genes : Optional[container]
+            See :meth:`match`. Default: None
+
+        Returns
+        -------
+        list
+            List of :class:`GeneMention`, one for each mention.
+        """
+        return [self.match(text, genes) for text in texts]
@@ -1,9 +1,193 @@
 """Work with the graph of FamPlex entities and relations."""
-from typing import Container, Dict, Generator, List, Tuple
+import hashlib
+import itertools
+import os
+import pickle
+import sys
+from typing import Any, Callable, Container, Dict, FrozenSet, Generator, \
+    Iterable, Iterator, List, Optional, Set, Sized, Tuple, Type, TypeVar
 
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque, namedtuple
 
-from famplex.load import load_entities, load_equivalences, load_relations
+from famplex.bundle import file_stat, get_bundle
+from famplex.locations import CACHE_PATH, ENTITIES_PATH, EQUIVALENCES_PATH, \
+    RELATIONS_PATH
+
+# Relation types that can connect terms in the FamPlex ontology.
+RELATION_TYPES = ('isa', 'partof')
+
+# Version of the layout of snapshots written by FamplexGraph.save_snapshot.
+# This must be incremented whenever the attributes of FamplexGraph change.
+SNAPSHOT_VERSION = 6
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+G = TypeVar('G', bound='FamplexGraph')
+
+_popcount: Callable[[int], int]
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(bits: int) -> int:
+        return bin(bits).count('1')
+
+
+def resource_hash() -> str:
+    """Return a hash of the contents of the resource files used by the graph
+
+    Returns
+    -------
+    str
+        Hex digest of a SHA-256 hash over entities.csv, relations.csv and
+        equivalences.csv.
+    """
+    sha = hashlib.sha256()
+    for path in (ENTITIES_PATH, RELATIONS_PATH, EQUIVALENCES_PATH):
+        sha.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            sha.update(f.read())
+    return sha.hexdigest()
+
+
+def resource_stat() -> Tuple[Optional[Tuple[int, int]], ...]:
+    """Return modification times and sizes of the resource files of the graph
+
+    Returns
+    -------
+    tuple
+        :func:`famplex.bundle.file_stat` of entities.csv, relations.csv and
+        equivalences.csv.
+    """
+    return tuple(file_stat(path) for path in
+                 (ENTITIES_PATH, RELATIONS_PATH, EQUIVALENCES_PATH))
+
+
+def _remove_stale_snapshots(cache_path: str, class_name: str,
+                            prefix: str) -> None:
+    """Delete snapshots of a class whose file names lack the current prefix"""
+    try:
+        names = os.listdir(cache_path)
+    except OSError:
+        return
+    for name in names:
+        if name.startswith(class_name + '_v') and name.endswith('.pickle') \
+                and not name.startswith(prefix):
+            try:
+                os.remove(os.path.join(cache_path, name))
+            except OSError:
+                pass
+
+
+_MISSING = object()
+
+
+def _zip_terms(namespaces: Iterable[str],
+               ids: Iterable[str]) -> Iterable[Tuple[str, str]]:
+    """Pair namespaces with ids, raising ValueError on a length mismatch
+
+    Lengths are compared up front when both arguments have one, otherwise
+    the mismatch is detected when the shorter iterable runs out.
+    """
+    if isinstance(namespaces, Sized) and isinstance(ids, Sized):
+        if len(namespaces) != len(ids):
+            raise ValueError('namespaces and ids have different lengths.')
+        return zip(namespaces, ids)
+    return _zip_strict(namespaces, ids)
+
+
+def _zip_strict(namespaces: Iterable[Any],
+                ids: Iterable[Any]) -> Iterator[Tuple[Any, Any]]:
+    for namespace, id_ in itertools.zip_longest(namespaces, ids,
+                                                fillvalue=_MISSING):
+        if namespace is _MISSING or id_ is _MISSING:
+            raise ValueError('namespaces and ids have different lengths.')
+        yield namespace, id_
+
+
+def _term_key(term: Tuple[str, ...]) -> Tuple[str, str]:
+    """Key sorting terms and edges case insensitively by namespace and id"""
+    return term[0].lower(), term[1].lower()
+
+
+# Keys of the adjacency partitioned by relation type, as returned by
+# FamplexGraph._relation_key: isa edges only, partof edges only and both.
+_PARTITION_KEYS = ((True, False), (False, True), (True, True))
+
+
+def _select_terms(edges: Iterable[Tuple[str, str, str]],
+                  key: Tuple[bool, bool]) -> Tuple[Tuple[str, str], ...]:
+    """Return the terms of the edges whose relation type is in key
+
+    Edges of relation types other than isa and partof are skipped.
+    """
+    selected = dict(zip(RELATION_TYPES, key))
+    return tuple((ns, id_) for ns, id_, rel in edges
+                 if selected.get(rel, False))
+
+
+def _partition_terms(graph: Dict[Tuple[str, str],
+                                 List[Tuple[str, str, str]]]) -> \
+        Dict[Tuple[bool, bool], Dict[Tuple[str, str],
+                                     Tuple[Tuple[str, str], ...]]]:
+    """Split adjacency lists into tuples of terms for each relation key
+
+    Terms keep the order of the edges they come from. Nodes with no edges
+    of the relation types of a key are left out of its dictionary.
+    """
+    partition: Dict[Tuple[bool, bool],
+                    Dict[Tuple[str, str], Tuple[Tuple[str, str], ...]]] = \
+        {key: {} for key in _PARTITION_KEYS}
+    for node, edges in graph.items():
+        for key, terms in partition.items():
+            selected = _select_terms(edges, key)
+            if selected:
+                terms[node] = selected
+    return partition
+
+
+class _TraversalCache(object):
+    """Least recently used cache of traversal results
+
+    Operations are safe to use from multiple threads without a lock. In the
+    worst case concurrent misses on the same key compute the same result
+    twice.
+    """
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: 'OrderedDict[Any, Tuple[Tuple[str, str], ...]]' = \
+            OrderedDict()
+
+    def get(self, key: Any) -> Optional[Tuple[Tuple[str, str], ...]]:
+        result = self._data.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            pass
+        return result
+
+    def put(self, key: Any, value: Tuple[Tuple[str, str], ...]) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        while len(self._data) > self.maxsize:
+            try:
+                self._data.popitem(last=False)
+            except KeyError:
+                break
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self._data))
 
 
 class FamplexGraph(object):
@@ -33,22 +217,36 @@ class FamplexGraph(object):
     X is then below Y in the FamPlex ontology and we also say X is a descendant
     of Y.
 
+    Parameters
+    ----------
+    closure_index : Optional[bool]
+        If True, precompute the set of all terms above each term for every
+        combination of relation types when the graph is loaded. This makes
+        :meth:`relation` a constant time lookup at the cost of additional
+        memory. See :meth:`closure_index_size`. Default: False
+    cache_size : Optional[int]
+        Maximum number of results of :meth:`cached_traversal` to keep.
+        Least recently used results are evicted first. Default: 1024
+
     Attributes
     ----------
     root_classes : set
         Set of top level families and complexes in the FamPlex ontology
     """
-    def __init__(self):
+    def __init__(self, closure_index: bool = False, cache_size: int = 1024):
         # Graphs are stored internally as a dictionary mapping tuples of
         # the form (namespace, id) to a list of tuples of the form
         # (namespace, id, relation_type). This is a variant of the adjacency
         # list representation of a graph but allowing for multiple edge types.
 
         # Contains forward isa and partof relationships between terms
-        graph = defaultdict(list)
+        graph: Dict[Tuple[str, str], List[Tuple[str, str, str]]] = \
+            defaultdict(list)
         # Contains reversed isa and partof relationships
-        reverse_graph = defaultdict(list)
-        relations = load_relations()
+        reverse_graph: Dict[Tuple[str, str], List[Tuple[str, str, str]]] = \
+            defaultdict(list)
+        bundle = get_bundle()
+        relations = bundle.relations
         left_set = set()
         right_set = set()
         # Loop through table populating edges of the above graphs.
@@ -75,29 +273,27 @@ class FamplexGraph(object):
 
         self._reverse_graph: Dict[Tuple[str, str],
                                   List[Tuple[str, str, str]]] = reverse_graph
-        root_class_mapping = defaultdict(list)
+        # The same adjacency split by relation type, as immutable tuples of
+        # terms for isa edges, partof edges and both. Traversals and
+        # parent_terms look up the tuples for the requested relation types
+        # instead of testing the type of every edge.
+        self._parent_terms = _partition_terms(graph)
+        self._child_terms = _partition_terms(reverse_graph)
         root_classes = sorted(right_set - left_set, key=lambda x: x[1].lower())
         # Build up an dictionary mapping terms to the top level families
         # or complexes to which they belong. Families and complexes can overlap
         # so there can be multiple top level terms above a given term.
-        for entry in root_classes:
-            for node in self.traverse(entry, ['isa', 'partof'],
-                                      direction='down'):
-                root_class_mapping[node].append(entry)
-        root_class_mapping = dict(root_class_mapping)
-        entities = load_entities()
-        for entity in entities:
+        root_class_mapping = self._compute_root_classes(root_classes,
+                                                        left_set | right_set)
+        for entity in bundle.entities:
             entry = ('FPLX', entity)
             if entry not in root_class_mapping:
                 root_class_mapping[entry] = [entry]
-        for node, roots in root_class_mapping.items():
-            root_class_mapping[node] = sorted(roots,
-                                              key=lambda x: (x[0].lower(),
-                                                             x[1].lower()))
-
-        equivalences = defaultdict(list)
-        reverse_equivalences = defaultdict(list)
-        for ns, id_, fplx_id in load_equivalences():
+
+        equivalences: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        reverse_equivalences: Dict[Tuple[str, str], List[str]] = \
+            defaultdict(list)
+        for ns, id_, fplx_id in bundle.equivalences:
             equivalences[fplx_id].append((ns, id_))
             reverse_equivalences[(ns, id_)].append(fplx_id)
         equivalences = dict(equivalences)
@@ -109,11 +305,41 @@ class FamplexGraph(object):
                                        List[Tuple[str, str]]] = \
             root_class_mapping
 
+        # Each root class is assigned a bit and each term is mapped to the
+        # bitwise or of the bits of its root classes, so that checking
+        # whether two terms share a root class is a single AND. Bits are
+        # never reassigned, so roots created by add_relation get new bits
+        # and the bits of terms that stop being roots are left unused.
+        self._root_bit_index: Dict[Tuple[str, str], int] = {}
+        self._root_bits: Dict[Tuple[str, str], int] = \
+            self._compute_root_bits(root_classes, root_class_mapping)
+
         self._equivalences: Dict[str, List[Tuple[str, str]]] = equivalences
         self._reverse_equivalences: Dict[Tuple[str, str], List[str]] = \
             reverse_equivalences
         self.__error_message = 'Given input is not in the FamPlex ontology.'
 
+        self._closure: Optional[Dict[Tuple[bool, bool],
+                                     Dict[Tuple[str, str],
+                                          FrozenSet[Tuple[str, str]]]]] = \
+            self._build_closure_index() if closure_index else None
+        self._traversal_cache = _TraversalCache(cache_size)
+        # Length of the longest path from a root class down to each term,
+        # computed on first use by lowest_common_ancestors.
+        self._depths: Optional[Dict[Tuple[str, str], int]] = None
+        # Individual members of each term as bitsets over member terms,
+        # for each relation key, computed on first use by covering_terms.
+        self._member_indexes: Dict[Tuple[bool, bool],
+                                   Tuple[Dict[Tuple[str, str], int],
+                                         Dict[Tuple[str, str], int]]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Cached traversals are not part of the state of the graph.
+        state = self.__dict__.copy()
+        state['_traversal_cache'] = \
+            _TraversalCache(self._traversal_cache.maxsize)
+        return state
+
     def in_famplex(self, namespace: str, id_: str) -> bool:
         """Returns True if input term is a member of the FamPlex ontology.
 
@@ -132,6 +358,32 @@ class FamplexGraph(object):
         """
         return (namespace, id_) in self._root_class_mapping
 
+    def in_famplex_many(self, namespaces: Iterable[str],
+                        ids: Iterable[str]) -> List[bool]:
+        """Return whether each of many terms is in the FamPlex ontology
+
+        Parameters
+        ----------
+        namespaces : iterable
+            Namespaces of the terms. This can be a list, a NumPy array or a
+            pandas Series.
+        ids : iterable
+            Identifiers of the terms, in the same order as namespaces.
+
+        Returns
+        -------
+        list
+            List of booleans, True where the corresponding term is in
+            FamPlex.
+
+        Raises
+        ------
+        ValueError
+            If namespaces and ids have different lengths.
+        """
+        return list(map(self._root_class_mapping.__contains__,
+                        _zip_terms(namespaces, ids)))
+
     def raise_value_error_if_not_in_famplex(self, namespace: str,
                                             id_: str) -> None:
         """Raise a value error if input is not in FamPlex ontology
@@ -220,6 +472,70 @@ class FamplexGraph(object):
             return []
         return edges
 
+    def parent_terms(self, namespace: str, id_: str,
+                     relation_types: Container[str] = RELATION_TYPES) -> \
+            Tuple[Tuple[str, str], ...]:
+        """Returns terms immediately above the input by given relation types
+
+        Parameters
+        ----------
+        namespace : str
+            Namespace for a term. This should be one of 'HGNC', 'FPLX' for
+            FamPlex, or 'UP' for Uniprot.
+        id_ : str
+            Identifier for a term within namespace. See the FamplexGraph
+            class Docstring for more info.
+        relation_types : Optional[container]
+            Only include parents connected to the input by one of these
+            relation types. Default: ('isa', 'partof')
+
+        Returns
+        -------
+        tuple
+            Tuple of terms of the form (namespace, id) in the same order as
+            :meth:`parent_edges`. The tuple is precomputed and shared between
+            callers.
+
+        Raises
+        ------
+        ValueError
+        If (namespace, id_) does not correspond to a term in FamPlex.
+        """
+        return self._terms(self._parent_terms, namespace, id_,
+                           relation_types)
+
+    def child_terms(self, namespace: str, id_: str,
+                    relation_types: Container[str] = RELATION_TYPES) -> \
+            Tuple[Tuple[str, str], ...]:
+        """Returns terms immediately below the input by given relation types
+
+        Parameters
+        ----------
+        namespace : str
+            Namespace for a term. This should be one of 'HGNC', 'FPLX' for
+            FamPlex, or 'UP' for Uniprot.
+        id_ : str
+            Identifier for a term within namespace. See the FamplexGraph
+            class Docstring for more info.
+        relation_types : Optional[container]
+            Only include children connected to the input by one of these
+            relation types. Default: ('isa', 'partof')
+
+        Returns
+        -------
+        tuple
+            Tuple of terms of the form (namespace, id) in the same order as
+            :meth:`child_edges`. The tuple is precomputed and shared between
+            callers.
+
+        Raises
+        ------
+        ValueError
+        If (namespace, id_) does not correspond to a term in FamPlex.
+        """
+        return self._terms(self._child_terms, namespace, id_,
+                           relation_types)
+
     def root_terms(self, namespace: str, id_: str) -> List[Tuple[str, str]]:
         """Returns top level terms above the input term
 
@@ -247,7 +563,8 @@ class FamplexGraph(object):
         roots = self._root_class_mapping.get((namespace, id_))
         if roots is None:
             raise ValueError(self.__error_message)
-        return roots
+        # Terms with the same root classes share one list.
+        return list(roots)
 
     def equivalences(self, fplx_id: str) -> List[Tuple[str, str]]:
         """Return list of equivalent terms from other namespaces.
@@ -324,18 +641,198 @@ class FamplexGraph(object):
             return False if either of (namespace1, id1) or (namespace2, id2) is
             not in the FamPlex ontology.
         """
-        roots1 = self._root_class_mapping.get((namespace1, id1))
-        roots2 = self._root_class_mapping.get((namespace2, id2))
-        if roots1 is None or roots2 is None:
+        if self._closure is not None:
+            closure = self._closure.get(self._relation_key(relation_types))
+            if closure is not None:
+                ancestors = closure.get((namespace1, id1))
+                return ancestors is not None and \
+                    (namespace2, id2) in ancestors
+        node1, node2 = (namespace1, id1), (namespace2, id2)
+        # Terms without a common root class are never related, and terms
+        # not in FamPlex have no root classes.
+        if not self._root_bits.get(node1, 0) & self._root_bits.get(node2, 0):
             return False
-        if set(roots1) & set(roots2):
-            node1, node2 = (namespace1, id1), (namespace2, id2)
-            for node in self.traverse(node1, relation_types,
-                                      direction='up'):
-                if node2 == node:
-                    return True
+        for node in self.traverse(node1, relation_types, direction='up'):
+            if node2 == node:
+                return True
         return False
 
+    def relation_many(self, pairs: Iterable[Tuple[str, str, str, str]],
+                      relation_types: Container[str]) -> List[bool]:
+        """Determine if each of many pairs of terms are related
+
+        Equivalent to calling :meth:`relation` on each pair, but terms that
+        appear as the first term of several pairs have their ancestors
+        computed only once.
+
+        Parameters
+        ----------
+        pairs : iterable
+            Iterable of sequences of the form
+            (namespace1, id1, namespace2, id2). This can also be a NumPy
+            array with four columns.
+        relation_types : container
+            Relation types to follow from the first term of each pair. Valid
+            relations are 'isa', and 'partof'.
+
+        Returns
+        -------
+        list
+            List of booleans, one for each input pair, in the same order.
+            Entry i is True if the first term of pair i has one of the
+            specified relations with its second term.
+        """
+        closure = None
+        if self._closure is not None:
+            closure = self._closure.get(self._relation_key(relation_types))
+        ancestor_sets: Dict[Tuple[str, str], Set[Tuple[str, str]]] = {}
+        root_mask = self._root_mask
+        results = []
+        for namespace1, id1, namespace2, id2 in pairs:
+            node1, node2 = (namespace1, id1), (namespace2, id2)
+            if closure is not None:
+                closure_ancestors = closure.get(node1)
+                results.append(closure_ancestors is not None and
+                               node2 in closure_ancestors)
+                continue
+            if not root_mask(node1) & root_mask(node2):
+                results.append(False)
+            else:
+                traversed = ancestor_sets.get(node1)
+                if traversed is None:
+                    traversed = set(self.traverse(node1, relation_types,
+                                                  direction='up'))
+                    ancestor_sets[node1] = traversed
+                results.append(node2 in traversed)
+        return results
+
+    def lowest_common_ancestors(self, terms: Iterable[Tuple[str, str]],
+                                relation_types: Container[str]) -> \
+            List[Tuple[str, str]]:
+        """Return the most specific terms above all of the given terms
+
+        A common ancestor of the terms is a term above or equal to each of
+        them. The lowest common ancestors are the common ancestors with no
+        other common ancestor below them. There can be several since
+        families and complexes overlap.
+
+        Common ancestors are visited from the deepest down to the shallowest
+        according to the depth index, so only the ancestors of the lowest
+        common ancestors themselves are needed to rule out the rest.
+        Ancestors are looked up in the closure index if the graph has one
+        and are otherwise cached as by :meth:`cached_traversal`.
+
+        Parameters
+        ----------
+        terms : iterable
+            Tuples of the form (namespace, id).
+        relation_types : container
+            Relation types to follow upward from each term. Valid relations
+            are 'isa', and 'partof'.
+
+        Returns
+        -------
+        list
+            List of the lowest common ancestors, sorted in case insensitive
+            alphabetical order, first by namespace and then by id. The list
+            is empty if there are no terms or they have no common ancestor.
+
+        Raises
+        ------
+        ValueError
+            If any of the terms is not in the FamPlex ontology.
+        """
+        return self._lowest_common_ancestors(terms, relation_types, {})
+
+    def lowest_common_ancestors_many(self, term_sets: Iterable[
+                                         Iterable[Tuple[str, str]]],
+                                     relation_types: Container[str]) -> \
+            List[List[Tuple[str, str]]]:
+        """Apply :meth:`lowest_common_ancestors` to each of many sets of terms
+
+        The ancestors of each distinct term are computed only once across
+        all sets.
+
+        Parameters
+        ----------
+        term_sets : iterable
+            Iterable of iterables of tuples of the form (namespace, id).
+        relation_types : container
+            Relation types to follow upward from each term. Valid relations
+            are 'isa', and 'partof'.
+
+        Returns
+        -------
+        list
+            List of lists of lowest common ancestors, one for each set of
+            terms, in the same order.
+
+        Raises
+        ------
+        ValueError
+            If any of the terms is not in the FamPlex ontology.
+        """
+        ancestor_sets: Dict[Tuple[str, str], Iterable[Tuple[str, str]]] = {}
+        return [self._lowest_common_ancestors(terms, relation_types,
+                                              ancestor_sets)
+                for terms in term_sets]
+
+    def covering_terms(self, genes: Iterable[Tuple[str, str]],
+                       min_jaccard: float,
+                       relation_types: Container[str]) -> \
+            List[Tuple[Tuple[str, str], float]]:
+        """Return the terms whose individual members best cover a set of genes
+
+        The individual members of each term, as returned by
+        :func:`famplex.api.individual_members`, are stored as an integer
+        bitset over the terms that have no children, so the overlap with
+        the genes is a bitwise AND and a popcount. Only terms above at
+        least one of the genes are scored.
+
+        Parameters
+        ----------
+        genes : iterable
+            Tuples of the form (namespace, id), typically HGNC or UP genes.
+            Genes that are not individual members of any term, including
+            genes not in FamPlex, are never covered but count towards the
+            size of the set.
+        min_jaccard : float
+            Only return terms for which the Jaccard index of their
+            individual members and the genes is at least this value.
+        relation_types : container
+            Relation types to follow down from each term to its individual
+            members. Valid relations are 'isa', and 'partof'.
+
+        Returns
+        -------
+        list
+            List of pairs of a term of the form (namespace, id) and its
+            Jaccard index, sorted by decreasing Jaccard index, then by
+            increasing number of individual members, so that the most
+            specific terms come first, then in case insensitive alphabetical
+            order.
+        """
+        member_index, term_bits = self._member_index(relation_types)
+        genes = set(genes)
+        query = 0
+        candidates: Set[Tuple[str, str]] = set()
+        for gene in genes:
+            bit = member_index.get(gene)
+            if bit is None:
+                continue
+            query |= bit
+            candidates.update(self.cached_traversal(gene, relation_types,
+                                                    'up')[1:])
+        results = []
+        for term in candidates:
+            bits = term_bits[term]
+            overlap = _popcount(query & bits)
+            jaccard = overlap / (len(genes) + _popcount(bits) - overlap)
+            if jaccard >= min_jaccard:
+                results.append((term, jaccard, _popcount(bits)))
+        results.sort(key=lambda x: (-x[1], x[2], _term_key(x[0])))
+        return [(term, jaccard) for term, jaccard, _ in results]
+
     def traverse(self, source: Tuple[str, str],
                  relation_types: Container[str],
                  direction: str) -> Generator[Tuple[str, str], None, None]:
@@ -363,21 +860,675 @@ class FamplexGraph(object):
             is included in the traversal.
         """
         if direction == 'down':
-            graph = self._reverse_graph
+            partition = self._child_terms
         elif direction == 'up':
-            graph = self._graph
+            partition = self._parent_terms
         else:
             raise ValueError
+        # Only edges of the requested relation types are ever visited.
+        graph = partition.get(self._relation_key(relation_types), {})
         visited = {source}
         queue = deque([source])
         while queue:
             node = queue.pop()
-            try:
-                children = graph[node]
-            except KeyError:
-                children = []
-            for ns, id_, rel in children:
-                if (ns, id_) not in visited and rel in relation_types:
-                    queue.appendleft((ns, id_))
-                    visited.add((ns, id_))
+            for term in graph.get(node, ()):
+                if term not in visited:
+                    queue.appendleft(term)
+                    visited.add(term)
             yield node
+
+    def cached_traversal(self, source: Tuple[str, str],
+                         relation_types: Container[str],
+                         direction: str) -> Tuple[Tuple[str, str], ...]:
+        """Return all nodes visited by :meth:`traverse`, caching the result
+
+        Results are kept in a least recently used cache keyed on the source,
+        the relation types and the direction. See :meth:`cache_info` and
+        :meth:`clear_cache`.
+
+        Parameters
+        ----------
+        source : tuple
+            Tuple of the form (namespace, id) specifying where traversal is to
+            begin.
+        relation_types : container
+            Traversal will follow edges from these specified relation_types.
+            Valid relation types are isa and partof.
+        direction : str
+            One of 'up' or 'down'. See :meth:`traverse`.
+
+        Returns
+        -------
+        tuple
+            Tuple of the nodes in the traversal in breadth first order. The
+            source node is included as the first element. The tuple is shared
+            between callers and cannot be modified.
+        """
+        key = (source, self._relation_key(relation_types), direction)
+        result = self._traversal_cache.get(key)
+        if result is None:
+            result = tuple(self.traverse(source, relation_types, direction))
+            self._traversal_cache.put(key, result)
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        """Return statistics for the cache used by :meth:`cached_traversal`
+
+        Returns
+        -------
+        CacheInfo
+            Named tuple with fields hits, misses, maxsize and currsize.
+        """
+        return self._traversal_cache.info()
+
+    def clear_cache(self) -> None:
+        """Empty the cache used by :meth:`cached_traversal`
+
+        This must be called whenever the graph is modified. Hit and miss
+        counts are also reset.
+        """
+        self._traversal_cache.clear()
+
+    def add_relation(self, namespace1: str, id1: str, relation: str,
+                     namespace2: str, id2: str) -> None:
+        """Add a relation between two terms, updating the graph in place
+
+        Only the first term and the terms below it are revisited to update
+        root classes and, if present, the closure index, so edits are much
+        faster than rebuilding the graph. Cached traversals are cleared.
+        Adjacency and root lists previously returned by the graph are not
+        modified. Adding a relation that already exists has no effect.
+
+        Parameters
+        ----------
+        namespace1 : str
+            Namespace of the child term.
+        id1 : str
+            Identifier of the child term.
+        relation : str
+            One of 'isa' or 'partof'.
+        namespace2 : str
+            Namespace of the parent term.
+        id2 : str
+            Identifier of the parent term.
+
+        Raises
+        ------
+        ValueError
+            If relation is not a valid relation type or if the relation
+            would create a cycle.
+        """
+        if relation not in RELATION_TYPES:
+            raise ValueError('Invalid relation type %s.' % relation)
+        node1, node2 = (namespace1, id1), (namespace2, id2)
+        edge = (namespace2, id2, relation)
+        if edge in self._graph.get(node1, []):
+            return
+        if node1 in self.traverse(node2, RELATION_TYPES, direction='up'):
+            raise ValueError('Relation would create a cycle.')
+        was_root = node1 not in self._graph and node1 in self._reverse_graph
+        self._graph[node1] = sorted(self._graph.get(node1, []) + [edge],
+                                    key=_term_key)
+        self._reverse_graph[node2] = \
+            sorted(self._reverse_graph.get(node2, []) +
+                   [(namespace1, id1, relation)], key=_term_key)
+        self._update_terms(node1, node2)
+        if was_root:
+            self.root_classes = [root for root in self.root_classes
+                                 if root != node1]
+        if node2 not in self._graph and node2 not in self.root_classes:
+            self.root_classes = sorted(self.root_classes + [node2],
+                                       key=lambda x: x[1].lower())
+        # A new parent term is updated along with everything below it.
+        self._update_below(node2 if node2 not in self._root_class_mapping
+                           else node1)
+        self._member_indexes = {}
+        self.clear_cache()
+
+    def remove_relation(self, namespace1: str, id1: str, relation: str,
+                        namespace2: str, id2: str) -> None:
+        """Remove a relation between two terms, updating the graph in place
+
+        See :meth:`add_relation`. Terms from namespaces other than FPLX
+        that are left without any relations are removed from the graph.
+
+        Parameters
+        ----------
+        namespace1 : str
+            Namespace of the child term.
+        id1 : str
+            Identifier of the child term.
+        relation : str
+            One of 'isa' or 'partof'.
+        namespace2 : str
+            Namespace of the parent term.
+        id2 : str
+            Identifier of the parent term.
+
+        Raises
+        ------
+        ValueError
+            If the relation is not in the graph.
+        """
+        node1, node2 = (namespace1, id1), (namespace2, id2)
+        edge = (namespace2, id2, relation)
+        edges = self._graph.get(node1, [])
+        if edge not in edges:
+            raise ValueError('Relation is not in the FamPlex ontology.')
+        self._set_edges(self._graph, node1,
+                        [other for other in edges if other != edge])
+        reverse_edge = (namespace1, id1, relation)
+        self._set_edges(self._reverse_graph, node2,
+                        [other for other in self._reverse_graph[node2]
+                         if other != reverse_edge])
+        self._update_terms(node1, node2)
+        if node1 not in self._graph and node1 in self._reverse_graph:
+            self.root_classes = sorted(self.root_classes + [node1],
+                                       key=lambda x: x[1].lower())
+        if node2 not in self._graph and node2 not in self._reverse_graph:
+            self.root_classes = [root for root in self.root_classes
+                                 if root != node2]
+            self._update_below(node2)
+        self._update_below(node1)
+        self._member_indexes = {}
+        self.clear_cache()
+
+    def add_equivalence(self, namespace: str, id_: str,
+                        fplx_id: str) -> None:
+        """Add an equivalence between a FamPlex term and an external term
+
+        Adding an equivalence that already exists has no effect. Lists
+        previously returned by :meth:`equivalences` and
+        :meth:`reverse_equivalences` are not modified.
+
+        Parameters
+        ----------
+        namespace : str
+            Namespace of the external term.
+        id_ : str
+            Identifier of the external term.
+        fplx_id : str
+            A valid FamPlex ID.
+
+        Raises
+        ------
+        ValueError
+            If fplx_id is not an ID in the FamPlex ontology.
+        """
+        self.raise_value_error_if_not_in_famplex('FPLX', fplx_id)
+        equiv = self._equivalences.get(fplx_id, [])
+        if (namespace, id_) in equiv:
+            return
+        self._equivalences[fplx_id] = equiv + [(namespace, id_)]
+        self._reverse_equivalences[(namespace, id_)] = \
+            self._reverse_equivalences.get((namespace, id_), []) + [fplx_id]
+
+    def closure_index_size(self) -> int:
+        """Return approximate memory used by the closure index in bytes
+
+        Only the containers making up the index are counted. The
+        (namespace, id) tuples they hold are shared with the rest of the
+        graph.
+
+        Returns
+        -------
+        int
+            Number of bytes used by the closure index or 0 if the graph was
+            constructed without one.
+        """
+        if self._closure is None:
+            return 0
+        size = sys.getsizeof(self._closure)
+        for closure in self._closure.values():
+            size += sys.getsizeof(closure)
+            size += sum(sys.getsizeof(ancestors)
+                        for ancestors in closure.values())
+        return size
+
+    def _lowest_common_ancestors(self, terms: Iterable[Tuple[str, str]],
+                                 relation_types: Container[str],
+                                 ancestor_sets: Dict[Tuple[str, str],
+                                                     Iterable[Tuple[str,
+                                                                    str]]]) \
+            -> List[Tuple[str, str]]:
+        """Compute lowest common ancestors, memoizing ancestors of terms
+
+        Ancestors are frozensets from the closure index or tuples from
+        :meth:`cached_traversal`, which are intersected with without
+        building a set for each term.
+        """
+        terms = list(terms)
+        mask = -1
+        for term in terms:
+            self.raise_value_error_if_not_in_famplex(*term)
+            mask &= self._root_mask(term)
+        if not terms or not mask:
+            return []
+        closure = None
+        if self._closure is not None:
+            closure = self._closure.get(self._relation_key(relation_types))
+
+        def ancestors(node):
+            if closure is not None:
+                return closure[node]
+            result = ancestor_sets.get(node)
+            if result is None:
+                result = ancestor_sets[node] = \
+                    self.cached_traversal(node, relation_types, 'up')
+            return result
+
+        common = set(ancestors(terms[0]))
+        for term in terms[1:]:
+            common.intersection_update(ancestors(term))
+            if not common:
+                return []
+        # Terms are deeper than all terms above them, so each common
+        # ancestor is visited after the common ancestors below it.
+        depths = self._depth_index()
+        lowest = []
+        excluded: Set[Tuple[str, str]] = set()
+        for node in sorted(common, key=depths.__getitem__, reverse=True):
+            if node not in excluded:
+                lowest.append(node)
+                excluded.update(ancestors(node))
+        return sorted(lowest, key=_term_key)
+
+    def _depth_index(self) -> Dict[Tuple[str, str], int]:
+        """Return the length of the longest path from a root to each term
+
+        The index is built in one pass in topological order on first use and
+        kept up to date by :meth:`_update_below` afterwards.
+        """
+        depths = self._depths
+        if depths is None:
+            depths = {}
+            for node in self._topological_order():
+                parents = self._graph.get(node)
+                depths[node] = 1 + max(depths[(ns, id_)] for ns, id_, _
+                                       in parents) if parents else 0
+            self._depths = depths
+        return depths
+
+    def _member_index(self, relation_types: Container[str]) -> \
+            Tuple[Dict[Tuple[str, str], int], Dict[Tuple[str, str], int]]:
+        """Return bitsets of the individual members of terms
+
+        Terms without children along the given relation types are assigned
+        one bit each. The first dictionary maps them to their bit and the
+        second maps every other term to the bitwise or of the bits of its
+        individual members. Terms are visited deepest first according to
+        the depth index so that the bitsets of children are computed before
+        those of their parents. The index is built on first use for each
+        relation key and dropped when the graph is modified.
+        """
+        key = self._relation_key(relation_types)
+        index = self._member_indexes.get(key)
+        if index is None:
+            member_index: Dict[Tuple[str, str], int] = {}
+            term_bits: Dict[Tuple[str, str], int] = {}
+            depths = self._depth_index()
+            for node in sorted(depths, key=depths.__getitem__, reverse=True):
+                children = self.child_terms(*node, relation_types)
+                if children:
+                    bits = 0
+                    for child in children:
+                        bit = member_index.get(child)
+                        bits |= term_bits[child] if bit is None else bit
+                    term_bits[node] = bits
+                else:
+                    member_index[node] = 1 << len(member_index)
+            index = self._member_indexes[key] = (member_index, term_bits)
+        return index
+
+    def _root_mask(self, node: Tuple[str, str]) -> int:
+        """Return the bits of the root classes above a term
+
+        The result is 0 if the term is not in FamPlex.
+        """
+        return self._root_bits.get(node, 0)
+
+    def _root_bit(self, root: Tuple[str, str]) -> int:
+        """Return the bit of a root class, assigning the next free one"""
+        index = self._root_bit_index.get(root)
+        if index is None:
+            index = self._root_bit_index[root] = len(self._root_bit_index)
+        return 1 << index
+
+    def _compute_root_bits(self, root_classes: List[Tuple[str, str]],
+                           mapping: Dict[Tuple[str, str],
+                                         List[Tuple[str, str]]]) -> \
+            Dict[Tuple[str, str], int]:
+        """Map each term to the bitwise or of the bits of its root classes
+
+        Bits are assigned to root_classes in order, then to the isolated
+        terms that are their own root. Masks are computed once for each of
+        the root lists shared between terms by :meth:`_compute_root_classes`.
+        """
+        for root in root_classes:
+            self._root_bit(root)
+        masks: Dict[int, int] = {}
+        bits = {}
+        for node, roots in mapping.items():
+            mask = masks.get(id(roots))
+            if mask is None:
+                mask = 0
+                for root in roots:
+                    mask |= self._root_bit(root)
+                masks[id(roots)] = mask
+            bits[node] = mask
+        return bits
+
+    @staticmethod
+    def _relation_key(relation_types: Container[str]) -> Tuple[bool, bool]:
+        """Normalize a container of relation types into a hashable key
+
+        The key records whether each of 'isa' and 'partof' is contained in
+        relation_types. It is cheap enough to compute on every call to
+        :meth:`relation`.
+        """
+        return 'isa' in relation_types, 'partof' in relation_types
+
+    def _terms(self, partition: Dict[Tuple[bool, bool],
+                                     Dict[Tuple[str, str],
+                                          Tuple[Tuple[str, str], ...]]],
+               namespace: str, id_: str,
+               relation_types: Container[str]) -> \
+            Tuple[Tuple[str, str], ...]:
+        """Look up the neighbors of a term in a partitioned adjacency"""
+        terms = partition.get(self._relation_key(relation_types), {}).\
+            get((namespace, id_))
+        if terms is None:
+            self.raise_value_error_if_not_in_famplex(namespace, id_)
+            return ()
+        return terms
+
+    def _update_terms(self, node1: Tuple[str, str],
+                      node2: Tuple[str, str]) -> None:
+        """Rebuild the partitioned parents of node1 and children of node2
+
+        Called after the edges between the two terms have changed. Tuples
+        are replaced rather than modified.
+        """
+        for partition, graph, node in ((self._parent_terms, self._graph,
+                                        node1),
+                                       (self._child_terms,
+                                        self._reverse_graph, node2)):
+            edges = graph.get(node, [])
+            for key, terms in partition.items():
+                selected = _select_terms(edges, key)
+                if selected:
+                    terms[node] = selected
+                else:
+                    terms.pop(node, None)
+
+    @staticmethod
+    def _set_edges(graph: Dict[Tuple[str, str], List[Tuple[str, str, str]]],
+                   node: Tuple[str, str],
+                   edges: List[Tuple[str, str, str]]) -> None:
+        """Set the edges of a node, removing it if it has none left"""
+        if edges:
+            graph[node] = edges
+        else:
+            del graph[node]
+
+    def _topological_order(self, nodes: Optional[Iterable[Tuple[str, str]]]
+                           = None, closed: bool = False) -> \
+            List[Tuple[str, str]]:
+        """Return terms ordered so that parents precede their children
+
+        If nodes is given, only these terms are ordered and only edges
+        between them are considered, unless closed is True, meaning that
+        nodes contains all parents of its terms. By default all terms are
+        ordered.
+        """
+        if nodes is None or closed:
+            num_parents = {node: len(self._graph.get(node, []))
+                           for node in (self._root_class_mapping
+                                        if nodes is None else nodes)}
+        else:
+            nodes = set(nodes)
+            num_parents = {node: sum((ns, id_) in nodes for ns, id_, _
+                                     in self._graph.get(node, []))
+                           for node in nodes}
+        queue = deque(node for node, count in num_parents.items()
+                      if count == 0)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for ns, id_, _ in self._reverse_graph.get(node, []):
+                if (ns, id_) not in num_parents:
+                    continue
+                num_parents[(ns, id_)] -= 1
+                if num_parents[(ns, id_)] == 0:
+                    queue.append((ns, id_))
+        return order
+
+    def _compute_root_classes(self, root_classes: List[Tuple[str, str]],
+                              nodes: Iterable[Tuple[str, str]]) -> \
+            Dict[Tuple[str, str], List[Tuple[str, str]]]:
+        """Map each term to the sorted list of root classes above it
+
+        nodes must contain all terms with relations.
+
+        Root classes are computed in a single pass over the terms in
+        topological order, the roots of each term being the union of the
+        roots of its parents, so the cost is linear in the number of edges
+        times the number of roots per term. Terms with the same roots share
+        one list, so a term whose parents all share a list, in particular a
+        term with a single parent, needs neither a union nor a sort.
+        """
+        mapping: Dict[Tuple[str, str], List[Tuple[str, str]]] = \
+            {root: [root] for root in root_classes}
+        shared: Dict[FrozenSet[Tuple[str, str]], List[Tuple[str, str]]] = {}
+        graph = self._graph
+        for node in self._topological_order(nodes, closed=True):
+            parents = graph.get(node)
+            if not parents:
+                continue
+            ns, id_, _ = parents[0]
+            roots = mapping[(ns, id_)]
+            others = [mapping[(ns, id_)] for ns, id_, _ in parents[1:]]
+            others = [other for other in others if other is not roots]
+            if others:
+                union = set(roots).union(*others)
+                key = frozenset(union)
+                shared_roots = shared.get(key)
+                if shared_roots is None:
+                    shared_roots = shared[key] = sorted(union, key=_term_key)
+                roots = shared_roots
+            mapping[node] = roots
+        return mapping
+
+    def _update_below(self, source: Tuple[str, str]) -> None:
+        """Recompute roots, depths and closures of a term and its descendants
+
+        Called after the parents of source have changed. Terms are visited
+        in topological order so that the roots and ancestors of each term
+        are computed from the already updated values of its parents. The
+        roots of a term are the terms above it with no parents, itself
+        included.
+        """
+        mapping = self._root_class_mapping
+        bits = self._root_bits
+        depths = self._depths
+        closures = [] if self._closure is None else \
+            list(self._closure.items())
+        below = self.traverse(source, RELATION_TYPES, direction='down')
+        for node in self._topological_order(below):
+            parents = self._graph.get(node, [])
+            if not parents and node not in self._reverse_graph and \
+                    node[0] != 'FPLX':
+                # Terms from other namespaces are only in FamPlex while
+                # they are connected to a FamPlex term.
+                mapping.pop(node, None)
+                bits.pop(node, None)
+                if depths is not None:
+                    depths.pop(node, None)
+                for _, closure in closures:
+                    closure.pop(node, None)
+                continue
+            if parents:
+                roots = set()
+                mask = 0
+                for ns, id_, _ in parents:
+                    roots.update(mapping[(ns, id_)])
+                    mask |= bits[(ns, id_)]
+                mapping[node] = sorted(roots, key=_term_key)
+                bits[node] = mask
+            else:
+                mapping[node] = [node]
+                bits[node] = self._root_bit(node)
+            if depths is not None:
+                depths[node] = 1 + max(depths[(ns, id_)] for ns, id_, _
+                                       in parents) if parents else 0
+            for key, closure in closures:
+                ancestors = {node}
+                for term in self._parent_terms[key].get(node, ()):
+                    ancestors |= closure[term]
+                closure[node] = frozenset(ancestors)
+
+    def _build_closure_index(self) -> Dict[Tuple[bool, bool],
+                                           Dict[Tuple[str, str],
+                                                FrozenSet[Tuple[str, str]]]]:
+        """Compute the reflexive transitive closure for each relation key
+
+        Ancestor sets are built in a single pass over the terms in
+        topological order, each term's set being the union of the sets of
+        its parents along edges of the given relation types.
+        """
+        order = self._topological_order()
+        index = {}
+        for key, parents in self._parent_terms.items():
+            closure: Dict[Tuple[str, str], FrozenSet[Tuple[str, str]]] = {}
+            for node in order:
+                ancestors = {node}
+                for term in parents.get(node, ()):
+                    ancestors |= closure[term]
+                closure[node] = frozenset(ancestors)
+            index[key] = closure
+        return index
+
+    def save_snapshot(self, path: str) -> None:
+        """Serialize the built state of the graph to a file
+
+        The snapshot records SNAPSHOT_VERSION and the hash of the resource
+        files the graph was built from. The file is written atomically so
+        concurrent readers never see a partial snapshot.
+
+        Parameters
+        ----------
+        path : str
+            Location of the snapshot file.
+        """
+        snapshot = {'version': SNAPSHOT_VERSION,
+                    'class': type(self).__name__,
+                    'resource_hash': resource_hash(),
+                    'state': self.__getstate__()}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = '%s.%d.tmp' % (path, os.getpid())
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load_snapshot(cls: Type[G], path: str) -> G:
+        """Load a graph from a snapshot written by :meth:`save_snapshot`
+
+        Snapshots are unpickled, which can run arbitrary code, so only load
+        snapshots from a trusted location that other users cannot write to.
+
+        Parameters
+        ----------
+        path : str
+            Location of the snapshot file.
+
+        Returns
+        -------
+        FamplexGraph
+
+        Raises
+        ------
+        ValueError
+            If the snapshot was written by an incompatible version of this
+            class, or the resource files have changed since it was written.
+        """
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+        if not isinstance(snapshot, dict) or \
+                snapshot.get('version') != SNAPSHOT_VERSION or \
+                snapshot.get('class') != cls.__name__:
+            raise ValueError('Snapshot %s is incompatible with this version '
+                             'of FamPlex.' % path)
+        if snapshot['resource_hash'] != resource_hash():
+            raise ValueError('Snapshot %s is out of date with the FamPlex '
+                             'resource files.' % path)
+        graph = cls.__new__(cls)
+        graph.__dict__.update(snapshot['state'])
+        return graph
+
+    @classmethod
+    def from_cache(cls: Type[G], cache_path: Optional[str] = None,
+                   **kwargs: Any) -> G:
+        """Load the graph from a cached snapshot, building it if needed
+
+        Snapshots are keyed by the contents of the resource files and the
+        given constructor arguments, so a change to any resource file
+        results in the graph being rebuilt. Resources in
+        :func:`famplex.bundle.get_bundle` loaded from files that have since
+        changed are reloaded first. When a new snapshot is written,
+        snapshots of this class written by other versions of FamPlex or
+        from other resource files are deleted. Failure to write or delete
+        snapshots is not an error.
+
+        The cache directory must be trusted, since snapshots are unpickled
+        when they are loaded. See :meth:`load_snapshot`.
+
+        Parameters
+        ----------
+        cache_path : Optional[str]
+            Directory in which snapshots are stored. Defaults to
+            famplex.locations.CACHE_PATH.
+        **kwargs
+            Keyword arguments passed to the constructor when the graph has
+            to be built.
+
+        Returns
+        -------
+        FamplexGraph
+        """
+        if cache_path is None:
+            cache_path = CACHE_PATH
+        # Resources loaded before the files were last changed would
+        # otherwise be saved under the hash of the new files.
+        bundle = get_bundle()
+        if bundle.changed():
+            bundle.clear()
+        stat = resource_stat()
+        # Snapshots built with different constructor arguments from the
+        # same resource files share a prefix and are kept side by side.
+        prefix = '%s_v%d_%s_' % (cls.__name__, SNAPSHOT_VERSION,
+                                 resource_hash()[:16])
+        key = hashlib.sha256(
+            repr(sorted(kwargs.items())).encode('utf-8')).hexdigest()[:8]
+        path = os.path.join(cache_path, '%s%s.pickle' % (prefix, key))
+        try:
+            return cls.load_snapshot(path)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            pass
+        graph = cls(**kwargs)
+        # If the files changed while the graph was being built, it may not
+        # match the hash in the file name and is not saved.
+        if bundle.changed() or resource_stat() != stat:
+            return graph
+        try:
+            graph.save_snapshot(path)
+        except OSError:
+            return graph
+        _remove_stale_snapshots(cache_path, cls.__name__, prefix)
+        return graph
@@ -0,0 +1,147 @@
+"""Fast lookup of groundings for entity texts in the FamPlex grounding map."""
+from typing import Dict, Iterable, List, Optional
+
+from famplex.bundle import get_bundle
+
+__all__ = ['GroundingIndex', 'normalize_text']
+
+
+# Spelled out names of lower case Greek letters. Upper case letters are
+# handled by lower casing texts before substitution.
+_GREEK_LETTERS = {
+    'α': 'alpha', 'β': 'beta', 'γ': 'gamma', 'δ': 'delta', 'ε': 'epsilon',
+    'ζ': 'zeta', 'η': 'eta', 'θ': 'theta', 'ι': 'iota', 'κ': 'kappa',
+    'λ': 'lambda', 'μ': 'mu', 'ν': 'nu', 'ξ': 'xi', 'ο': 'omicron',
+    'π': 'pi', 'ρ': 'rho', 'σ': 'sigma', 'ς': 'sigma', 'τ': 'tau',
+    'υ': 'upsilon', 'φ': 'phi', 'χ': 'chi', 'ψ': 'psi', 'ω': 'omega',
+}
+
+# Characters dropped entirely: whitespace, hyphens, dashes and underscores.
+_IGNORED_CHARACTERS = ' \t\n-_‐‑‒–—−'
+
+_NORMALIZATION_TABLE = str.maketrans(
+    {**_GREEK_LETTERS, **{char: None for char in _IGNORED_CHARACTERS}})
+
+
+def normalize_text(text: str) -> str:
+    """Return a normalized form of an entity text for approximate matching
+
+    Texts are lower cased, Greek letters are replaced by their spelled out
+    names and whitespace, hyphens and underscores are removed. For example
+    'PI3K-α', 'PI3K alpha' and 'Pi3kAlpha' all normalize to 'pi3kalpha'.
+
+    Parameters
+    ----------
+    text : str
+        An entity text
+
+    Returns
+    -------
+    str
+        The normalized text.
+    """
+    return text.lower().translate(_NORMALIZATION_TABLE)
+
+
+class GroundingIndex(object):
+    """Index of the FamPlex grounding map supporting normalized lookups
+
+    Normalized forms of every text in the grounding map are computed once
+    when the index is built, so both exact and normalized lookups are
+    single dictionary probes. Texts in the grounding map whose normalized
+    forms collide but which have different groundings are left out of the
+    normalized index, so a normalized lookup never returns an arbitrary
+    choice between them.
+
+    Parameters
+    ----------
+    grounding_map : Optional[dict]
+        Dictionary mapping texts to INDRA style db_refs dictionaries, as
+        returned by :func:`famplex.load.load_grounding_map`. If None, the
+        FamPlex grounding map is loaded. Default: None
+    """
+    def __init__(self,
+                 grounding_map:
+                 Optional[Dict[str, Optional[Dict[str, str]]]] = None):
+        if grounding_map is None:
+            grounding_map = get_bundle().grounding_map
+        self._exact = grounding_map
+        normalized: Dict[str, Optional[Dict[str, str]]] = {}
+        ambiguous = set()
+        for text, db_refs in grounding_map.items():
+            key = normalize_text(text)
+            if key in normalized and \
+                    _groundings(normalized[key]) != _groundings(db_refs):
+                ambiguous.add(key)
+            else:
+                normalized[key] = db_refs
+        for key in ambiguous:
+            del normalized[key]
+        self._normalized = normalized
+
+    def __contains__(self, text: str) -> bool:
+        return text in self._exact or \
+            normalize_text(text) in self._normalized
+
+    def lookup(self, text: str,
+               normalize: bool = True) -> Optional[Dict[str, str]]:
+        """Return the grounding for an entity text
+
+        Parameters
+        ----------
+        text : str
+            An entity text
+        normalize : Optional[bool]
+            If True, fall back to matching the normalized form of the text
+            when there is no exact match. See :func:`normalize_text`.
+            Default: True
+
+        Returns
+        -------
+        dict or None
+            INDRA style db_refs dictionary mapping namespaces to ids, with
+            the matching text from the grounding map under the key 'TEXT'.
+            None if the text has no grounding. The dictionary is shared
+            with the index and should be copied before being modified.
+        """
+        db_refs = self._exact.get(text)
+        if db_refs is None and normalize:
+            db_refs = self._normalized.get(normalize_text(text))
+        return db_refs
+
+    def lookup_many(self, texts: Iterable[str],
+                    normalize: bool = True) -> \
+            List[Optional[Dict[str, str]]]:
+        """Return groundings for many entity texts
+
+        Parameters
+        ----------
+        texts : iterable
+            Entity texts
+        normalize : Optional[bool]
+            See :meth:`lookup`. Default: True
+
+        Returns
+        -------
+        list
+            List of db_refs dictionaries or None, one for each text in the
+            same order.
+        """
+        exact, normalized = self._exact, self._normalized
+        if not normalize:
+            return [exact.get(text) for text in texts]
+        out = []
+        for text in texts:
+            db_refs = exact.get(text)
+            if db_refs is None:
+                db_refs = normalized.get(
+                    text.lower().translate(_NORMALIZATION_TABLE))
+            out.append(db_refs)
+        return out
+
+
+def _groundings(db_refs: Optional[Dict[str, str]]) -> \
+        Optional[Dict[str, str]]:
+    if db_refs is None:
+        return None
+    return {ns: id_ for ns, id_ in db_refs.items() if ns != 'TEXT'}
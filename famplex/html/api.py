@@ -2,16 +2,21 @@
 
 """Export FamPlex as a static site."""
 
+import hashlib
+import json
 import os
-from collections import defaultdict
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import click
-import pandas as pd
 import requests
 from jinja2 import Environment, FileSystemLoader
 from tqdm import tqdm
 
-from famplex.load import load_descriptions, load_entities, load_equivalences, load_grounding_map, load_relations
+from famplex.bundle import get_bundle
+from famplex.html.names import NAME_CACHE_PATH, NameCache
 
 HERE = os.path.abspath(os.path.dirname(__file__))
 ROOT = os.path.abspath(os.path.join(HERE, os.pardir, os.pardir))
@@ -22,6 +27,15 @@ environment = Environment(autoescape=True, loader=FileSystemLoader(HERE), trim_b
 index_template = environment.get_template('index.html')
 term_template = environment.get_template('term.html')
 
+#: Name of the file recording the hash of the inputs of each term page
+MANIFEST_NAME = '.manifest.json'
+
+#: Summary of a term shown in the index and at the top of its page
+TermRow = namedtuple('TermRow', [
+    'identifier', 'description_source', 'description_text', 'equivalences',
+    'synonyms', 'in_edges', 'out_edges',
+])
+
 try:
     from indra.ontology.bio import bio_ontology
 except ImportError:
@@ -58,82 +72,210 @@ else:
         return identifier
 
 
+def _template_hash() -> str:
+    """Hash the templates used for term pages so edits to them invalidate the pages."""
+    sha = hashlib.sha256()
+    for name in ('base.html', 'term.html'):
+        with open(os.path.join(HERE, name), 'rb') as file:
+            sha.update(file.read())
+    return sha.hexdigest()
+
+
+def _context_hash(context: Dict[str, Any], template_hash: str) -> str:
+    """Hash all inputs of a term page."""
+    payload = json.dumps([template_hash, context], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _render_term(args: Tuple[str, Dict[str, Any]]) -> str:
+    """Render one term page, run in a worker process."""
+    subdirectory, context = args
+    os.makedirs(subdirectory, exist_ok=True)
+    term_html = term_template.render(**context)
+    with open(os.path.join(subdirectory, 'index.html'), 'w') as file:
+        print(term_html, file=file)
+    return context['row'].identifier
+
+
+def write_term_pages(
+    contexts: Dict[str, Dict[str, Any]],
+    directory: str,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> Tuple[int, int]:
+    """Render the page of each term whose inputs changed since the last run.
+
+    The hash of the inputs of each page, together with the templates, is
+    recorded in a manifest in the output directory. Pages whose hash is
+    unchanged and whose file still exists are skipped. The remaining pages
+    are rendered across a pool of processes.
+
+    :param contexts: Template context of each term page, keyed by FamPlex ID
+    :param directory: Output directory of the site
+    :param workers: Number of processes. Defaults to the number of CPUs.
+    :param force: If true, render all pages regardless of the manifest
+    :returns: Number of pages rendered and number of pages skipped
+    """
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    manifest = {}
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+
+    template_hash = _template_hash()
+    hashes = {
+        fplx_id: _context_hash(context, template_hash)
+        for fplx_id, context in contexts.items()
+    }
+    tasks = [
+        (os.path.join(directory, fplx_id), context)
+        for fplx_id, context in contexts.items()
+        if manifest.get(fplx_id) != hashes[fplx_id]
+        or not os.path.exists(os.path.join(directory, fplx_id, 'index.html'))
+    ]
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for _ in tqdm(
+                executor.map(_render_term, tasks, chunksize=16),
+                total=len(tasks), desc='writing terms',
+            ):
+                pass
+
+    # Written last so an interrupted run re-renders the pages it did not finish
+    with open(manifest_path, 'w') as file:
+        json.dump(hashes, file, indent=0, sort_keys=True)
+    return len(tasks), len(contexts) - len(tasks)
+
+
+def _write_table(terms: List[TermRow], path: str) -> None:
+    """Write the summary of each term as a table, with pandas."""
+    try:
+        import pandas as pd
+    except ImportError:
+        raise click.ClickException('pandas is required to write a table of terms')
+    terms_df = pd.DataFrame(terms, columns=TermRow._fields)
+    terms_df.to_csv(path, sep='\t' if path.endswith('.tsv') else ',', index=False)
+
+
 @click.command()
 @click.option('--directory', default=DOCS)
 @click.option('--debug-links', is_flag=True)
-def html(directory: str, debug_links: bool):
+@click.option('--workers', type=int, help='Number of processes rendering term pages. Defaults to the number of CPUs.')
+@click.option('--force', is_flag=True, help='Render all term pages even if their inputs are unchanged.')
+@click.option('--name-cache', default=NAME_CACHE_PATH, help='SQLite database caching names and identifiers of terms.')
+@click.option('--offline', is_flag=True, help='Only use cached names and identifiers, failing if any is missing.')
+@click.option('--table', help='Also write a summary of each term to this CSV or TSV file. Requires pandas.')
+def html(
+    directory: str,
+    debug_links: bool,
+    workers: Optional[int],
+    force: bool,
+    name_cache: str,
+    offline: bool,
+    table: Optional[str],
+):
     """Export FamPlex as a static HTML site."""
     click.echo(f'outputting to {directory}')
+    start = time.perf_counter()
 
-    fplx_ids = load_entities()
+    bundle = get_bundle()
+    fplx_ids = bundle.entities
+
+    names = NameCache(name_cache, get_name=get_name, get_identifier=get_identifier, offline=offline)
+    name_queries = {(namespace, identifier) for namespace, identifier, _ in bundle.equivalences}
+    identifier_queries = set()
+    # The same lookups as made for the relations below
+    for ns1, id1, _, ns2, id2 in bundle.relations:
+        if ns1 == 'FPLX':
+            (identifier_queries if ns2 == 'HGNC' else name_queries).add((ns2, id2))
+        if ns2 == 'FPLX':
+            (identifier_queries if ns1 == 'HGNC' else name_queries).add((ns1, id1))
+    try:
+        missing_names, missing_identifiers = names.prefetch(name_queries, identifier_queries)
+    except LookupError as e:
+        raise click.ClickException(str(e))
+    click.echo(
+        f'name cache {name_cache}: {1 - missing_names / max(len(name_queries), 1):.1%} of '
+        f'{len(name_queries)} names and {1 - missing_identifiers / max(len(identifier_queries), 1):.1%} of '
+        f'{len(identifier_queries)} identifiers were cached'
+    )
 
     descriptions = {
         identifier: (source, text)
-        for identifier, source, text in load_descriptions()
+        for identifier, (_, source, text) in bundle.descriptions_by_fplx_id.items()
     }
 
     xrefs = defaultdict(set)
-    for namespace, identifier, fplx_id in tqdm(load_equivalences(), desc='loading equivalences'):
-        xrefs[fplx_id].add((namespace, identifier, get_name(namespace, identifier)))
+    for namespace, identifier, fplx_id in tqdm(bundle.equivalences, desc='loading equivalences'):
+        xrefs[fplx_id].add((namespace, identifier, names.get_name(namespace, identifier)))
 
-    grounding_map = load_grounding_map()
     synonyms = defaultdict(set)
-    for text, groundings in grounding_map.items():
-        fplx_id = groundings.get('FPLX')
-        if fplx_id:
-            synonyms[fplx_id].add(text)
+    for fplx_id, texts in bundle.synonyms_by_fplx_id.items():
+        synonyms[fplx_id].update(texts)
 
     incoming_relations = defaultdict(set)
     outgoing_relations = defaultdict(set)
-    for ns1, id1, rel, ns2, id2 in tqdm(load_relations(), desc='loading relations'):
+    for ns1, id1, rel, ns2, id2 in tqdm(bundle.relations, desc='loading relations'):
         if ns1 == 'FPLX':
             if ns2 == 'HGNC':
-                id2, name2 = get_identifier(ns2, id2), id2
+                id2, name2 = names.get_identifier(ns2, id2), id2
             else:
-                name2 = get_name(ns2, id2)
+                name2 = names.get_name(ns2, id2)
             outgoing_relations[id1].add((rel, ns2, id2, name2))
         if ns2 == 'FPLX':
             if ns1 == 'HGNC':
-                id1, name1 = get_identifier(ns1, id1), id1
+                id1, name1 = names.get_identifier(ns1, id1), id1
             else:
-                name1 = get_name(ns1, id1)
+                name1 = names.get_name(ns1, id1)
             incoming_relations[id2].add((ns1, id1, name1, rel))
+    names.close()
 
-    rows = [
-        (
+    # Each term's inputs are computed once as plain records. Sets are sorted so
+    # that the inputs of each page, and so their hashes and the rendered pages,
+    # are the same from one run to the next.
+    terms = []
+    contexts = {}
+    for fplx_id in fplx_ids:
+        term_synonyms = sorted(synonyms.get(fplx_id, ()))
+        term_xrefs = sorted(xrefs.get(fplx_id, ()), key=str)
+        term_incoming = sorted(incoming_relations.get(fplx_id, ()), key=str)
+        term_outgoing = sorted(outgoing_relations.get(fplx_id, ()), key=str)
+        row = TermRow(
             fplx_id,
             *descriptions.get(fplx_id, (None, None)),  # splat operator * adds two columns at once
-            len(xrefs.get(fplx_id, [])),
-            len(synonyms.get(fplx_id, [])),
-            len(incoming_relations.get(fplx_id, [])),
-            len(outgoing_relations.get(fplx_id, [])),
+            len(term_xrefs),
+            len(term_synonyms),
+            len(term_incoming),
+            len(term_outgoing),
         )
-        for fplx_id in fplx_ids
-    ]
+        terms.append(row)
+        contexts[fplx_id] = dict(
+            row=row,
+            synonyms=term_synonyms,
+            xrefs=term_xrefs,
+            incoming_relations=term_incoming,
+            outgoing_relations=term_outgoing,
+            debug_links=debug_links,
+        )
+    click.echo(f'collected inputs in {time.perf_counter() - start:.2f}s')
 
-    terms_df = pd.DataFrame(rows, columns=[
-        'identifier', 'description_source', 'description_text', 'equivalences',
-        'synonyms', 'in_edges', 'out_edges',
-    ])
     index_html = index_template.render(
-        terms_df=terms_df,
+        terms=terms,
+        debug_links=debug_links,
     )
     with open(os.path.join(directory, 'index.html'), 'w') as file:
         print(index_html, file=file)
 
-    for _, row in tqdm(terms_df.iterrows(), total=len(terms_df.index), desc='writing terms'):
-        subdirectory = os.path.join(directory, row.identifier)
-        os.makedirs(subdirectory, exist_ok=True)
-        term_html = term_template.render(
-            row=row,
-            synonyms=synonyms[row.identifier],
-            xrefs=xrefs[row.identifier],
-            incoming_relations=incoming_relations[row.identifier],
-            outgoing_relations=outgoing_relations[row.identifier],
-            debug_links=debug_links,
-        )
-        with open(os.path.join(subdirectory, 'index.html'), 'w') as file:
-            print(term_html, file=file)
+    if table:
+        _write_table(terms, table)
+
+    render_start = time.perf_counter()
+    rendered, skipped = write_term_pages(contexts, directory, workers=workers, force=force)
+    end = time.perf_counter()
+    click.echo(
+        f'rendered {rendered} term pages and skipped {skipped} unchanged in '
+        f'{end - render_start:.2f}s, {end - start:.2f}s in total'
+    )
 
 
 if __name__ == '__main__':
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""Persistent cache of names and identifiers of terms cross-referenced by FamPlex."""
+
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from famplex.locations import CACHE_PATH
+
+__all__ = ['NameCache', 'NAME_CACHE_PATH']
+
+#: Default location of the SQLite database of names and identifiers
+NAME_CACHE_PATH = os.path.join(CACHE_PATH, 'names.sqlite')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS names (
+    namespace TEXT NOT NULL,
+    identifier TEXT NOT NULL,
+    name TEXT,
+    PRIMARY KEY (namespace, identifier)
+);
+CREATE TABLE IF NOT EXISTS identifiers (
+    namespace TEXT NOT NULL,
+    name TEXT NOT NULL,
+    identifier TEXT,
+    PRIMARY KEY (namespace, name)
+);
+'''
+
+Resolver = Callable[[str, str], Optional[str]]
+
+
+class NameCache:
+    """Names of terms by identifier and identifiers of terms by name, stored in SQLite.
+
+    The whole database is read into memory when the cache is opened, so lookups
+    are dictionary probes. Terms that are not cached are resolved with the given
+    functions, typically backed by INDRA or its web service, and the results are
+    written back to the database. Terms the resolvers find no name or identifier
+    for are cached as ``None`` so they are not looked up again.
+
+    :param path: Location of the SQLite database, created if it does not exist
+    :param get_name: Function resolving a namespace and identifier to a name
+    :param get_identifier: Function resolving a namespace and name to an identifier
+    :param offline: If true, never call the resolvers and raise :class:`LookupError`
+        on terms that are not cached
+    """
+
+    def __init__(
+        self,
+        path: str = NAME_CACHE_PATH,
+        get_name: Optional[Resolver] = None,
+        get_identifier: Optional[Resolver] = None,
+        offline: bool = False,
+    ):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.offline = offline
+        self._resolvers = {'names': get_name, 'identifiers': get_identifier}
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._values: Dict[str, Dict[Tuple[str, str], Optional[str]]] = {
+            'names': {
+                (namespace, identifier): name
+                for namespace, identifier, name in self._connection.execute(
+                    'SELECT namespace, identifier, name FROM names')
+            },
+            'identifiers': {
+                (namespace, name): identifier
+                for namespace, name, identifier in self._connection.execute(
+                    'SELECT namespace, name, identifier FROM identifiers')
+            },
+        }
+        self.hits = {'names': 0, 'identifiers': 0}
+        self.misses = {'names': 0, 'identifiers': 0}
+
+    def close(self) -> None:
+        """Close the database."""
+        self._connection.close()
+
+    def get_name(self, namespace: str, identifier: str) -> Optional[str]:
+        """Get the name of a term from its identifier."""
+        return self._get('names', namespace, identifier)
+
+    def get_identifier(self, namespace: str, name: str) -> Optional[str]:
+        """Get the identifier of a term from its name."""
+        return self._get('identifiers', namespace, name)
+
+    def prefetch(
+        self,
+        names: Iterable[Tuple[str, str]] = (),
+        identifiers: Iterable[Tuple[str, str]] = (),
+        workers: int = 16,
+        batch_size: int = 500,
+    ) -> Tuple[int, int]:
+        """Resolve all terms not yet cached concurrently and store them.
+
+        Results are written to the database in one transaction per batch, so an
+        interrupted prefetch keeps the terms resolved so far.
+
+        :param names: Pairs of namespace and identifier whose names are needed
+        :param identifiers: Pairs of namespace and name whose identifiers are needed
+        :param workers: Number of concurrent requests to the resolvers
+        :param batch_size: Number of terms resolved between writes to the database
+        :returns: Number of names and number of identifiers resolved
+        :raises LookupError: In offline mode, if any of the terms is not cached
+        """
+        counts = []
+        for table, keys in (('names', names), ('identifiers', identifiers)):
+            missing = sorted({key for key in keys if key not in self._values[table]})
+            if missing and self.offline:
+                raise LookupError(
+                    f'{len(missing)} {table} are not cached, for instance {missing[0]}, '
+                    f'and cannot be resolved offline'
+                )
+            resolver = self._resolvers[table]
+            if missing and resolver is None:
+                raise LookupError(f'no resolver given for {table}')
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for start in range(0, len(missing), batch_size):
+                    batch = missing[start:start + batch_size]
+                    values = list(executor.map(lambda key: resolver(*key), batch))
+                    self._store(table, zip(batch, values))
+            counts.append(len(missing))
+        return counts[0], counts[1]
+
+    def hit_rates(self) -> Dict[str, float]:
+        """Get the fraction of lookups of names and identifiers answered from the cache."""
+        return {
+            table: self.hits[table] / (self.hits[table] + self.misses[table])
+            if self.hits[table] + self.misses[table] else 0.0
+            for table in self.hits
+        }
+
+    def _get(self, table: str, namespace: str, key: str) -> Optional[str]:
+        values = self._values[table]
+        try:
+            value = values[namespace, key]
+        except KeyError:
+            pass
+        else:
+            self.hits[table] += 1
+            return value
+        self.misses[table] += 1
+        if self.offline:
+            raise LookupError(f'{table} of {namespace}:{key} is not cached and cannot be resolved offline')
+        resolver = self._resolvers[table]
+        if resolver is None:
+            raise LookupError(f'no resolver given for {table}')
+        value = resolver(namespace, key)
+        self._store(table, [((namespace, key), value)])
+        return value
+
+    def _store(self, table: str, items: Iterable[Tuple[Tuple[str, str], Optional[str]]]) -> None:
+        rows = [(namespace, key, value) for (namespace, key), value in items]
+        with self._lock, self._connection:
+            self._connection.executemany(f'INSERT OR REPLACE INTO {table} VALUES (?, ?, ?)', rows)
+            self._values[table].update(((namespace, key), value) for namespace, key, value in rows)
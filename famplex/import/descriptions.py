@@ -12,7 +12,7 @@ from more_click import verbose_option
 from tqdm import tqdm
 
 import pyobo
-from famplex.load import load_descriptions, load_entities, load_equivalences
+from famplex.bundle import get_bundle
 from famplex.locations import DESCRIPTIONS_PATH
 
 HERE = os.path.abspath(os.path.dirname(__file__))
@@ -39,12 +39,13 @@ def main(force: bool):
             tqdm.write(f'reloading {prefix}')
             pyobo.get_id_definition_mapping(prefix, force=True)
 
-    description_rows = [tuple(row) for row in load_descriptions()]
+    bundle = get_bundle()
+    description_rows = [tuple(row) for row in bundle.descriptions]
     descriptions = {e: d for e, _source, d in description_rows}
     xrefs = defaultdict(dict)
 
     unnorm = set()
-    for xref_ns, xref_id, fplx_id in load_equivalences():
+    for xref_ns, xref_id, fplx_id in bundle.equivalences:
         norm_xref_ns = bioregistry.normalize_prefix(xref_ns)
         if norm_xref_ns is None:
             if xref_ns not in unnorm:
@@ -53,8 +54,7 @@ def main(force: bool):
             continue
         xrefs[fplx_id][norm_xref_ns] = xref_id
 
-    entities = load_entities()
-    missing_description = set(entities) - set(descriptions)
+    missing_description = bundle.entity_set - set(descriptions)
     print(f'{len(descriptions)} have descriptions')
     print(f'{len(missing_description)} missing descriptions')
 
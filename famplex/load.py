@@ -1,12 +1,64 @@
 """Implements functions for loading resource files into datastructures."""
 import csv
-from typing import Dict, List, Optional, Tuple
+import itertools
+import sys
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from famplex.locations import ENTITIES_PATH, EQUIVALENCES_PATH, \
     GROUNDING_MAP_PATH, RELATIONS_PATH, GENE_PREFIXES_PATH, DESCRIPTIONS_PATH
 
 
 __all__ = ['load_grounding_map', 'load_equivalences', 'load_entities',
-           'load_relations', 'load_gene_prefixes', 'load_descriptions']
+           'load_relations', 'load_gene_prefixes', 'load_descriptions',
+           'Relation', 'Equivalence', 'Description']
+
+
+Relation = namedtuple('Relation', ['namespace1', 'id1', 'relation',
+                                   'namespace2', 'id2'])
+Relation.__doc__ = """A row of relations.csv"""
+
+Equivalence = namedtuple('Equivalence', ['namespace', 'id', 'fplx_id'])
+Equivalence.__doc__ = """A row of equivalences.csv"""
+
+Description = namedtuple('Description', ['fplx_id', 'source', 'text'])
+Description.__doc__ = """A row of descriptions.csv"""
+
+# Strings such as namespaces, relation types and FamPlex IDs are repeated
+# across many rows and files. Interning them means each is stored once and
+# that dictionary lookups keyed on them can compare by identity.
+_intern = sys.intern
+
+
+def _iter_csv(filename: str) -> Iterator[List[str]]:
+    """Stream the rows of a famplex csv file
+
+    Lines are read one at a time. Lines without quotes, which make up all
+    of relations.csv and equivalences.csv, are split on commas directly,
+    which is considerably faster than going through the csv module. From
+    the first line containing a quote onwards, the rest of the file is
+    parsed by the csv module since quoted fields may span lines.
+
+    Parameters
+    ----------
+    filename : str
+
+    Returns
+    -------
+    iterator
+        Iterator over the rows of the file, each a list of strings.
+    """
+    with open(filename, newline='') as f:
+        for line in f:
+            if '"' in line:
+                yield from csv.reader(itertools.chain([line], f),
+                                      delimiter=str(u','),
+                                      lineterminator='\r\n',
+                                      quoting=csv.QUOTE_MINIMAL,
+                                      quotechar=str(u'"'))
+                return
+            line = line.rstrip('\r\n')
+            if line:
+                yield line.split(',')
 
 
 def _load_csv(filename):
@@ -20,13 +72,7 @@ def _load_csv(filename):
     -------
     rows : list
     """
-    with open(filename) as f:
-        csvreader = csv.reader(f, delimiter=str(u','),
-                               lineterminator='\r\n',
-                               quoting=csv.QUOTE_MINIMAL,
-                               quotechar=str(u'"'))
-        rows = [row for row in csvreader]
-    return rows
+    return list(_iter_csv(filename))
 
 
 def _construct_grounding_map(rows):
@@ -51,7 +97,9 @@ def _construct_grounding_map(rows):
     for row in rows:
         text = row[0]
         db_refs = {'TEXT': text}
-        db_refs.update({ns: id_ for ns, id_ in zip(row[1::2], row[2::2]) if ns})
+        for ns, id_ in zip(row[1::2], row[2::2]):
+            if ns:
+                db_refs[_intern(ns)] = id_
         gmap[text] = db_refs if len(db_refs) > 1 else None
     return gmap
 
@@ -64,21 +112,23 @@ def load_grounding_map() -> Dict[str, Optional[Dict[str, str]]]:
     dict
         A dictionary mapping agent texts to INDRA style db_refs dictionaries.
     """
-    rows = _load_csv(GROUNDING_MAP_PATH)
-    return _construct_grounding_map(rows)
+    return _construct_grounding_map(_iter_csv(GROUNDING_MAP_PATH))
 
 
-def load_equivalences() -> List[Tuple[str, str, str]]:
+def load_equivalences() -> List[Equivalence]:
     """Returns FamPlex equivalences as a list of rows.
 
     Returns
     -------
     list
-        List of lists corresponding to rows from equivalences.csv. Each row
-        contains three entries. A namespace, an ID, and a FamPlex ID. For
-        example ['BEL', 'AMP Activated Protein Kinase Complex', 'AMPK'].
+        List of :class:`Equivalence` tuples corresponding to rows from
+        equivalences.csv. Each row contains three entries. A namespace, an
+        ID, and a FamPlex ID. For example
+        ('BEL', 'AMP Activated Protein Kinase Complex', 'AMPK').
     """
-    return _load_csv(EQUIVALENCES_PATH)
+    make = Equivalence._make
+    return [make((_intern(ns), id_, _intern(fplx_id)))
+            for ns, id_, fplx_id in _iter_csv(EQUIVALENCES_PATH)]
 
 
 def load_entities() -> List[str]:
@@ -89,21 +139,22 @@ def load_entities() -> List[str]:
     list
         A list of all FamPlex unique IDs sorted in Unix standard sorted order.
     """
-    rows = _load_csv(ENTITIES_PATH)
-    return [row[0] for row in rows]
+    return [_intern(row[0]) for row in _iter_csv(ENTITIES_PATH)]
 
 
-def load_relations() -> List[Tuple[str, str, str, str, str]]:
+def load_relations() -> List[Relation]:
     """Returns FamPlex relations as a list of rows
 
     Returns
     -------
     list
-        List of lists corresponding to rows in relations.csv. Each row has
-        five columns of the form [namespace1, id1, relation, namespace2, id2].
-        For example ['FPLX', 'AMPK_alpha', 'partof', 'FPLX', 'AMPK'].
+        List of :class:`Relation` tuples corresponding to rows in
+        relations.csv. Each row has five columns of the form
+        (namespace1, id1, relation, namespace2, id2). For example
+        ('FPLX', 'AMPK_alpha', 'partof', 'FPLX', 'AMPK').
     """
-    return _load_csv(RELATIONS_PATH)
+    make = Relation._make
+    return [make(map(_intern, row)) for row in _iter_csv(RELATIONS_PATH)]
 
 
 def load_gene_prefixes() -> List[Tuple[str, str, str]]:
@@ -118,6 +169,15 @@ def load_gene_prefixes() -> List[Tuple[str, str, str]]:
     return _load_csv(GENE_PREFIXES_PATH)
 
 
-def load_descriptions() -> List[Tuple[str, str, str]]:
-    """Returns FamPlex descriptions as a list of rows"""
-    return _load_csv(DESCRIPTIONS_PATH)
+def load_descriptions() -> List[Description]:
+    """Returns FamPlex descriptions as a list of rows
+
+    Returns
+    -------
+    list
+        List of :class:`Description` tuples corresponding to rows in
+        descriptions.csv, each of the form (fplx_id, source, text).
+    """
+    make = Description._make
+    return [make((_intern(fplx_id), source, text))
+            for fplx_id, source, text in _iter_csv(DESCRIPTIONS_PATH)]
@@ -4,6 +4,12 @@ import os
 FPLX_PATH = os.path.dirname(os.path.abspath(__file__))
 RESOURCES_PATH = os.path.join(FPLX_PATH, 'resources')
 EXPORT_PATH = os.path.join(FPLX_PATH, 'export')
+# Directory for snapshots of the parsed FamPlex graph. Can be overridden
+# with the FAMPLEX_CACHE_PATH environment variable. Snapshots are unpickled
+# when loaded, so this directory must be trusted.
+CACHE_PATH = os.environ.get(
+    'FAMPLEX_CACHE_PATH',
+    os.path.join(os.path.expanduser('~'), '.cache', 'famplex'))
 
 # Paths to resources
 ENTITIES_PATH = os.path.join(RESOURCES_PATH, 'entities.csv')
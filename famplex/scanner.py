@@ -0,0 +1,166 @@
+"""Find mentions of FamPlex grounding map texts in raw text."""
+from collections import deque, namedtuple
+from typing import Dict, Iterable, List, Optional
+
+from famplex.bundle import get_bundle
+
+__all__ = ['Mention', 'MentionScanner']
+
+
+Mention = namedtuple('Mention', ['start', 'end', 'text', 'db_refs'])
+Mention.__doc__ = """A span of a document matching a grounding map text
+
+Attributes
+----------
+start : int
+    Index of the first character of the span.
+end : int
+    Index one past the last character of the span.
+text : str
+    The matched text, equal to document[start:end].
+db_refs : dict
+    INDRA style db_refs dictionary for the text.
+"""
+
+
+class MentionScanner(object):
+    """Multi-pattern scanner over the texts of the FamPlex grounding map
+
+    All texts are compiled into a single Aho-Corasick automaton so that a
+    document is scanned in one pass, independent of the number of texts.
+    Patterns are the texts of the grounding map that have a grounding,
+    plus the name of every FamPlex entity with underscores replaced by
+    hyphens, as in the REACH groundings export, when that is not already a
+    text in the grounding map.
+
+    Matching is case sensitive, as is the grounding map. A match must not
+    be immediately preceded or followed by a letter or digit, so 'AKT' is
+    not found inside 'AKT1'. Overlapping matches are resolved by taking the
+    leftmost match first and, among matches starting at the same position,
+    the longest.
+
+    Parameters
+    ----------
+    grounding_map : Optional[dict]
+        Dictionary mapping texts to INDRA style db_refs dictionaries, as
+        returned by :func:`famplex.load.load_grounding_map`. If None, the
+        FamPlex grounding map is loaded. Default: None
+    entities : Optional[list]
+        FamPlex IDs whose hyphenated names are added as patterns. If None,
+        all FamPlex entities are used. Default: None
+    """
+    def __init__(self,
+                 grounding_map:
+                 Optional[Dict[str, Optional[Dict[str, str]]]] = None,
+                 entities: Optional[Iterable[str]] = None):
+        if grounding_map is None:
+            grounding_map = get_bundle().grounding_map
+        if entities is None:
+            entities = get_bundle().entities
+        patterns = {text: db_refs for text, db_refs in grounding_map.items()
+                    if db_refs is not None}
+        for entity in entities:
+            entity_text = entity.replace('_', '-')
+            if entity_text not in grounding_map:
+                patterns[entity_text] = {'TEXT': entity_text,
+                                         'FPLX': entity}
+        # The automaton is stored as parallel lists indexed by state.
+        # State 0 is the root. For each state, goto maps characters to
+        # states, fail is the failure link, length is the length of the
+        # pattern ending at the state or 0, and output links to the nearest
+        # state along failure links at which a pattern ends.
+        goto: List[Dict[str, int]] = [{}]
+        length = [0]
+        self._db_refs: Dict[str, Dict[str, str]] = {}
+        for text, db_refs in patterns.items():
+            if not text:
+                continue
+            state = 0
+            for char in text:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    length.append(0)
+                state = next_state
+            length[state] = len(text)
+            self._db_refs[text] = db_refs
+        fail = [0] * len(goto)
+        output = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                link = fail[state]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                link = goto[link].get(char, 0)
+                fail[next_state] = link
+                output[next_state] = link if length[link] else output[link]
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+        self._length = length
+
+    def __len__(self) -> int:
+        return len(self._db_refs)
+
+    def scan(self, document: str) -> List[Mention]:
+        """Return all non-overlapping mentions of patterns in a document
+
+        Parameters
+        ----------
+        document : str
+            Text to scan.
+
+        Returns
+        -------
+        list
+            List of :class:`Mention` ordered by position in the document.
+        """
+        goto, fail, output, length = \
+            self._goto, self._fail, self._output, self._length
+        # Longest match starting at each position, as its end position
+        longest: Dict[int, int] = {}
+        state = 0
+        for i, char in enumerate(document):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            end = i + 1
+            if end < len(document) and document[end].isalnum():
+                continue
+            match = state if length[state] else output[state]
+            while match:
+                start = end - length[match]
+                if (start == 0 or not document[start - 1].isalnum()) and \
+                        longest.get(start, 0) < end:
+                    longest[start] = end
+                match = output[match]
+        mentions = []
+        position = 0
+        for start in sorted(longest):
+            if start < position:
+                continue
+            end = longest[start]
+            text = document[start:end]
+            mentions.append(Mention(start, end, text, self._db_refs[text]))
+            position = end
+        return mentions
+
+    def scan_many(self, documents: Iterable[str]) -> List[List[Mention]]:
+        """Scan each of many documents
+
+        Parameters
+        ----------
+        documents : iterable
+            Texts to scan.
+
+        Returns
+        -------
+        list
+            List containing the result of :meth:`scan` for each document.
+        """
+        return [self.scan(document) for document in documents]
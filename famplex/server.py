@@ -0,0 +1,362 @@
+"""Serve queries to the FamPlex ontology over HTTP.
+
+Start the server with::
+
+    $ python -m famplex.server --host 127.0.0.1 --port 8000
+
+Each endpoint corresponds to a function of :mod:`famplex.api` and takes its
+arguments as query parameters. Terms are given by namespace and id, pairs
+of terms by namespace1, id1, namespace2 and id2, and relation types as a
+comma separated list. For example::
+
+    GET /parent_terms?namespace=HGNC&id=BRAF
+    GET /ancestral_terms?namespace=HGNC&id=BRAF&relation_types=isa
+    GET /isa?namespace1=HGNC&id1=BRAF&namespace2=FPLX&id2=RAF
+    GET /equivalences?fplx_id=AMPK
+    GET /ground?text=Erk
+
+Responses are JSON objects with the value returned by the function under
+the key "result", or a message under the key "error" with status 400 if the
+query is invalid, for instance if a term is not in FamPlex. Batch
+endpoints take a JSON object with a list of parameter objects under the key
+"queries" and return a list of results in the same order, each of the form
+{"result": ...} or {"error": ...}::
+
+    POST /batch/isa
+    {"queries": [{"namespace1": "HGNC", "id1": "BRAF",
+                  "namespace2": "FPLX", "id2": "RAF"}, ...]}
+
+Connections are kept alive between requests unless the client asks for them
+to be closed. Responses to GET requests are cached until the graph is
+reloaded with :func:`famplex.api.reload`.
+"""
+import argparse
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from famplex import api
+from famplex.graph import CacheInfo, FamplexGraph
+from famplex.grounding import GroundingIndex
+
+__all__ = ['FamplexServer', 'ENDPOINTS', 'serve']
+
+# Maximum size of a request body in bytes.
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 413: 'Payload Too Large'}
+
+
+def _relation_types(params: Mapping[str, Any]) -> Optional[List[str]]:
+    relation_types = params.get('relation_types')
+    if relation_types is None or isinstance(relation_types, list):
+        return relation_types
+    return relation_types.split(',')
+
+
+def _check_params(params: Any) -> None:
+    """Raise TypeError unless batch query parameters have valid types
+
+    Parameters of batch queries come from JSON and can be of any type.
+    relation_types can also be a list of strings and normalize a boolean,
+    all other parameters must be strings.
+    """
+    if not isinstance(params, dict):
+        raise TypeError('Query must be a JSON object.')
+    for name, value in params.items():
+        if isinstance(value, str):
+            continue
+        if name == 'relation_types' and isinstance(value, list) and \
+                all(isinstance(rel, str) for rel in value):
+            continue
+        if name == 'normalize' and isinstance(value, bool):
+            continue
+        raise TypeError('Parameter %s has an invalid type.' % name)
+
+
+def _pair(params: Mapping[str, Any]) -> Tuple[str, str, str, str]:
+    return (params['namespace1'], params['id1'],
+            params['namespace2'], params['id2'])
+
+
+ENDPOINTS: Dict[str, Callable[[Mapping[str, Any]], Any]] = {
+    'in_famplex': lambda p: api.in_famplex(p['namespace'], p['id']),
+    'parent_terms': lambda p: api.parent_terms(p['namespace'], p['id'],
+                                               _relation_types(p)),
+    'child_terms': lambda p: api.child_terms(p['namespace'], p['id'],
+                                             _relation_types(p)),
+    'ancestral_terms': lambda p: api.ancestral_terms(p['namespace'],
+                                                     p['id'],
+                                                     _relation_types(p)),
+    'descendant_terms': lambda p: api.descendant_terms(p['namespace'],
+                                                       p['id'],
+                                                       _relation_types(p)),
+    'isa': lambda p: api.isa(*_pair(p)),
+    'partof': lambda p: api.partof(*_pair(p)),
+    'refinement_of': lambda p: api.refinement_of(*_pair(p)),
+    'equivalences': lambda p: api.equivalences(p['fplx_id']),
+    'reverse_equivalences': lambda p: api.reverse_equivalences(
+        p['namespace'], p['id']),
+}
+"""Functions answering queries to each endpoint, given the parameters"""
+
+
+class _ResponseCache(object):
+    """Least recently used cache of responses keyed by request target"""
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: 'OrderedDict[str, Tuple[int, bytes]]' = OrderedDict()
+
+    def get(self, target: str) -> Optional[Tuple[int, bytes]]:
+        response = self._data.get(target)
+        if response is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(target)
+        return response
+
+    def put(self, target: str, response: Tuple[int, bytes]) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[target] = response
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self._data))
+
+
+class FamplexServer(object):
+    """Asynchronous HTTP server answering queries with :mod:`famplex.api`
+
+    Queries are answered directly in the event loop since lookups in the
+    in-memory graph are fast. Use :meth:`handle_request` to answer a
+    request without going through a socket.
+
+    Parameters
+    ----------
+    cache_size : Optional[int]
+        Maximum number of responses to GET requests to keep. Least recently
+        used responses are evicted first. Default: 4096
+    """
+    def __init__(self, cache_size: int = 4096):
+        self._cache = _ResponseCache(cache_size)
+        self._graph: Optional[FamplexGraph] = None
+        self._grounding_index: Optional[GroundingIndex] = None
+        self._endpoints = dict(ENDPOINTS)
+        self._endpoints['ground'] = self._ground
+
+    def cache_info(self) -> CacheInfo:
+        """Return statistics for the cache of responses
+
+        Returns
+        -------
+        CacheInfo
+            Named tuple with fields hits, misses, maxsize and currsize.
+        """
+        return self._cache.info()
+
+    def handle_request(self, method: str, target: str,
+                       body: bytes = b'') -> Tuple[int, bytes]:
+        """Answer a request
+
+        Parameters
+        ----------
+        method : str
+            HTTP method, GET or POST.
+        target : str
+            Request target, the path and query string of the URL.
+        body : Optional[bytes]
+            Body of a POST request. Default: b''
+
+        Returns
+        -------
+        tuple
+            HTTP status code and JSON encoded response body.
+        """
+        graph = api._get_graph()
+        if graph is not self._graph:
+            # The graph was reloaded so cached responses may be stale.
+            self._cache.clear()
+            self._grounding_index = None
+            self._graph = graph
+        if method == 'GET':
+            response = self._cache.get(target)
+            if response is None:
+                response = self._handle_get(target)
+                if response[0] == 200:
+                    self._cache.put(target, response)
+            return response
+        if method == 'POST':
+            return self._handle_batch(target, body)
+        return 405, _encode({'error': 'Method not allowed.'})
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Answer requests on a connection until it is closed"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, version = \
+                        request_line.decode('latin-1').split()
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError
+                except ValueError:
+                    writer.write(_response('HTTP/1.1', 400, _encode(
+                        {'error': 'Malformed request.'}), False))
+                    await writer.drain()
+                    break
+                if length > MAX_BODY_SIZE:
+                    status, body = 413, _encode({'error':
+                                                 'Request is too large.'})
+                    keep_alive = False
+                else:
+                    request_body = \
+                        await reader.readexactly(length) if length else b''
+                    status, body = self.handle_request(method, target,
+                                                       request_body)
+                    connection = headers.get('connection', '').lower()
+                    if version == 'HTTP/1.0':
+                        keep_alive = connection == 'keep-alive'
+                    else:
+                        keep_alive = connection != 'close'
+                writer.write(_response(version, status, body, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _handle_get(self, target: str) -> Tuple[int, bytes]:
+        url = urlsplit(target)
+        endpoint = self._endpoints.get(url.path.strip('/'))
+        if endpoint is None:
+            return 404, _encode({'error': 'Unknown endpoint.'})
+        try:
+            result = endpoint(dict(parse_qsl(url.query)))
+        except KeyError as err:
+            return 400, _encode({'error': 'Missing parameter %s.' % err})
+        except ValueError as err:
+            return 400, _encode({'error': str(err)})
+        return 200, _encode({'result': result})
+
+    def _handle_batch(self, target: str, body: bytes) -> Tuple[int, bytes]:
+        path = urlsplit(target).path.strip('/')
+        if not path.startswith('batch/'):
+            return 404, _encode({'error': 'Unknown endpoint.'})
+        endpoint = self._endpoints.get(path[len('batch/'):])
+        if endpoint is None:
+            return 404, _encode({'error': 'Unknown endpoint.'})
+        try:
+            queries = json.loads(body.decode('utf-8'))['queries']
+            if not isinstance(queries, list):
+                raise TypeError
+        except (ValueError, KeyError, TypeError):
+            return 400, _encode({'error': 'Request body must be a JSON '
+                                          'object with a list of queries.'})
+        results = []
+        for params in queries:
+            try:
+                _check_params(params)
+                results.append({'result': endpoint(params)})
+            except KeyError as err:
+                results.append({'error': 'Missing parameter %s.' % err})
+            except (ValueError, TypeError) as err:
+                results.append({'error': str(err)})
+        return 200, _encode({'results': results})
+
+    def _ground(self, params: Mapping[str, Any]) -> Optional[Dict[str, str]]:
+        if self._grounding_index is None:
+            self._grounding_index = GroundingIndex()
+        normalize = params.get('normalize', True)
+        if isinstance(normalize, str):
+            normalize = normalize.lower() not in ('false', '0')
+        return self._grounding_index.lookup(params['text'], normalize)
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value).encode('utf-8')
+
+
+def _response(version: str, status: int, body: bytes,
+              keep_alive: bool) -> bytes:
+    return (b'%s %d %s\r\nContent-Type: application/json'
+            b'\r\nContent-Length: %d\r\nConnection: %s\r\n\r\n%s' %
+            (version.encode('latin-1'), status,
+             _REASONS[status].encode('latin-1'), len(body),
+             b'keep-alive' if keep_alive else b'close', body))
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8000,
+                cache_size: int = 4096) -> Any:
+    """Start serving queries to FamPlex
+
+    The graph is loaded before the server starts accepting connections.
+
+    Parameters
+    ----------
+    host : Optional[str]
+        Address to listen on. Default: '127.0.0.1'
+    port : Optional[int]
+        Port to listen on. Default: 8000
+    cache_size : Optional[int]
+        See :class:`FamplexServer`. Default: 4096
+
+    Returns
+    -------
+    asyncio.AbstractServer
+        The running server. Close it to stop serving.
+    """
+    api.preload()
+    server = FamplexServer(cache_size=cache_size)
+    return await asyncio.start_server(server.handle_connection, host, port)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Serve queries to the FamPlex ontology over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--cache-size', type=int, default=4096)
+    args = parser.parse_args()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    server = loop.run_until_complete(serve(args.host, args.port,
+                                           args.cache_size))
+    print('Serving FamPlex on http://%s:%d' % (args.host, args.port))
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+
+
+if __name__ == '__main__':
+    main()
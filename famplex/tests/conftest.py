@@ -0,0 +1,21 @@
+import os
+
+import pytest
+
+import famplex.graph
+
+
+@pytest.fixture(scope='session', autouse=True)
+def cache_path(tmp_path_factory):
+    """Keep snapshots written by the tests out of the user's cache"""
+    path = str(tmp_path_factory.mktemp('famplex_cache'))
+    old_path, old_environ = famplex.graph.CACHE_PATH, \
+        os.environ.get('FAMPLEX_CACHE_PATH')
+    famplex.graph.CACHE_PATH = path
+    os.environ['FAMPLEX_CACHE_PATH'] = path
+    yield path
+    famplex.graph.CACHE_PATH = old_path
+    if old_environ is None:
+        del os.environ['FAMPLEX_CACHE_PATH']
+    else:
+        os.environ['FAMPLEX_CACHE_PATH'] = old_environ
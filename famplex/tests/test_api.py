@@ -1,9 +1,16 @@
+import threading
+
 import pytest
 
+import famplex.api
+import famplex.graph
 from famplex import child_terms, parent_terms, ancestral_terms, \
     descendant_terms, individual_members, isa, partof, refinement_of, \
     dict_representation, equivalences, reverse_equivalences, in_famplex, \
-    root_terms
+    root_terms, refinement_of_many, flat_dict_representation, \
+    iter_ancestral_terms, iter_descendant_terms, iter_individual_members, \
+    in_famplex_many, lowest_common_ancestors, lowest_common_ancestors_many, \
+    covering_terms
 
 
 @pytest.mark.parametrize('test_input,expected',
@@ -20,6 +27,21 @@ def test_in_famplex(test_input, expected):
     assert in_famplex(*test_input) == expected
 
 
+def test_in_famplex_many():
+    terms = [('FPLX', 'AMPK'), ('HGNC', 'AKT1'), ('HGNC', 'GENE'),
+             ('UP', 'AKT1'), ('FPLX', 'Protease')]
+    namespaces, ids = zip(*terms)
+    assert in_famplex_many(namespaces, ids) == [True, True, False, False,
+                                                True]
+    assert in_famplex_many(iter(namespaces), iter(ids)) == \
+        [in_famplex(*term) for term in terms]
+    assert in_famplex_many([], []) == []
+    with pytest.raises(ValueError):
+        in_famplex_many(['HGNC', 'HGNC'], ['BRAF'])
+    with pytest.raises(ValueError):
+        in_famplex_many(iter(['HGNC']), iter(['BRAF', 'RAF1']))
+
+
 @pytest.mark.parametrize('test_input,expected',
                          [(('HGNC', 'ESR1'), [('FPLX', 'ESR')]),
                           (('FPLX', 'ESR'), [('FPLX', 'ESR')]),
@@ -149,6 +171,20 @@ def test_ancestral_terms(test_input, rel_types, expected):
                            relation_types=rel_types) == expected
 
 
+def test_ancestral_terms_cached():
+    famplex.api.clear_cache()
+    terms = ancestral_terms('HGNC', 'PRKAA1')
+    info = famplex.api.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (0, 1, 1)
+    terms.append(('FPLX', 'ESR'))
+    assert ancestral_terms('HGNC', 'PRKAA1') == terms[:-1]
+    assert famplex.api.cache_info().hits == 1
+    ancestral_terms('HGNC', 'PRKAA1', relation_types=['isa'])
+    assert famplex.api.cache_info().currsize == 2
+    famplex.api.clear_cache()
+    assert famplex.api.cache_info() == (0, 0, info.maxsize, 0)
+
+
 def test_ancestral_terms_raises():
     with pytest.raises(ValueError):
         ancestral_terms('HGNC', 'GENE')
@@ -244,6 +280,28 @@ def test_individual_members_raises():
         individual_members('FPLX', 'Complex')
 
 
+@pytest.mark.parametrize('test_input',
+                         [('FPLX', 'AMPK'), ('HGNC', 'PRKAA1'),
+                          ('FPLX', 'Protease')])
+@pytest.mark.parametrize('rel_types', [None, ['isa'], ['partof']])
+def test_iter_terms(test_input, rel_types):
+    assert list(iter_ancestral_terms(*test_input, rel_types)) == \
+        ancestral_terms(*test_input, rel_types)
+    assert list(iter_descendant_terms(*test_input, rel_types)) == \
+        descendant_terms(*test_input, rel_types)
+    assert sorted(iter_individual_members(*test_input, rel_types),
+                  key=lambda x: (x[0].lower(), x[1].lower())) == \
+        individual_members(*test_input, rel_types)
+
+
+@pytest.mark.parametrize('function', [iter_ancestral_terms,
+                                      iter_descendant_terms,
+                                      iter_individual_members])
+def test_iter_terms_raises(function):
+    with pytest.raises(ValueError):
+        function('HGNC', 'GENE')
+
+
 @pytest.mark.parametrize('test_input,expected',
                          [(('HGNC', 'ESR1', 'FPLX', 'ESR'), True),
                           (('FPLX', 'ESR', 'HGNC', 'ESR1'), False),
@@ -292,6 +350,59 @@ def test_refinement_of(test_input, expected):
     assert refinement_of(*test_input) == expected
 
 
+def test_refinement_of_many():
+    pairs = [('HGNC', 'ESR1', 'FPLX', 'ESR'),
+             ('FPLX', 'ESR', 'HGNC', 'ESR1'),
+             ('HGNC', 'PRKAA1', 'FPLX', 'AMPK'),
+             ('HGNC', 'PRKAA1', 'FPLX', 'AMPK_alpha'),
+             ('HGNC', 'PRKAA1', 'FPLX', 'AMPK_beta'),
+             ('HGNC', 'GENE', 'FPLX', 'MEK')]
+    assert refinement_of_many(pairs) == [refinement_of(*pair)
+                                         for pair in pairs]
+    assert refinement_of_many([]) == []
+
+
+@pytest.mark.parametrize('test_input,rel_types,expected',
+                         [([('HGNC', 'PRKAA1'), ('HGNC', 'PRKAA2')], None,
+                           [('FPLX', 'AMPK_alpha')]),
+                          ([('HGNC', 'MAPK1'), ('HGNC', 'MAPK3')], None,
+                           [('FPLX', 'ERK')]),
+                          ([('HGNC', 'MAPK1'), ('FPLX', 'ERK')], None,
+                           [('FPLX', 'ERK')]),
+                          ([('HGNC', 'PRKAA1'), ('HGNC', 'PRKAB1')], None,
+                           [('FPLX', 'AMPK_A1B1G1'), ('FPLX', 'AMPK_A1B1G2'),
+                            ('FPLX', 'AMPK_A1B1G3')]),
+                          ([('HGNC', 'PRKAA1'), ('HGNC', 'PRKAB1')], ['isa'],
+                           []),
+                          ([('HGNC', 'ESR1'), ('FPLX', 'AMPK')], None, []),
+                          ([('HGNC', 'ESR1')], None, [('HGNC', 'ESR1')]),
+                          ([], None, [])])
+def test_lowest_common_ancestors(test_input, rel_types, expected):
+    assert lowest_common_ancestors(test_input, rel_types) == expected
+
+
+def test_lowest_common_ancestors_many():
+    term_sets = [[('HGNC', 'PRKAA1'), ('HGNC', 'PRKAA2')],
+                 [('HGNC', 'PRKAA1'), ('HGNC', 'PRKAB1')],
+                 [('HGNC', 'ESR1'), ('HGNC', 'ESR2')], []]
+    assert lowest_common_ancestors_many(term_sets) == \
+        [lowest_common_ancestors(terms) for terms in term_sets]
+    with pytest.raises(ValueError):
+        lowest_common_ancestors_many([[('HGNC', 'ESR1'), ('HGNC', 'GENE')]])
+
+
+def test_covering_terms():
+    assert covering_terms([('HGNC', 'MAPK1'), ('HGNC', 'MAPK3')]) == \
+        [(('FPLX', 'ERK'), 1.0)]
+    assert covering_terms([('HGNC', 'PRKAA1'), ('HGNC', 'PRKAA2'),
+                           ('HGNC', 'GENE')]) == \
+        [(('FPLX', 'AMPK_alpha'), 2 / 3)]
+    assert covering_terms([('HGNC', 'MAPK1'), ('HGNC', 'MAPK3')],
+                          min_jaccard=0.2)[1][0] == ('FPLX', 'MAPK')
+    assert covering_terms([('HGNC', 'GENE')]) == []
+    assert covering_terms([]) == []
+
+
 @pytest.mark.parametrize('test_input,expected',
                          # Estrogen Receptor Family
                          [(('FPLX', 'ESR'),
@@ -325,6 +436,28 @@ def test_dict_representation_raises():
         dict_representation('FPLX', 'Complex')
 
 
+def test_dict_representation_shares_subtrees():
+    out = dict_representation('FPLX', 'AMPK')
+    subunits = {}
+    for complex_, _ in out[('FPLX', 'AMPK')]:
+        for (node, children) in complex_.items():
+            for subtree, _ in children:
+                key, = subtree.keys()
+                assert subunits.setdefault(key, subtree) is subtree
+
+
+def test_flat_dict_representation():
+    assert flat_dict_representation('FPLX', 'ESR') == \
+        {'FPLX:ESR': [['HGNC:ESR1', 'isa'], ['HGNC:ESR2', 'isa']],
+         'HGNC:ESR1': [], 'HGNC:ESR2': []}
+    flat = flat_dict_representation('FPLX', 'MAP2K')
+    assert flat['FPLX:MEK'] == [['HGNC:MAP2K1', 'isa'],
+                                ['HGNC:MAP2K2', 'isa']]
+    assert len(flat) == 9
+    with pytest.raises(ValueError):
+        flat_dict_representation('FPLX', 'Complex')
+
+
 def test_equivalences():
     expected = [('MESH', 'D011948'), ('NCIT', 'C17065')]
     assert set(expected) <= set(equivalences('TCR'))
@@ -343,3 +476,47 @@ def test_equivalences_raises():
                           (('MESH', 'D000067496'), [])])
 def test_reverse_equivalences(test_input, expected):
     assert reverse_equivalences(*test_input) == expected
+
+
+def test_preload():
+    famplex.api.preload()
+    graph = famplex.api._famplex_graph
+    assert graph is not None
+    famplex.api.preload()
+    assert famplex.api._famplex_graph is graph
+
+
+def test_reload():
+    famplex.api.preload()
+    graph = famplex.api._famplex_graph
+    info = famplex.api.reload()
+    assert not info.reloaded
+    assert famplex.api._famplex_graph is graph
+    info = famplex.api.reload(force=True)
+    assert info.reloaded and info.duration > 0
+    assert famplex.api._famplex_graph is not graph
+    assert info.resource_hash == famplex.graph.resource_hash()
+    assert isa('HGNC', 'BRAF', 'FPLX', 'RAF')
+
+
+def test_resources_changed(monkeypatch):
+    famplex.api.preload()
+    assert not famplex.api.resources_changed()
+    stat, hash_ = famplex.api._graph_resources
+    # Touched but unchanged files are not reported
+    monkeypatch.setattr(famplex.api, '_graph_resources', ((), hash_))
+    assert not famplex.api.resources_changed()
+    monkeypatch.setattr(famplex.api, '_graph_resources', ((), 'x'))
+    assert famplex.api.resources_changed()
+
+
+def test_watch_resources(monkeypatch):
+    famplex.api.preload()
+    monkeypatch.setattr(famplex.api, 'resources_changed', lambda: True)
+    reloaded = threading.Event()
+    stop = famplex.api.watch_resources(
+        interval=0.01, callback=lambda info: reloaded.set())
+    try:
+        assert reloaded.wait(10)
+    finally:
+        stop.set()
@@ -0,0 +1,31 @@
+from famplex.bundle import ResourceBundle, get_bundle
+from famplex.load import Relation
+
+
+def test_get_bundle_shared():
+    assert get_bundle() is get_bundle()
+
+
+def test_lazy_loading():
+    bundle = ResourceBundle()
+    assert 'relations' not in bundle.__dict__
+    relations = bundle.relations
+    assert bundle.relations is relations
+    assert 'equivalences' not in bundle.__dict__
+    bundle.clear()
+    assert 'relations' not in bundle.__dict__
+    assert bundle.relations == relations
+
+
+def test_indexes():
+    bundle = ResourceBundle()
+    assert 'AMPK' in bundle.entity_set
+    relation = Relation('FPLX', 'AMPK_alpha', 'partof', 'FPLX', 'AMPK')
+    assert relation in bundle.relations_by_subject[('FPLX', 'AMPK_alpha')]
+    assert relation in bundle.relations_by_object[('FPLX', 'AMPK')]
+    assert all(row.fplx_id == 'AMPK'
+               for row in bundle.equivalences_by_fplx_id['AMPK'])
+    assert 'AMPK' in bundle.equivalences_by_xref[
+        ('BEL', 'AMP Activated Protein Kinase Complex')]
+    assert bundle.descriptions_by_fplx_id['ACAD'].source == 'mesh:D042964'
+    assert 'ERK' in bundle.synonyms_by_fplx_id['ERK']
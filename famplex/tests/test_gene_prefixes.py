@@ -0,0 +1,78 @@
+import pytest
+
+from famplex.gene_prefixes import GeneMention, GenePrefixMatcher
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return GenePrefixMatcher()
+
+
+@pytest.mark.parametrize('text,gene,patterns',
+                         [('KRAS', 'KRAS', []),
+                          ('Flag-AKT1', 'AKT1', ['Flag-{Gene name}']),
+                          ('Lenti-AKT1', 'AKT1', ['Lenti-{Gene name}']),
+                          ('AKT1 protein', 'AKT1', ['{Gene name} protein']),
+                          ('Myr-Flag-Akt1', 'Akt1',
+                           ['Myr-{Gene name}', 'Flag-{Gene name}']),
+                          ('GFP-KRAS-G12V', 'KRAS',
+                           ['GFP-{Gene name}', '{Gene name}-{mutation}']),
+                          ('shAKT1 knockdown', 'AKT1',
+                           ['sh{Gene name}', '{Gene name} knockdown']),
+                          ('pERK', 'ERK', ['p{Gene name}']),
+                          ('p53', 'p53', []),
+                          ('Ad-p53', 'p53', ['Ad-{Gene name}']),
+                          ('Flag-53BP1', '53BP1', ['Flag-{Gene name}'])])
+def test_match(matcher, text, gene, patterns):
+    mention = matcher.match(text)
+    assert mention.text == text
+    assert mention.gene == gene
+    assert [pattern for pattern, _ in mention.affixes] == patterns
+
+
+def test_match_never_empty(matcher):
+    assert matcher.match('GFP').gene == 'GFP'
+    assert matcher.match('Flag-').gene == 'Flag-'
+
+
+def test_match_known_genes(matcher):
+    genes = {'RhoA', 'ERK'}
+    assert matcher.match('RhoA').gene == 'oA'
+    assert matcher.match('RhoA', genes) == GeneMention('RhoA', 'RhoA', ())
+    assert matcher.match('p-ERK', genes).gene == 'ERK'
+    assert matcher.match('Flag-XYZ', genes) == \
+        GeneMention('Flag-XYZ', 'Flag-XYZ', ())
+
+
+def test_match_custom_rows():
+    matcher = GenePrefixMatcher([['Pattern', 'Category', 'Notes'],
+                                 ['HA-{Gene name} ', 'experimental context',
+                                  ''],
+                                 ['{Gene name}-{mutation}', 'protein state',
+                                  '']])
+    assert matcher.match('HA-BRAF-V600E') == \
+        GeneMention('HA-BRAF-V600E', 'BRAF',
+                    (('HA-{Gene name}', 'experimental context'),
+                     ('{Gene name}-{mutation}', 'protein state')))
+    assert matcher.match('Flag-BRAF').gene == 'Flag-BRAF'
+
+
+def test_match_prefixes_only():
+    matcher = GenePrefixMatcher([['Flag-{Gene name}', 'x', '']])
+    assert matcher.match('Flag-AKT1') == \
+        GeneMention('Flag-AKT1', 'AKT1', (('Flag-{Gene name}', 'x'),))
+    assert matcher.match('AKT1') == GeneMention('AKT1', 'AKT1', ())
+
+
+def test_match_suffixes_only():
+    matcher = GenePrefixMatcher([['{Gene name} protein', 'x', '']])
+    assert matcher.match('AKT1 protein') == \
+        GeneMention('AKT1 protein', 'AKT1', (('{Gene name} protein', 'x'),))
+    assert matcher.match('AKT1') == GeneMention('AKT1', 'AKT1', ())
+    assert GenePrefixMatcher([]).match('AKT1') == \
+        GeneMention('AKT1', 'AKT1', ())
+
+
+def test_match_many(matcher):
+    assert [mention.gene for mention in
+            matcher.match_many(['Flag-AKT1', 'ERK'])] == ['AKT1', 'ERK']
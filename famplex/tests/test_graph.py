@@ -0,0 +1,395 @@
+import os
+import random
+import shutil
+
+import pytest
+
+import famplex.bundle
+import famplex.graph
+import famplex.load
+import famplex.locations
+from famplex.bundle import ResourceBundle, get_bundle
+from famplex.compact import CompactFamplexGraph
+from famplex.graph import FamplexGraph, RELATION_TYPES
+from famplex.load import Relation
+
+
+@pytest.fixture(scope='module')
+def graph():
+    return FamplexGraph()
+
+
+@pytest.fixture(scope='module')
+def closure_graph():
+    return FamplexGraph(closure_index=True)
+
+
+@pytest.mark.parametrize('relation_types',
+                         [['isa'], ['partof'], ['isa', 'partof'], []])
+def test_closure_index_matches_traversal(graph, closure_graph,
+                                         relation_types):
+    for node1 in graph._root_class_mapping:
+        candidates = set(graph.traverse(node1, ['isa', 'partof'], 'up'))
+        # Children and siblings share a root class with node1 but are not
+        # above it.
+        for ns, id_, _ in graph._reverse_graph.get(node1, []):
+            candidates.add((ns, id_))
+        for ns, id_, _ in graph._graph.get(node1, []):
+            candidates.update((ns2, id2) for ns2, id2, _ in
+                              graph._reverse_graph[(ns, id_)])
+        for node2 in candidates:
+            assert closure_graph.relation(*node1, *node2,
+                                              relation_types) == \
+                    graph.relation(*node1, *node2, relation_types)
+
+
+@pytest.mark.parametrize('test_input,expected',
+                         [(('HGNC', 'PRKAA1', 'FPLX', 'AMPK'), True),
+                          (('FPLX', 'AMPK', 'HGNC', 'PRKAA1'), False),
+                          (('HGNC', 'GENE', 'FPLX', 'MEK'), False),
+                          (('HGNC', 'SCN8A', 'HGNC', 'GENE'), False)])
+def test_closure_index_relation(closure_graph, test_input, expected):
+    assert closure_graph.relation(*test_input,
+                                  ['isa', 'partof']) == expected
+
+
+def test_closure_index_size(graph, closure_graph):
+    assert graph.closure_index_size() == 0
+    assert closure_graph.closure_index_size() > 0
+
+
+def test_snapshot_round_trip(graph, tmp_path):
+    path = str(tmp_path / 'graph.pickle')
+    graph.save_snapshot(path)
+    loaded = FamplexGraph.load_snapshot(path)
+    assert loaded.root_classes == graph.root_classes
+    assert loaded._graph == graph._graph
+    assert loaded._root_class_mapping == graph._root_class_mapping
+    assert loaded.relation('HGNC', 'PRKAB1', 'FPLX', 'AMPK_A2B1G1',
+                           ['partof'])
+
+
+def test_snapshot_invalidated_by_resource_change(graph, tmp_path,
+                                                 monkeypatch):
+    path = str(tmp_path / 'graph.pickle')
+    graph.save_snapshot(path)
+    monkeypatch.setattr(famplex.graph, 'resource_hash', lambda: 'changed')
+    with pytest.raises(ValueError):
+        FamplexGraph.load_snapshot(path)
+
+
+def test_from_cache(tmp_path):
+    cache_path = str(tmp_path)
+    graph = FamplexGraph.from_cache(cache_path, closure_index=True)
+    assert graph.closure_index_size() > 0
+    assert len(os.listdir(cache_path)) == 1
+    cached = FamplexGraph.from_cache(cache_path, closure_index=True)
+    assert cached._closure == graph._closure
+    FamplexGraph.from_cache(cache_path)
+    assert len(os.listdir(cache_path)) == 2
+
+
+def test_from_cache_removes_stale_snapshots(tmp_path, monkeypatch):
+    cache_path = str(tmp_path)
+    stale = ['FamplexGraph_v1_0123456789abcdef.pickle',
+             'FamplexGraph_v%d_0000000000000000_00000000.pickle' %
+             famplex.graph.SNAPSHOT_VERSION]
+    others = ['CompactFamplexGraph_v1_0123456789abcdef.pickle', 'names.sqlite']
+    for name in stale + others:
+        (tmp_path / name).write_bytes(b'')
+    FamplexGraph.from_cache(cache_path)
+    FamplexGraph.from_cache(cache_path, closure_index=True)
+    names = sorted(os.listdir(cache_path))
+    assert not set(stale) & set(names)
+    assert set(others) <= set(names)
+    assert len(names) == len(others) + 2
+
+
+def test_from_cache_reloads_changed_resources(tmp_path, monkeypatch):
+    resources = tmp_path / 'resources'
+    resources.mkdir()
+    for name in ('ENTITIES_PATH', 'RELATIONS_PATH', 'EQUIVALENCES_PATH'):
+        path = str(resources / os.path.basename(
+            getattr(famplex.locations, name)))
+        shutil.copy(getattr(famplex.locations, name), path)
+        for module in (famplex.bundle, famplex.graph, famplex.load):
+            monkeypatch.setattr(module, name, path)
+    bundle = ResourceBundle()
+    monkeypatch.setattr(famplex.graph, 'get_bundle', lambda: bundle)
+    cache_path = str(tmp_path / 'cache')
+    graph = FamplexGraph.from_cache(cache_path)
+    assert graph.relation('HGNC', 'MAPK1', 'FPLX', 'ERK', ['isa'])
+    relations = resources / 'relations.csv'
+    rows = relations.read_bytes().replace(b'HGNC,MAPK1,isa,FPLX,ERK\r\n', b'')
+    relations.write_bytes(rows)
+    graph = FamplexGraph.from_cache(cache_path)
+    assert not graph.relation('HGNC', 'MAPK1', 'FPLX', 'ERK', ['isa'])
+    names = os.listdir(cache_path)
+    assert len(names) == 1
+    assert famplex.graph.resource_hash()[:16] in names[0]
+    cached = FamplexGraph.load_snapshot(os.path.join(cache_path, names[0]))
+    assert not cached.relation('HGNC', 'MAPK1', 'FPLX', 'ERK', ['isa'])
+
+
+def test_compact_graph_matches(graph):
+    compact = CompactFamplexGraph()
+    for node in graph._root_class_mapping:
+        assert compact.in_famplex(*node)
+        assert compact.parent_edges(*node) == graph.parent_edges(*node)
+        assert compact.child_edges(*node) == graph.child_edges(*node)
+        assert compact.root_terms(*node) == graph.root_terms(*node)
+        for relation_types in (['isa'], ['partof'], ['isa', 'partof']):
+            assert compact.parent_terms(*node, relation_types) == \
+                graph.parent_terms(*node, relation_types)
+            assert compact.child_terms(*node, relation_types) == \
+                graph.child_terms(*node, relation_types)
+            for direction in ('up', 'down'):
+                assert list(compact.traverse(node, relation_types,
+                                             direction)) == \
+                    list(graph.traverse(node, relation_types, direction))
+    assert compact.relation('HGNC', 'PRKAB1', 'FPLX', 'AMPK_A2B1G1',
+                            ['partof'])
+    assert not compact.relation('HGNC', 'PRKAB1', 'FPLX', 'AMPK_A2B1G1',
+                                ['isa'])
+    assert not compact.in_famplex('HGNC', 'GENE')
+    with pytest.raises(ValueError):
+        compact.parent_edges('HGNC', 'GENE')
+    with pytest.raises(ValueError):
+        compact.root_terms('HGNC', 'GENE')
+
+
+@pytest.mark.parametrize('graph_class,kwargs',
+                         [(FamplexGraph, {}),
+                          (FamplexGraph, {'closure_index': True}),
+                          (CompactFamplexGraph, {})])
+def test_relation_many(graph_class, kwargs):
+    graph = graph_class(**kwargs)
+    terms = [('HGNC', 'PRKAA1'), ('HGNC', 'PRKAB1'), ('FPLX', 'AMPK'),
+             ('FPLX', 'AMPK_alpha'), ('FPLX', 'AMPK_A2B1G1'),
+             ('HGNC', 'ESR1'), ('FPLX', 'ESR'), ('HGNC', 'GENE')]
+    pairs = [term1 + term2 for term1 in terms for term2 in terms]
+    for relation_types in (['isa'], ['partof'], ['isa', 'partof']):
+        assert graph.relation_many(pairs, relation_types) == \
+            [graph.relation(*pair, relation_types) for pair in pairs]
+
+
+def test_cached_traversal_eviction():
+    graph = FamplexGraph(cache_size=2)
+    for term in ('ESR1', 'ESR2', 'PRKAA1'):
+        assert graph.cached_traversal(('HGNC', term), ['isa'], 'up') == \
+            tuple(graph.traverse(('HGNC', term), ['isa'], 'up'))
+    assert graph.cache_info() == (0, 3, 2, 2)
+    graph.cached_traversal(('HGNC', 'PRKAA1'), ['isa'], 'up')
+    graph.cached_traversal(('HGNC', 'ESR1'), ['isa'], 'up')
+    assert graph.cache_info() == (1, 4, 2, 2)
+
+
+def _graph_state(graph):
+    return (graph._graph, graph._reverse_graph, graph._root_class_mapping,
+            graph.root_classes, graph._closure, graph._equivalences,
+            graph._reverse_equivalences, graph._parent_terms,
+            graph._child_terms)
+
+
+def _assert_root_bits_consistent(graph):
+    assert set(graph._root_bits) == set(graph._root_class_mapping)
+    for node, roots in graph._root_class_mapping.items():
+        assert graph._root_bits[node] == \
+            sum(1 << graph._root_bit_index[root] for root in roots)
+
+
+def test_incremental_updates_match_rebuild(monkeypatch):
+    random.seed(0)
+    graph = FamplexGraph(closure_index=True)
+    graph._depth_index()
+    relations = list(get_bundle().relations)
+    fplx_terms = sorted(('FPLX', entity) for entity in get_bundle().entities)
+    for relation in random.sample(relations, 50):
+        graph.remove_relation(*relation)
+        relations.remove(relation)
+    added = 0
+    while added < 50:
+        (ns1, id1), (ns2, id2) = random.sample(fplx_terms, 2)
+        if random.random() < 0.2:
+            ns1, id1 = 'HGNC', 'GENE%d' % added
+        relation = Relation(ns1, id1, random.choice(['isa', 'partof']),
+                            ns2, id2)
+        if relation in relations:
+            continue
+        try:
+            graph.add_relation(*relation)
+        except ValueError:
+            continue
+        relations.append(relation)
+        added += 1
+    graph.add_equivalence('HGNC_GROUP', '0', 'AMPK')
+
+    bundle = ResourceBundle()
+    bundle.__dict__['relations'] = tuple(relations)
+    monkeypatch.setattr(famplex.graph, 'get_bundle', lambda: bundle)
+    rebuilt = FamplexGraph(closure_index=True)
+    rebuilt._equivalences['AMPK'] = rebuilt._equivalences['AMPK'] + \
+        [('HGNC_GROUP', '0')]
+    rebuilt._reverse_equivalences[('HGNC_GROUP', '0')] = ['AMPK']
+    assert _graph_state(graph) == _graph_state(rebuilt)
+    assert graph._depths == rebuilt._depth_index()
+    # Root bits are assigned in a different order after edits.
+    _assert_root_bits_consistent(graph)
+    _assert_root_bits_consistent(rebuilt)
+
+
+def test_incremental_update_errors():
+    graph = FamplexGraph()
+    with pytest.raises(ValueError):
+        graph.add_relation('FPLX', 'AMPK', 'isa', 'FPLX', 'AMPK_alpha')
+    with pytest.raises(ValueError):
+        graph.add_relation('FPLX', 'AMPK', 'memberof', 'FPLX', 'ERK')
+    with pytest.raises(ValueError):
+        graph.remove_relation('FPLX', 'ERK', 'isa', 'FPLX', 'AMPK')
+    with pytest.raises(ValueError):
+        graph.add_equivalence('HGNC_GROUP', '0', 'NOT_AN_ENTITY')
+
+
+def test_incremental_update_caches():
+    graph = FamplexGraph()
+    parents = graph.parent_edges('HGNC', 'MAPK1')
+    assert ('FPLX', 'ERK') in graph.cached_traversal(('HGNC', 'MAPK1'),
+                                                     ['isa'], 'up')
+    graph.remove_relation('HGNC', 'MAPK1', 'isa', 'FPLX', 'ERK')
+    assert ('FPLX', 'ERK') not in graph.cached_traversal(('HGNC', 'MAPK1'),
+                                                         ['isa'], 'up')
+    assert ('FPLX', 'ERK', 'isa') in parents
+    assert not graph.in_famplex('HGNC', 'MAPK1')
+
+
+def test_compact_graph_is_immutable():
+    graph = CompactFamplexGraph()
+    with pytest.raises(NotImplementedError):
+        graph.add_relation('HGNC', 'MAPK1', 'isa', 'FPLX', 'ERK')
+
+
+def test_root_classes_match_traversal(graph):
+    expected = {}
+    for root in graph.root_classes:
+        for node in graph.traverse(root, ['isa', 'partof'], 'down'):
+            expected.setdefault(node, set()).add(root)
+    for node, roots in graph._root_class_mapping.items():
+        assert set(roots) == expected.get(node, {node})
+        assert roots == sorted(roots, key=lambda x: (x[0].lower(),
+                                                     x[1].lower()))
+
+
+def test_root_terms_returns_copy(graph):
+    roots = graph.root_terms('HGNC', 'PRKAA1')
+    assert roots == graph.root_terms('HGNC', 'PRKAA2')
+    roots.append(('FPLX', 'ERK'))
+    assert ('FPLX', 'ERK') not in graph.root_terms('HGNC', 'PRKAA2')
+
+
+@pytest.mark.parametrize('relation_types',
+                         [['isa'], ['partof'], ('isa', 'partof'), []])
+def test_partitioned_terms_match_edges(graph, relation_types):
+    for node in graph._root_class_mapping:
+        for terms, edges in ((graph.parent_terms(*node, relation_types),
+                              graph.parent_edges(*node)),
+                             (graph.child_terms(*node, relation_types),
+                              graph.child_edges(*node))):
+            assert isinstance(terms, tuple)
+            assert terms == tuple((ns, id_) for ns, id_, rel in edges
+                                  if rel in relation_types)
+    with pytest.raises(ValueError):
+        graph.parent_terms('HGNC', 'GENE', relation_types)
+
+
+def test_root_bits_prune_relation(graph):
+    _assert_root_bits_consistent(graph)
+    assert not graph._root_bits[('HGNC', 'ESR1')] & \
+        graph._root_bits[('FPLX', 'AMPK')]
+    assert not graph.relation('HGNC', 'ESR1', 'FPLX', 'AMPK', ['isa'])
+    assert not graph.relation('HGNC', 'GENE', 'FPLX', 'AMPK', ['isa'])
+    assert graph.relation('HGNC', 'PRKAA1', 'FPLX', 'AMPK',
+                          ['isa', 'partof'])
+
+
+def _brute_force_lowest_common_ancestors(graph, terms, relation_types):
+    common = set.intersection(*(set(graph.traverse(term, relation_types,
+                                                   'up'))
+                                for term in terms))
+    return {node for node in common
+            if not any(other != node and
+                       node in graph.traverse(other, relation_types, 'up')
+                       for other in common)}
+
+
+@pytest.mark.parametrize('graph_class,kwargs',
+                         [(FamplexGraph, {}),
+                          (FamplexGraph, {'closure_index': True}),
+                          (CompactFamplexGraph, {})])
+def test_lowest_common_ancestors_match_brute_force(graph_class, kwargs):
+    random.seed(0)
+    graph = graph_class(**kwargs)
+    families = [root for root in graph.root_classes
+                if root[0] == 'FPLX'][:100]
+    term_sets = []
+    for family in families:
+        below = list(graph.traverse(family, RELATION_TYPES, 'down'))
+        for size in (1, 2, 3):
+            term_sets.append(random.sample(below, min(size, len(below))))
+    for relation_types in (['isa'], ['partof'], RELATION_TYPES):
+        results = graph.lowest_common_ancestors_many(term_sets,
+                                                     relation_types)
+        for terms, lowest in zip(term_sets, results):
+            assert set(lowest) == _brute_force_lowest_common_ancestors(
+                graph, terms, relation_types)
+            assert lowest == graph.lowest_common_ancestors(terms,
+                                                           relation_types)
+
+
+@pytest.mark.parametrize('graph_class', [FamplexGraph, CompactFamplexGraph])
+def test_covering_terms_match_individual_members(graph_class):
+    random.seed(0)
+    graph = graph_class()
+    for relation_types in (['isa'], ['partof'], RELATION_TYPES):
+        members = {}
+        for node in graph._depth_index():
+            below = list(graph.traverse(node, relation_types, 'down'))[1:]
+            if below:
+                members[node] = {term for term in below
+                                 if not graph.child_terms(*term,
+                                                          relation_types)}
+        genes = sorted(set.union(*members.values()))
+        for _ in range(50):
+            query = set(random.sample(genes, random.randint(1, 5)))
+            query.add(('HGNC', 'GENE'))
+            expected = {term: len(query & terms) / len(query | terms)
+                        for term, terms in members.items()
+                        if query & terms}
+            results = graph.covering_terms(query, 0.0, relation_types)
+            assert dict(results) == pytest.approx(expected)
+            assert [term for term, jaccard
+                    in graph.covering_terms(query, 0.3, relation_types)] == \
+                [term for term, jaccard in results if jaccard >= 0.3]
+
+
+def test_covering_terms_after_update():
+    graph = FamplexGraph()
+    genes = [('HGNC', 'MAPK1'), ('HGNC', 'MAPK3')]
+    assert graph.covering_terms(genes, 1.0, RELATION_TYPES) == \
+        [(('FPLX', 'ERK'), 1.0)]
+    graph.add_relation('HGNC', 'GENE', 'isa', 'FPLX', 'ERK')
+    assert graph.covering_terms(genes, 0.5, RELATION_TYPES) == \
+        [(('FPLX', 'ERK'), 2 / 3)]
+
+
+@pytest.mark.parametrize('graph_class', [FamplexGraph, CompactFamplexGraph])
+def test_unknown_relation_types_are_skipped(monkeypatch, graph_class):
+    bundle = ResourceBundle()
+    bundle.__dict__.update(
+        relations=(Relation('HGNC', 'A', 'isa', 'FPLX', 'F'),
+                   Relation('HGNC', 'B', 'memberof', 'FPLX', 'F')),
+        entities=('F',), equivalences=())
+    monkeypatch.setattr(famplex.graph, 'get_bundle', lambda: bundle)
+    graph = graph_class()
+    assert graph.child_terms('FPLX', 'F') == (('HGNC', 'A'),)
+    assert list(graph.traverse(('FPLX', 'F'), RELATION_TYPES, 'down')) == \
+        [('FPLX', 'F'), ('HGNC', 'A')]
@@ -0,0 +1,60 @@
+import pytest
+
+from famplex.grounding import GroundingIndex, normalize_text
+from famplex.load import load_grounding_map
+
+
+@pytest.fixture(scope='module')
+def index():
+    return GroundingIndex()
+
+
+@pytest.mark.parametrize('text,expected',
+                         [('PI3K-α', 'pi3kalpha'),
+                          ('PI3K alpha', 'pi3kalpha'),
+                          ('Pi3kAlpha', 'pi3kalpha'),
+                          ('AMPK (Α 1, β 1, γ 1)',
+                           'ampk(alpha1,beta1,gamma1)'),
+                          ('14_3_3', '1433')])
+def test_normalize_text(text, expected):
+    assert normalize_text(text) == expected
+
+
+def test_exact_lookup(index):
+    gm = load_grounding_map()
+    for text, db_refs in gm.items():
+        assert index.lookup(text) == db_refs
+        assert index.lookup(text, normalize=False) == db_refs
+
+
+@pytest.mark.parametrize('text,expected',
+                         [('AMPK (alpha 1, beta 1, gamma 1)', 'AMPK_A1B1G1'),
+                          ('ampk (ALPHA 1, BETA 1, GAMMA 1)', 'AMPK_A1B1G1'),
+                          ('AMPK(α1,β1,γ1)', 'AMPK_A1B1G1')])
+def test_normalized_lookup(index, text, expected):
+    assert index.lookup(text)['FPLX'] == expected
+    assert text in index
+
+
+def test_lookup_missing(index):
+    assert index.lookup('not a protein family') is None
+    assert 'not a protein family' not in index
+    assert index.lookup('ampk (alpha 1, beta 1, gamma 1)',
+                        normalize=False) is None
+
+
+def test_ambiguous_texts_not_normalized():
+    index = GroundingIndex({'AKT': {'TEXT': 'AKT', 'FPLX': 'AKT'},
+                            'Akt': {'TEXT': 'Akt', 'FPLX': 'AKT'},
+                            'MEK': {'TEXT': 'MEK', 'FPLX': 'MEK'},
+                            'Mek': {'TEXT': 'Mek', 'HGNC': 'MAP2K1'}})
+    assert index.lookup('akt')['FPLX'] == 'AKT'
+    assert index.lookup('mek') is None
+    assert index.lookup('Mek')['HGNC'] == 'MAP2K1'
+
+
+def test_lookup_many(index):
+    texts = ['AMPK (alpha 1, beta 1, gamma 1)', 'ampk(α1,β1,γ1)', 'nothing']
+    assert index.lookup_many(texts) == [index.lookup(text) for text in texts]
+    assert index.lookup_many(texts, normalize=False) == \
+        [index.lookup(text, normalize=False) for text in texts]
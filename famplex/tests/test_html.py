@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+pytest.importorskip('click')
+pytest.importorskip('jinja2')
+pytest.importorskip('requests')
+pytest.importorskip('tqdm')
+
+import famplex.html.api  # noqa: E402
+from famplex.html.api import write_term_pages  # noqa: E402
+
+
+def render_term(args):
+    subdirectory, context = args
+    os.makedirs(subdirectory, exist_ok=True)
+    with open(os.path.join(subdirectory, 'index.html'), 'w') as file:
+        file.write(context['text'])
+    return os.path.basename(subdirectory)
+
+
+def read_pages(directory, fplx_ids):
+    pages = {}
+    for fplx_id in fplx_ids:
+        with open(os.path.join(directory, fplx_id, 'index.html')) as file:
+            pages[fplx_id] = file.read()
+    return pages
+
+
+def test_write_term_pages_skips_unchanged(tmp_path, monkeypatch):
+    monkeypatch.setattr(famplex.html.api, '_render_term', render_term)
+    directory = str(tmp_path)
+    contexts = {'TERM%d' % i: {'text': 'term %d' % i} for i in range(20)}
+    assert write_term_pages(contexts, directory, workers=2) == (20, 0)
+    assert read_pages(directory, contexts) == \
+        {fplx_id: context['text'] for fplx_id, context in contexts.items()}
+
+    contexts['TERM3'] = {'text': 'edited'}
+    assert write_term_pages(contexts, directory, workers=2) == (1, 19)
+    assert read_pages(directory, contexts)['TERM3'] == 'edited'
+
+    os.remove(os.path.join(directory, 'TERM7', 'index.html'))
+    assert write_term_pages(contexts, directory, workers=2) == (1, 19)
+    assert read_pages(directory, contexts)['TERM7'] == 'term 7'
+
+    assert write_term_pages(contexts, directory, workers=2) == (0, 20)
+    assert write_term_pages(contexts, directory, workers=2,
+                            force=True) == (20, 0)
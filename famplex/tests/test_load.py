@@ -1,4 +1,6 @@
-from famplex.load import load_grounding_map
+from famplex.load import Description, Equivalence, Relation, \
+    load_descriptions, load_equivalences, load_grounding_map, \
+    load_relations, _iter_csv
 
 
 def test_load_grounding_map():
@@ -6,3 +8,35 @@ def test_load_grounding_map():
     for text, db_refs in gm.items():
         assert db_refs['TEXT'] == text
         assert '' not in db_refs
+
+
+def test_load_relations():
+    relations = load_relations()
+    assert Relation('FPLX', 'AMPK_alpha', 'partof', 'FPLX', 'AMPK') in \
+        relations
+    assert all(len(row) == 5 for row in relations)
+    # Repeated strings are shared between rows
+    namespaces = {id(row.namespace2) for row in relations
+                  if row.namespace2 == 'FPLX'}
+    assert len(namespaces) == 1
+
+
+def test_load_equivalences():
+    equivalences = load_equivalences()
+    row = equivalences[0]
+    assert isinstance(row, Equivalence)
+    assert (row.namespace, row.id, row.fplx_id) == tuple(row)
+
+
+def test_load_descriptions():
+    descriptions = load_descriptions()
+    assert all(isinstance(row, Description) for row in descriptions)
+    # Descriptions contain quoted commas which must not split the text
+    assert any(',' in row.text for row in descriptions)
+
+
+def test_iter_csv_line_semantics(tmp_path):
+    path = tmp_path / 'rows.csv'
+    path.write_bytes(b'a,b\x0cc\r\nd,e\n"f\ng",h\ni,j\n')
+    assert list(_iter_csv(str(path))) == [['a', 'b\x0cc'], ['d', 'e'],
+                                          ['f\ng', 'h'], ['i', 'j']]
@@ -0,0 +1,50 @@
+import pytest
+
+from famplex.html.names import NameCache
+
+
+class Resolver(object):
+    def __init__(self, values):
+        self.values = values
+        self.calls = []
+
+    def __call__(self, namespace, key):
+        self.calls.append((namespace, key))
+        return self.values.get((namespace, key))
+
+
+def test_name_cache(tmp_path):
+    path = str(tmp_path / 'names.sqlite')
+    get_name = Resolver({('GO', 'GO:0005524'): 'ATP binding'})
+    get_identifier = Resolver({('HGNC', 'BRAF'): '1097'})
+    cache = NameCache(path, get_name=get_name, get_identifier=get_identifier)
+    assert cache.prefetch([('GO', 'GO:0005524'), ('GO', 'GO:0')],
+                          [('HGNC', 'BRAF')]) == (2, 1)
+    assert cache.get_name('GO', 'GO:0005524') == 'ATP binding'
+    assert cache.get_name('GO', 'GO:0') is None
+    assert cache.get_identifier('HGNC', 'BRAF') == '1097'
+    assert cache.prefetch([('GO', 'GO:0005524')]) == (0, 0)
+    assert len(get_name.calls) == 2
+    assert cache.hit_rates() == {'names': 1.0, 'identifiers': 1.0}
+    cache.close()
+
+    # Values persist and are served offline
+    cache = NameCache(path, offline=True)
+    assert cache.get_name('GO', 'GO:0005524') == 'ATP binding'
+    assert cache.get_identifier('HGNC', 'BRAF') == '1097'
+    with pytest.raises(LookupError):
+        cache.get_name('GO', 'GO:1')
+    with pytest.raises(LookupError):
+        cache.prefetch([('GO', 'GO:1')])
+    assert cache.hit_rates()['names'] == 0.5
+    cache.close()
+
+
+def test_name_cache_resolves_misses(tmp_path):
+    get_name = Resolver({('GO', 'GO:0005524'): 'ATP binding'})
+    cache = NameCache(str(tmp_path / 'names.sqlite'), get_name=get_name)
+    assert cache.get_name('GO', 'GO:0005524') == 'ATP binding'
+    assert cache.get_name('GO', 'GO:0005524') == 'ATP binding'
+    assert get_name.calls == [('GO', 'GO:0005524')]
+    assert cache.hit_rates()['names'] == 0.5
+    cache.close()
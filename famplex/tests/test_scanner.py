@@ -0,0 +1,47 @@
+import pytest
+
+from famplex.scanner import Mention, MentionScanner
+
+
+@pytest.fixture(scope='module')
+def scanner():
+    return MentionScanner()
+
+
+def test_scan(scanner):
+    document = 'Activation of AMPK (alpha 1, beta 1, gamma 1) by AKT1 and ERK.'
+    mentions = scanner.scan(document)
+    assert [(m.text, m.db_refs.get('FPLX')) for m in mentions] == \
+        [('AMPK (alpha 1, beta 1, gamma 1)', 'AMPK_A1B1G1'),
+         ('AKT1', None), ('ERK', 'ERK')]
+    for mention in mentions:
+        assert document[mention.start:mention.end] == mention.text
+
+
+def test_scan_entity_names(scanner):
+    mentions = scanner.scan('Loss of the Mitochondrial-Ribosome')
+    assert mentions == [Mention(12, 34, 'Mitochondrial-Ribosome',
+                                {'TEXT': 'Mitochondrial-Ribosome',
+                                 'FPLX': 'Mitochondrial_Ribosome'})]
+
+
+def test_scan_longest_leftmost():
+    scanner = MentionScanner(
+        {'MEK': {'TEXT': 'MEK', 'FPLX': 'MEK'},
+         'MEK kinase': {'TEXT': 'MEK kinase', 'FPLX': 'MAP3K'},
+         'kinase A': {'TEXT': 'kinase A', 'FPLX': 'PKA'},
+         'Unknown': None},
+        entities=[])
+    assert len(scanner) == 3
+    assert scanner.scan('MEK kinase A and MEKK and Unknown') == \
+        [Mention(0, 10, 'MEK kinase',
+                 {'TEXT': 'MEK kinase', 'FPLX': 'MAP3K'})]
+    assert [m.text for m in scanner.scan('MEK, kinase A')] == \
+        ['MEK', 'kinase A']
+    assert scanner.scan('') == []
+
+
+def test_scan_many(scanner):
+    documents = ['ERK and MEK', 'nothing here', 'AMPK']
+    assert scanner.scan_many(documents) == \
+        [scanner.scan(document) for document in documents]
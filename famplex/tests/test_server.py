@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+import pytest
+
+from famplex.server import FamplexServer, serve
+
+
+@pytest.fixture(scope='module')
+def server():
+    return FamplexServer()
+
+
+def _get(server, target):
+    status, body = server.handle_request('GET', target)
+    return status, json.loads(body.decode('utf-8'))
+
+
+@pytest.mark.parametrize('target,expected',
+                         [('/parent_terms?namespace=HGNC&id=BRAF',
+                           [['FPLX', 'RAF']]),
+                          ('/isa?namespace1=HGNC&id1=BRAF&namespace2=FPLX'
+                           '&id2=RAF', True),
+                          ('/refinement_of?namespace1=FPLX&id1=RAF'
+                           '&namespace2=FPLX&id2=RAF', True),
+                          ('/in_famplex?namespace=HGNC&id=NOTAGENE', False),
+                          ('/ancestral_terms?namespace=HGNC&id=PRKAA1'
+                           '&relation_types=isa', [['FPLX', 'AMPK_alpha']]),
+                          ('/reverse_equivalences?namespace=MESH'
+                           '&id=D011948', ['TCR']),
+                          ('/ground?text=Erk', {'TEXT': 'Erk',
+                                                'FPLX': 'ERK'})])
+def test_get(server, target, expected):
+    assert _get(server, target) == (200, {'result': expected})
+
+
+def test_get_errors(server):
+    assert _get(server, '/nothing')[0] == 404
+    status, body = _get(server, '/parent_terms?namespace=HGNC')
+    assert status == 400 and 'id' in body['error']
+    status, body = _get(server, '/parent_terms?namespace=HGNC&id=NOTAGENE')
+    assert status == 400
+    assert server.handle_request('PUT', '/isa')[0] == 405
+
+
+def test_get_cached():
+    server = FamplexServer()
+    _get(server, '/child_terms?namespace=FPLX&id=RAF')
+    _get(server, '/child_terms?namespace=FPLX&id=RAF')
+    info = server.cache_info()
+    assert info.hits == 1 and info.currsize == 1
+
+
+def test_batch(server):
+    pair = {'namespace1': 'HGNC', 'id1': 'BRAF',
+            'namespace2': 'FPLX', 'id2': 'RAF'}
+    body = json.dumps({'queries': [pair, dict(pair, id1='PRKAA1'),
+                                   {'namespace1': 'HGNC'}]})
+    status, response = server.handle_request('POST', '/batch/isa',
+                                             body.encode('utf-8'))
+    results = json.loads(response.decode('utf-8'))['results']
+    assert status == 200
+    assert results[:2] == [{'result': True}, {'result': False}]
+    assert 'error' in results[2]
+    assert server.handle_request('POST', '/batch/isa', b'[]')[0] == 400
+    assert server.handle_request('POST', '/batch/nothing', body)[0] == 404
+
+
+def test_keep_alive():
+    async def requests(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        responses = []
+        for target in ('/in_famplex?namespace=FPLX&id=RAF',
+                       '/in_famplex?namespace=FPLX&id=ERK'):
+            writer.write(('GET %s HTTP/1.1\r\nHost: localhost\r\n\r\n' %
+                          target).encode('latin-1'))
+            status_line = await reader.readline()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1')
+                if line == '\r\n':
+                    break
+                name, _, value = line.partition(':')
+                headers[name.lower()] = value.strip()
+            body = await reader.readexactly(int(headers['content-length']))
+            responses.append((status_line, headers['connection'], body))
+        writer.close()
+        return responses
+
+    loop = asyncio.new_event_loop()
+    try:
+        server = loop.run_until_complete(serve(port=0))
+        port = server.sockets[0].getsockname()[1]
+        responses = loop.run_until_complete(requests(port))
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+    finally:
+        loop.close()
+    assert [status for status, _, _ in responses] == \
+        [b'HTTP/1.1 200 OK\r\n'] * 2
+    assert all(connection == 'keep-alive' for _, connection, _ in responses)
+    assert [json.loads(body.decode('utf-8')) for _, _, body in responses] \
+        == [{'result': True}] * 2
+
+
+def test_batch_invalid_parameter_types(server):
+    queries = [{'namespace': 'HGNC', 'id': 'BRAF', 'relation_types': 5},
+               {'namespace': 'HGNC', 'id': 'BRAF',
+                'relation_types': ['isa']},
+               {'namespace': 'HGNC', 'id': 5}, 'HGNC']
+    status, response = server.handle_request(
+        'POST', '/batch/parent_terms',
+        json.dumps({'queries': queries}).encode('utf-8'))
+    results = json.loads(response.decode('utf-8'))['results']
+    assert status == 200
+    assert results[1] == {'result': [['FPLX', 'RAF']]}
+    assert all('error' in results[i] for i in (0, 2, 3))
+    status, response = server.handle_request(
+        'POST', '/batch/ground',
+        json.dumps({'queries': [{'text': 5}, {'text': 'Erk',
+                                              'normalize': False}]}).
+        encode('utf-8'))
+    results = json.loads(response.decode('utf-8'))['results']
+    assert 'error' in results[0]
+    assert results[1] == {'result': {'TEXT': 'Erk', 'FPLX': 'ERK'}}
+
+
+def test_malformed_request_line():
+    async def request(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'GARBAGE\r\n\r\n')
+        response = await reader.read()
+        writer.close()
+        return response
+
+    loop = asyncio.new_event_loop()
+    try:
+        server = loop.run_until_complete(serve(port=0))
+        port = server.sockets[0].getsockname()[1]
+        response = loop.run_until_complete(request(port))
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+    finally:
+        loop.close()
+    assert response.startswith(b'HTTP/1.1 400 Bad Request\r\n')
+    assert b'Connection: close' in response
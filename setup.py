@@ -30,7 +30,8 @@ setup(name='famplex',
       packages=find_packages(),
       extras_require={
           'test': ['pytest'],
-          'html': ['requests', 'tqdm', 'pandas', 'click', 'jinja2'],
+          'html': ['requests', 'tqdm', 'click', 'jinja2'],
+          'html_table': ['pandas'],
       },
       package_data={'': ['entities.csv', 'equivalences.csv',
                          'grounding_map.csv', 'relations.csv',